@@ -0,0 +1,52 @@
+"""
+Benchmark bulk track creation and deletion against per-track calls.
+
+The per-track baseline commits once per track, so it is measured on a
+smaller sample and reported per 1,000 tracks alongside the bulk paths.
+"""
+
+import time
+from uuid import UUID
+
+from benchmarks.common import seed_tracks, temporary_database
+from models import TrackCreate
+from storage.track_storage import storage
+
+BULK_SIZE = 20_000
+LOOP_SIZE = 1_000
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    """Compare per-track and bulk create/delete and print a table."""
+    with temporary_database():
+        new_tracks = [
+            (TrackCreate(file_path=f"/bench/new/{i}.mp3", title=f"New {i}"), None)
+            for i in range(BULK_SIZE)
+        ]
+        loop_create = _timed(
+            lambda: [storage.create_track(t, p) for t, p in new_tracks[:LOOP_SIZE]]
+        )
+        bulk_create = _timed(lambda: storage.create_tracks(new_tracks[LOOP_SIZE:]))
+
+        ids = [UUID(track_id) for track_id in seed_tracks(BULK_SIZE)]
+        loop_delete = _timed(
+            lambda: [storage.delete_track(tid) for tid in ids[:LOOP_SIZE]]
+        )
+        bulk_delete = _timed(lambda: storage.delete_tracks(ids[LOOP_SIZE:]))
+
+    bulk_rows = BULK_SIZE - LOOP_SIZE
+    print(
+        f"{'operation':<10} {'per-track (per 1k)':>20} {f'bulk ({bulk_rows} rows)':>20}"
+    )
+    print(f"{'create':<10} {loop_create * 1000:>18.1f}ms {bulk_create * 1000:>18.1f}ms")
+    print(f"{'delete':<10} {loop_delete * 1000:>18.1f}ms {bulk_delete * 1000:>18.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark compatible-track lookups on a 200,000 track library.
+
+Keys are spread over the whole Camelot wheel and tempos over 80-180 BPM, so
+each lookup scans four keys in up to three tempo windows of the
+(camelot, bpm) index.
+"""
+
+import random
+import statistics
+import time
+
+from benchmarks.common import seed_tracks, temporary_database
+from core.database import get_db
+from storage.track_storage import storage
+from utils.camelot import to_camelot
+
+LIBRARY_SIZE = 200_000
+LOOKUPS = 200
+
+NOTES = ["C", "C#", "D", "Eb", "E", "F", "F#", "G", "Ab", "A", "Bb", "B"]
+
+
+def main():
+    """Time lookups from random reference tracks and print percentiles."""
+    rng = random.Random(42)
+    with temporary_database():
+        track_ids = seed_tracks(LIBRARY_SIZE)
+        with get_db() as (conn, cursor):
+            rows = []
+            for track_id in track_ids:
+                key = rng.choice(NOTES) + rng.choice(["", "m"])
+                rows.append((key, to_camelot(key), rng.randint(80, 180), track_id))
+            cursor.executemany(
+                "UPDATE tracks SET key = ?, camelot = ?, bpm = ? WHERE id = ?", rows
+            )
+            conn.commit()
+
+        references = storage.get_tracks_by_ids(rng.sample(track_ids, LOOKUPS))
+        projections = [
+            ("all fields", None),
+            ("id,title,bpm,key", ["id", "title", "bpm", "key"]),
+        ]
+        for label, columns in projections:
+            timings = []
+            for track in references:
+                start = time.perf_counter()
+                matches = storage.find_compatible_tracks(track, 6.0, columns=columns)
+                timings.append((time.perf_counter() - start) * 1000)
+                assert matches
+            timings.sort()
+            print(
+                f"{label:<18} median {statistics.median(timings):.2f}ms "
+                f"p95 {timings[int(len(timings) * 0.95)]:.2f}ms max {timings[-1]:.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark duplicate detection time against library size.
+
+Fingerprints are synthetic: random sub-fingerprints for distinct tracks,
+plus copies of some tracks with bit errors (as from re-encoding) and a time
+shift of a few frames. Recall is the share of planted copies found.
+"""
+
+import time
+
+import numpy as np
+
+from services.fingerprint import FINGERPRINT_FRAMES, find_duplicate_pairs
+
+SIZES = [10_000, 50_000, 100_000]
+COPY_SHARE = 0.01
+COPY_BIT_ERROR_RATE = 0.06
+MAX_COPY_SHIFT = 5
+
+
+def synthetic_library(count: int, rng: np.random.Generator):
+    """Random fingerprints where COPY_SHARE of the rows copy an earlier row."""
+    fingerprints = rng.integers(
+        0, 2**32, size=(count, FINGERPRINT_FRAMES), dtype=np.uint32
+    )
+    copies = int(count * COPY_SHARE)
+    originals = rng.choice(count // 2, copies, replace=False)
+    targets = count // 2 + rng.choice(count - count // 2, copies, replace=False)
+    weights = np.left_shift(np.uint32(1), np.arange(32, dtype=np.uint32))
+    for original, target in zip(originals, targets):
+        shift = int(rng.integers(-MAX_COPY_SHIFT, MAX_COPY_SHIFT + 1))
+        flips = rng.random((FINGERPRINT_FRAMES, 32)) < COPY_BIT_ERROR_RATE
+        errors = (flips * weights).sum(axis=1, dtype=np.uint32)
+        fingerprints[target] = np.roll(fingerprints[original], shift) ^ errors
+    return fingerprints, set(zip(originals.tolist(), targets.tolist()))
+
+
+def main():
+    """Run duplicate detection for each library size and print timings."""
+    rng = np.random.default_rng(11)
+    print(f"{'tracks':>8} {'copies':>7} {'time':>9} {'found':>7} {'false':>6}")
+    for size in SIZES:
+        fingerprints, planted = synthetic_library(size, rng)
+        start = time.perf_counter()
+        pairs = find_duplicate_pairs(fingerprints)
+        elapsed = time.perf_counter() - start
+        found = {(a, b) for a, b, _ in pairs}
+        recall = len(found & planted) / len(planted)
+        print(
+            f"{size:>8} {len(planted):>7} {elapsed:>8.2f}s {recall:>7.1%} "
+            f"{len(found - planted):>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
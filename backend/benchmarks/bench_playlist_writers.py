@@ -0,0 +1,59 @@
+"""
+Benchmark the streaming playlist writers on a 50,000 entry playlist.
+
+Tracks are built in memory so the numbers only cover rendering and writing
+the playlist file, not database access or file copies.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+from benchmarks.common import best_of
+from models import Format, PlaylistDetail, Track
+from utils.playlist_writers import get_writer, write_playlist_file
+
+ENTRY_COUNT = 50_000
+
+
+def main():
+    """Write the playlist in every format and print throughput."""
+    tracks = [
+        Track(
+            id=uuid4(),
+            title=f"Track {i} & Friends",
+            artist=f"Artist {i % 500} <feat. Someone>",
+            album=f"Album {i % 2000}",
+            duration_seconds=180 + i % 420,
+            file_path=f"/music/library/{i}.mp3",
+        )
+        for i in range(ENTRY_COUNT)
+    ]
+    playlist = PlaylistDetail(
+        name="Benchmark", description="Synthetic playlist", track_count=ENTRY_COUNT
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        music_folder = Path(tmp_dir) / "music"
+        file_mapping = {
+            t.file_path: music_folder / f"{i}.mp3" for i, t in enumerate(tracks)
+        }
+
+        print(f"{'format':<10} {'time':>10} {'entries/s':>12} {'MB/s':>8}")
+        for export_format in Format:
+            output = Path(tmp_dir) / f"bench.{get_writer(export_format).extension}"
+            elapsed = best_of(
+                lambda export_format=export_format, output=output: write_playlist_file(
+                    export_format, output, playlist, tracks, file_mapping
+                )
+            )
+            size_mb = os.path.getsize(output) / 1_000_000
+            print(
+                f"{export_format.value:<10} {elapsed * 1000:>8.1f}ms "
+                f"{ENTRY_COUNT / elapsed:>12,.0f} {size_mb / elapsed:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
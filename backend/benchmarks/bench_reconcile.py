@@ -0,0 +1,86 @@
+"""
+Benchmark the missing-file reconciliation sweep.
+
+Tracks point at real (empty) files in a temporary folder, with a share of
+them deleted. The sweep runs once against the local disk and once with a
+simulated per-stat round trip, as on a network share, to show how the
+concurrent stat pool hides latency.
+"""
+
+import os
+import tempfile
+import time
+from uuid import uuid4
+
+from benchmarks.common import seed_tracks, temporary_database
+from core.database import get_db
+from routers import library
+from utils.reconcile_progress import RECONCILE_STAT_WORKERS, reconcile_tracker
+
+TRACKS = 200_000
+MISSING_SHARE = 0.1
+FILES_PER_FOLDER = 1000
+NETWORK_LATENCY_SECONDS = 0.002
+
+
+def _create_files(root: str, track_ids):
+    """Create one file per track and point the track at it."""
+    rows = []
+    for i, track_id in enumerate(track_ids):
+        folder = os.path.join(root, str(i // FILES_PER_FOLDER))
+        if i % FILES_PER_FOLDER == 0:
+            os.makedirs(folder)
+        path = os.path.join(folder, f"{i}.mp3")
+        open(path, "wb").close()
+        rows.append((path, track_id))
+    with get_db() as (conn, cursor):
+        cursor.executemany("UPDATE tracks SET file_path = ? WHERE id = ?", rows)
+        conn.commit()
+    return [path for path, _ in rows]
+
+
+def _run_sweep() -> tuple:
+    """Run one reconciliation job and return (seconds, job status)."""
+    job_id = uuid4()
+    reconcile_tracker.create_job(job_id)
+    start = time.perf_counter()
+    library.process_reconcile(job_id)
+    return time.perf_counter() - start, reconcile_tracker.get_job_status(job_id)
+
+
+def main():
+    """Time local and simulated network sweeps over TRACKS paths."""
+    with temporary_database(), tempfile.TemporaryDirectory() as root:
+        paths = _create_files(root, seed_tracks(TRACKS))
+        for path in paths[:: int(1 / MISSING_SHARE)]:
+            os.remove(path)
+
+        seconds, job = _run_sweep()
+        print(
+            f"local:   {TRACKS} paths in {seconds:.2f}s, "
+            f"{job.tracks_missing} missing ({job.newly_missing} new)"
+        )
+
+        # Every stat waits for a round trip, like on a NAS
+        check_file_exists = library.check_file_exists
+
+        def slow_check(path):
+            time.sleep(NETWORK_LATENCY_SECONDS)
+            return check_file_exists(path)
+
+        library.check_file_exists = slow_check
+        try:
+            seconds, job = _run_sweep()
+        finally:
+            library.check_file_exists = check_file_exists
+        serial = TRACKS * NETWORK_LATENCY_SECONDS
+        print(
+            f"network: {TRACKS} paths in {seconds:.2f}s with "
+            f"{NETWORK_LATENCY_SECONDS * 1000:.0f}ms per stat and "
+            f"{RECONCILE_STAT_WORKERS} workers (serial: {serial:.0f}s), "
+            f"{job.newly_missing} new"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark Track materialization from SQLite rows.
+
+Compares the validating row_to_track path with the trusted-row
+rows_to_tracks fast path, and with JSON serialization of the result.
+"""
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import best_of, seed_tracks, temporary_database
+from core.database import get_db
+from models import Track
+from storage.track_storage import TrackStorage
+
+SIZES = [100, 10_000, 100_000]
+
+tracks_adapter = TypeAdapter(list[Track])
+
+
+def bench_size(size: int):
+    """Time materialization and serialization of `size` rows and print them."""
+    with temporary_database():
+        seed_tracks(size)
+        with get_db() as (_, cursor):
+            cursor.execute("SELECT * FROM tracks")
+            rows = cursor.fetchall()
+
+        validated = best_of(lambda: [TrackStorage.row_to_track(r) for r in rows])
+        trusted = best_of(lambda: TrackStorage.rows_to_tracks(rows))
+        tracks = TrackStorage.rows_to_tracks(rows)
+        dumped = best_of(lambda: tracks_adapter.dump_json(tracks))
+
+        print(
+            f"{size:>8} {validated * 1000:>10.1f}ms {trusted * 1000:>10.1f}ms "
+            f"{validated / trusted:>7.1f}x {dumped * 1000:>10.1f}ms"
+        )
+
+
+def main():
+    """Run the benchmark for each library size and print a table."""
+    print(f"{'rows':>8} {'validated':>12} {'trusted':>12} {'speedup':>8} {'json':>12}")
+    for size in SIZES:
+        bench_size(size)
+
+
+if __name__ == "__main__":
+    main()
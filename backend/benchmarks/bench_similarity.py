@@ -0,0 +1,78 @@
+"""
+Benchmark "similar tracks" query latency against library size.
+
+Feature vectors are synthetic (clustered around random "styles") and built
+in memory, so the numbers cover index build and search only. IVF recall is
+the share of the exact top 20 that the partitioned search also returns.
+"""
+
+import statistics
+import time
+
+import numpy as np
+
+from services.metadata_service import FEATURE_DIM
+from services.similarity import SimilarityIndex
+
+SIZES = [1_000, 10_000, 50_000, 200_000, 500_000]
+QUERIES = 200
+TOP_K = 20
+STYLES = 300
+
+
+def synthetic_features(count: int, rng: np.random.Generator) -> np.ndarray:
+    """Feature vectors scattered around a few hundred style centres."""
+    centres = rng.normal(size=(STYLES, FEATURE_DIM))
+    styles = rng.integers(0, STYLES, size=count)
+    return (centres[styles] + rng.normal(size=(count, FEATURE_DIM))).astype(np.float32)
+
+
+def _query_ms(index: SimilarityIndex, queries, exact: bool) -> float:
+    """Median latency of a search, in milliseconds."""
+    timings = []
+    for track_id in queries:
+        start = time.perf_counter()
+        index.search(track_id, TOP_K, exact=exact)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    """Build an index for each library size and print query latency."""
+    rng = np.random.default_rng(7)
+    print(
+        f"{'tracks':>8} {'build':>9} {'exact':>9} {'ivf build':>10} "
+        f"{'ivf':>9} {'recall':>7}"
+    )
+    for size in SIZES:
+        track_ids = [str(i) for i in range(size)]
+        features = synthetic_features(size, rng)
+        queries = rng.choice(track_ids, QUERIES, replace=False).tolist()
+
+        start = time.perf_counter()
+        exact_index = SimilarityIndex(track_ids, features)
+        build_ms = (time.perf_counter() - start) * 1000
+        exact_ms = _query_ms(exact_index, queries, exact=True)
+
+        start = time.perf_counter()
+        ivf_index = SimilarityIndex(track_ids, features, ivf_lists=int(np.sqrt(size)))
+        ivf_build_ms = (time.perf_counter() - start) * 1000
+        ivf_ms = _query_ms(ivf_index, queries, exact=False)
+
+        hits = 0
+        for track_id in queries:
+            expected = {
+                tid for tid, _ in exact_index.search(track_id, TOP_K, exact=True)
+            }
+            found = {tid for tid, _ in ivf_index.search(track_id, TOP_K)}
+            hits += len(expected & found)
+        recall = hits / (QUERIES * TOP_K)
+
+        print(
+            f"{size:>8} {build_ms:>7.0f}ms {exact_ms:>7.2f}ms {ivf_build_ms:>8.0f}ms "
+            f"{ivf_ms:>7.2f}ms {recall:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
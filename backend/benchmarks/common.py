@@ -0,0 +1,90 @@
+"""
+Shared helpers for benchmarks.
+
+Benchmarks run against a throwaway SQLite database so they never touch the
+real library. Usage from the backend directory:
+
+    python -m benchmarks.bench_row_materialization
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Generator, List
+from uuid import uuid4
+
+from core import database
+from core.database import get_db, init_db
+from utils.camelot import to_camelot
+
+GENRES = ["House", "Techno", "Drum & Bass", "Disco", "Ambient"]
+KEYS = ["Am", "C", "F#m", "D", "Gm", "Bb"]
+
+
+@contextmanager
+def temporary_database() -> Generator[str, None, None]:
+    """Point the application at an empty temporary database for the duration."""
+    original_path = database.DATABASE_PATH
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database.DATABASE_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            init_db()
+            yield database.DATABASE_PATH
+        finally:
+            database.DATABASE_PATH = original_path
+
+
+def seed_tracks(count: int) -> List[str]:
+    """Insert `count` synthetic tracks and return their IDs."""
+    now = datetime.now().isoformat()
+    rows = []
+    for i in range(count):
+        rows.append(
+            (
+                str(uuid4()),
+                f"Track {i}",
+                f"Artist {i % 500}",
+                f"Album {i % 2000}",
+                1990 + i % 35,
+                GENRES[i % len(GENRES)],
+                None,
+                90 + i % 90,
+                KEYS[i % len(KEYS)],
+                180 + i % 420,
+                f"/music/library/{i}.mp3",
+                8_000_000 + i,
+                "mp3",
+                320_000,
+                44_100,
+                now,
+                now,
+                None,
+                0,
+                0,
+                to_camelot(KEYS[i % len(KEYS)]),
+            )
+        )
+    with get_db() as (conn, cursor):
+        cursor.executemany(
+            """INSERT INTO tracks
+               (id, title, artist, album, year, genre, mood, bpm, key,
+                duration_seconds, file_path, file_size_bytes, file_format,
+                bitrate_bps, sample_rate_hz, created_at, updated_at,
+                last_played, play_count, metadata_complete, camelot)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+        conn.commit()
+    return [row[0] for row in rows]
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> float:
+    """Return the best wall-clock time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
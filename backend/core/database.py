@@ -4,7 +4,17 @@ Database connection module.
 
 import sqlite3
 from contextlib import contextmanager
-from typing import Generator, Tuple
+from typing import Generator, List, Sequence, Tuple, TypeVar
+
+from utils.camelot import to_camelot
+
+# Path to the SQLite database file, relative to the backend working directory
+DATABASE_PATH = "beat_portal.db"
+
+# Bound parameters per statement; SQLite builds before 3.32 cap this at 999
+SQLITE_MAX_VARIABLES = 999
+
+T = TypeVar("T")
 
 
 @contextmanager
@@ -18,7 +28,7 @@ def get_db() -> Generator[Tuple[sqlite3.Connection, sqlite3.Cursor], None, None]
             cursor.execute("SELECT * FROM tracks")
             results = cursor.fetchall()
     """
-    connection = sqlite3.connect("beat_portal.db", check_same_thread=False)
+    connection = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
     connection.row_factory = sqlite3.Row  # Enable column access by name
     cursor = connection.cursor()
     try:
@@ -32,6 +42,14 @@ def get_db() -> Generator[Tuple[sqlite3.Connection, sqlite3.Cursor], None, None]
         connection.close()
 
 
+def chunked(
+    items: Sequence[T], size: int = SQLITE_MAX_VARIABLES
+) -> Generator[List[T], None, None]:
+    """Split a sequence into lists of at most `size` items (e.g. for IN clauses)."""
+    for start in range(0, len(items), size):
+        yield list(items[start : start + size])
+
+
 def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
     """
     FastAPI dependency for database connections.
@@ -43,7 +61,7 @@ def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
             cursor = db.cursor()
             ...
     """
-    conn = sqlite3.connect("beat_portal.db", check_same_thread=False)
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     try:
         yield conn
@@ -51,6 +69,128 @@ def get_db_connection() -> Generator[sqlite3.Connection, None, None]:
         conn.close()
 
 
+def _add_missing_columns(cursor, table: str, columns: dict) -> List[str]:
+    """
+    Add columns that are missing from an existing table.
+
+    Args:
+        cursor: Database cursor
+        table: Table name
+        columns: Mapping of column name to its type/default declaration
+
+    Returns:
+        Names of the columns that were added
+    """
+    cursor.execute(f"PRAGMA table_info({table})")
+    existing = {row[1] for row in cursor.fetchall()}
+    added = []
+    for name, declaration in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+            added.append(name)
+    return added
+
+
+def _backfill_camelot(cursor):
+    """Fill tracks.camelot from the stored keys."""
+    cursor.execute("SELECT id, key FROM tracks WHERE key IS NOT NULL")
+    rows = [(to_camelot(key), track_id) for track_id, key in cursor.fetchall()]
+    cursor.executemany("UPDATE tracks SET camelot = ? WHERE id = ?", rows)
+
+
+def _create_playlist_aggregate_triggers(cursor):
+    """
+    Keep playlists.track_count and total_duration_seconds in sync.
+
+    Triggers run inside the writing transaction, so every path that adds or
+    removes playlist entries, deletes tracks or changes a duration keeps the
+    aggregates correct without recomputing them on read. Deleting a track
+    also removes its playlist entries (foreign keys are not enforced).
+    """
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_playlist_tracks_insert
+        AFTER INSERT ON playlist_tracks
+        BEGIN
+            UPDATE playlists
+            SET track_count = track_count
+                    + (SELECT COUNT(*) FROM tracks WHERE id = NEW.track_id),
+                total_duration_seconds = total_duration_seconds
+                    + COALESCE((SELECT duration_seconds FROM tracks WHERE id = NEW.track_id), 0)
+            WHERE id = NEW.playlist_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_playlist_tracks_delete
+        AFTER DELETE ON playlist_tracks
+        BEGIN
+            UPDATE playlists
+            SET track_count = track_count
+                    - (SELECT COUNT(*) FROM tracks WHERE id = OLD.track_id),
+                total_duration_seconds = total_duration_seconds
+                    - COALESCE((SELECT duration_seconds FROM tracks WHERE id = OLD.track_id), 0)
+            WHERE id = OLD.playlist_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_delete
+        BEFORE DELETE ON tracks
+        BEGIN
+            DELETE FROM playlist_tracks WHERE track_id = OLD.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_duration_update
+        AFTER UPDATE OF duration_seconds ON tracks
+        WHEN COALESCE(OLD.duration_seconds, 0) != COALESCE(NEW.duration_seconds, 0)
+        BEGIN
+            UPDATE playlists
+            SET total_duration_seconds = total_duration_seconds
+                - COALESCE(OLD.duration_seconds, 0)
+                + COALESCE(NEW.duration_seconds, 0)
+            WHERE id IN (
+                SELECT playlist_id FROM playlist_tracks WHERE track_id = NEW.id
+            );
+        END
+    """)
+
+
+def _create_track_array_table(cursor, table: str, column: str):
+    """
+    Create a table holding one BLOB per track, whose rows are removed with
+    their track (foreign keys are not enforced).
+    """
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            track_id TEXT PRIMARY KEY,
+            {column} BLOB NOT NULL,
+            updated_at TEXT,
+            FOREIGN KEY (track_id) REFERENCES tracks(id) ON DELETE CASCADE
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_tracks_delete_{table.removeprefix("track_")}
+        AFTER DELETE ON tracks
+        BEGIN
+            DELETE FROM {table} WHERE track_id = OLD.id;
+        END
+    """)
+    # Version counter bumped by every change to the table, including rows
+    # removed with their track, so in-memory indexes know when to rebuild
+    cursor.execute(
+        "INSERT OR IGNORE INTO track_array_versions (array_table, version) VALUES (?, 0)",
+        (table,),
+    )
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE track_array_versions SET version = version + 1
+                WHERE array_table = '{table}';
+            END
+        """)
+
+
 def init_db():
     """Initialize the database schema."""
     with get_db() as (conn, cursor):
@@ -75,18 +215,82 @@ def init_db():
                 updated_at TEXT,
                 last_played TEXT,
                 play_count INTEGER DEFAULT 0,
-                metadata_complete INTEGER DEFAULT 0
+                metadata_complete INTEGER DEFAULT 0,
+                camelot TEXT,
+                content_hash TEXT,
+                missing INTEGER DEFAULT 0,
+                missing_since TEXT,
+                artwork_hash TEXT,
+                loudness_lufs REAL,
+                replay_gain_db REAL,
+                peak_dbfs REAL,
+                energy REAL,
+                danceability REAL
             )
         """)
+        # Camelot code derived from key, for harmonic-compatibility lookups
+        if _add_missing_columns(cursor, "tracks", {"camelot": "TEXT"}):
+            _backfill_camelot(cursor)
+        # Covers compatible-track lookups (a few keys, each with a BPM range)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tracks_camelot_bpm
+            ON tracks(camelot, bpm, id)
+        """)
+        # Partial content hash, to match moved files to their old rows
+        _add_missing_columns(cursor, "tracks", {"content_hash": "TEXT"})
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tracks_content_hash
+            ON tracks(content_hash)
+        """)
+        # Set by missing-file reconciliation; tracks are flagged, not deleted
+        _add_missing_columns(
+            cursor, "tracks", {"missing": "INTEGER DEFAULT 0", "missing_since": "TEXT"}
+        )
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tracks_missing
+            ON tracks(missing_since) WHERE missing = 1
+        """)
+        # Embedded cover art, stored once per distinct image by artwork_storage
+        _add_missing_columns(cursor, "tracks", {"artwork_hash": "TEXT"})
+        # Loudness (EBU R128 / ReplayGain 2.0) and energy, from batch analysis
+        _add_missing_columns(
+            cursor,
+            "tracks",
+            {
+                "loudness_lufs": "REAL",
+                "replay_gain_db": "REAL",
+                "peak_dbfs": "REAL",
+                "energy": "REAL",
+                "danceability": "REAL",
+            },
+        )
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS playlists (
                 id TEXT PRIMARY KEY,
                 name TEXT NOT NULL,
                 description TEXT,
                 created_at TEXT,
-                updated_at TEXT
+                updated_at TEXT,
+                track_count INTEGER NOT NULL DEFAULT 0,
+                total_duration_seconds INTEGER NOT NULL DEFAULT 0,
+                smart_rules TEXT
             )
         """)
+        # Denormalized aggregates for databases created before they existed
+        added_aggregates = _add_missing_columns(
+            cursor,
+            "playlists",
+            {
+                "track_count": "INTEGER NOT NULL DEFAULT 0",
+                "total_duration_seconds": "INTEGER NOT NULL DEFAULT 0",
+            },
+        )
+        # JSON filter rules of smart playlists, NULL for manual playlists
+        _add_missing_columns(cursor, "playlists", {"smart_rules": "TEXT"})
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_playlists_created_at
+            ON playlists(created_at)
+        """)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS playlist_tracks (
                 playlist_id TEXT,
@@ -107,6 +311,45 @@ def init_db():
             CREATE INDEX IF NOT EXISTS idx_playlist_tracks_track_id 
             ON playlist_tracks(track_id)
         """)
+        # Covers ordered (and paged) reads of a playlist's tracks
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_playlist_tracks_order
+            ON playlist_tracks(playlist_id, position, added_at, track_id)
+        """)
+        # Covering index for the default grid projection (sorted by title)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tracks_title_grid
+            ON tracks(title, id, artist, bpm, key)
+        """)
+        _create_playlist_aggregate_triggers(cursor)
+        # Per-track analysis arrays: feature vectors for similarity search
+        # (float32), duplicate-detection fingerprints (uint32), waveform
+        # peak overviews (int8) and delta-encoded beat grids (int32)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS track_array_versions (
+                array_table TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            )
+        """)
+        _create_track_array_table(cursor, "track_features", "features")
+        _create_track_array_table(cursor, "track_fingerprints", "fingerprint")
+        _create_track_array_table(cursor, "track_waveforms", "peaks")
+        _create_track_array_table(cursor, "track_beat_grids", "grid")
+        if added_aggregates:
+            # Backfill aggregates once, after the columns were added
+            cursor.execute("""
+                UPDATE playlists SET
+                    track_count = (
+                        SELECT COUNT(t.id) FROM playlist_tracks pt
+                        INNER JOIN tracks t ON t.id = pt.track_id
+                        WHERE pt.playlist_id = playlists.id
+                    ),
+                    total_duration_seconds = (
+                        SELECT COALESCE(SUM(t.duration_seconds), 0) FROM playlist_tracks pt
+                        INNER JOIN tracks t ON t.id = pt.track_id
+                        WHERE pt.playlist_id = playlists.id
+                    )
+            """)
         # Reference data table for filter options and other stable reference data
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS refdata (
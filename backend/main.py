@@ -2,11 +2,25 @@
 This is the main file for the backend of the application.
 """
 
+import asyncio
+import sqlite3
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.database import init_db
 from routers import analysis, library, metadata, playlists, refdata, system, tracks
+from storage.playlist_storage import SMART_EXPIRY_SWEEP_SECONDS, playlist_storage
+
+
+async def sweep_expired_smart_members():
+    """Periodically drop smart playlist members that aged out of their rules."""
+    while True:
+        try:
+            await asyncio.to_thread(playlist_storage.prune_expired_smart_members)
+        except sqlite3.OperationalError:
+            # The database is busy (e.g. a scan is writing); retry next sweep
+            pass
+        await asyncio.sleep(SMART_EXPIRY_SWEEP_SECONDS)
 
 
 @asynccontextmanager
@@ -14,8 +28,10 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown."""
     # Startup
     init_db()
+    sweep = asyncio.create_task(sweep_expired_smart_members())
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    sweep.cancel()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -35,6 +35,42 @@ class Track(BaseModel):
     last_played: Optional[datetime] = None
     play_count: Optional[int] = None
     metadata_complete: Optional[bool] = None
+    camelot: Optional[str] = Field(
+        None, description="Camelot wheel code derived from key", example="8A"
+    )
+    content_hash: Optional[str] = Field(
+        None,
+        description=(
+            "Hash of the file size and its first and last blocks, used to "
+            "recognise the file after it is moved or renamed"
+        ),
+    )
+    missing: Optional[bool] = Field(
+        None, description="Whether the file was not found by the last reconciliation"
+    )
+    missing_since: Optional[datetime] = Field(
+        None, description="When the file was first found to be missing"
+    )
+    artwork_hash: Optional[str] = Field(
+        None, description="Hash of the embedded cover image, if the file has one"
+    )
+    loudness_lufs: Optional[float] = Field(
+        None, description="Integrated loudness (EBU R128) in LUFS", example=-8.4
+    )
+    replay_gain_db: Optional[float] = Field(
+        None, description="ReplayGain 2.0 track gain (to -18 LUFS) in dB", example=-9.6
+    )
+    peak_dbfs: Optional[float] = Field(
+        None,
+        description="Highest sample of any channel, at the file's own rate, in dBFS",
+        example=-0.3,
+    )
+    energy: Optional[float] = Field(
+        None, ge=0, le=1, description="Energy score, 0 (calm) to 1 (intense)"
+    )
+    danceability: Optional[float] = Field(
+        None, ge=0, le=1, description="Pulse regularity score, 0 (no steady beat) to 1"
+    )
 
 
 class TrackCreate(BaseModel):
@@ -97,6 +133,9 @@ class Playlist(BaseModel):
     description: Optional[str] = None
     track_count: Optional[int] = None
     total_duration_seconds: Optional[int] = Field(None, description="Total duration in seconds")
+    smart_rules: Optional["SmartPlaylistRules"] = Field(
+        None, description="Rules of a smart playlist; null for manual playlists"
+    )
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -105,6 +144,9 @@ class PlaylistDetail(Playlist):
     """Extended playlist model that includes the list of tracks."""
 
     tracks: Optional[List[Track]] = None
+    pagination: Optional[Pagination] = Field(
+        None, description="Present when tracks are requested one page at a time"
+    )
 
 
 class LibraryOverview(BaseModel):
@@ -120,6 +162,9 @@ class LibraryOverview(BaseModel):
         None, description="Percentage of tracks with complete metadata"
     )
     tracks_missing_metadata: Optional[int] = None
+    tracks_missing_files: Optional[int] = Field(
+        None, description="Tracks whose file was not found by the last reconciliation"
+    )
 
 
 class Pagination(BaseModel):
@@ -133,11 +178,9 @@ class Pagination(BaseModel):
     has_previous: Optional[bool] = None
 
 
-class GetTracksQueryParams(BaseModel):
-    """Query parameters for filtering and paginating tracks."""
+class TrackFilter(BaseModel):
+    """Criteria for selecting tracks from the library."""
 
-    page: int = Field(1, ge=1, description="Page number (1-based)")
-    size: int = Field(50, ge=1, le=100, description="Number of items per page")
     search: str = Field("", description="Search query for title, artist, or album")
     genre: str = Field("", description="Filter by genre")
     mood: str = Field("", description="Filter by mood")
@@ -147,8 +190,54 @@ class GetTracksQueryParams(BaseModel):
     artist: str = Field("", description="Filter by exact artist name")
     year_min: int = Field(0, description="Minimum year (inclusive)")
     year_max: int = Field(0, description="Maximum year (inclusive)")
+    missing: Optional[bool] = Field(
+        None,
+        description="Only tracks whose file is missing (true) or present (false)",
+    )
+    loudness_min: Optional[float] = Field(
+        None, description="Minimum integrated loudness in LUFS (inclusive)"
+    )
+    loudness_max: Optional[float] = Field(
+        None, description="Maximum integrated loudness in LUFS (inclusive)"
+    )
+    energy_min: Optional[float] = Field(
+        None, ge=0, le=1, description="Minimum energy score (inclusive)"
+    )
+    energy_max: Optional[float] = Field(
+        None, ge=0, le=1, description="Maximum energy score (inclusive)"
+    )
+    danceability_min: Optional[float] = Field(
+        None, ge=0, le=1, description="Minimum danceability score (inclusive)"
+    )
+    danceability_max: Optional[float] = Field(
+        None, ge=0, le=1, description="Maximum danceability score (inclusive)"
+    )
+
+
+class SmartPlaylistRules(TrackFilter):
+    """Track filter rules that define the membership of a smart playlist."""
+
+    added_within_days: Optional[int] = Field(
+        None, ge=1, description="Only tracks added to the library in the last N days"
+    )
+
+
+class TrackFilterParams(TrackFilter):
+    """Query parameters for filtering, sorting and projecting tracks."""
+
     sort_by: str = Field("title", description="Sort column")
     sort_order: str = Field("desc", description="Sort order (asc/desc)")
+    fields: str = Field(
+        "",
+        description="Comma-separated track fields to return (id is always included)",
+    )
+
+
+class GetTracksQueryParams(TrackFilterParams):
+    """Query parameters for filtering and paginating tracks."""
+
+    page: int = Field(1, ge=1, description="Page number (1-based)")
+    size: int = Field(50, ge=1, le=100, description="Number of items per page")
 
     class Config:
         """Pydantic config for query parameters."""
@@ -163,10 +252,119 @@ class GetTracksQueryParams(BaseModel):
                 "bpm_max": 140,
                 "sort_by": "title",
                 "sort_order": "asc",
+                "fields": "title,artist,bpm,key",
             }
         }
 
 
+class CompatibleTracksQueryParams(BaseModel):
+    """Query parameters for harmonic-compatibility lookups."""
+
+    bpm_tolerance: float = Field(
+        6.0, ge=0, le=50, description="Maximum tempo difference in percent"
+    )
+    half_double: bool = Field(
+        True, description="Also match tracks at half or double the tempo"
+    )
+    limit: int = Field(
+        50, ge=1, le=200, description="Maximum number of tracks returned"
+    )
+    fields: str = Field(
+        "",
+        description="Comma-separated track fields to return (id is always included)",
+    )
+
+
+class CompatibleTrack(BaseModel):
+    """A track that mixes with the reference track, and how well."""
+
+    track: Optional[Track] = None
+    key_distance: Optional[int] = Field(
+        None, description="Camelot wheel steps from the reference key (0 or 1)"
+    )
+    bpm_difference_percent: Optional[float] = Field(
+        None, description="Tempo difference in percent, after half/double time"
+    )
+    half_double_time: Optional[bool] = Field(
+        None, description="Whether the match is at half or double the tempo"
+    )
+    score: Optional[float] = Field(
+        None, description="Ranking score, lower mixes better"
+    )
+
+
+class CompatibleTracksResponse(BaseModel):
+    """Tracks that mix with a reference track, best match first."""
+
+    track_id: Optional[UUID] = None
+    camelot: Optional[str] = None
+    bpm: Optional[int] = None
+    data: Optional[List[CompatibleTrack]] = None
+
+
+class SimilarTracksQueryParams(BaseModel):
+    """Query parameters for audio-similarity lookups."""
+
+    limit: int = Field(
+        20, ge=1, le=200, description="Maximum number of tracks returned"
+    )
+    exact: bool = Field(
+        False, description="Search every track even when a partitioned index exists"
+    )
+    fields: str = Field(
+        "",
+        description="Comma-separated track fields to return (id is always included)",
+    )
+
+
+class SimilarTrack(BaseModel):
+    """A track that sounds like the reference track."""
+
+    track: Optional[Track] = None
+    similarity: Optional[float] = Field(
+        None, description="Cosine similarity of the audio features (-1 to 1)"
+    )
+
+
+class SimilarTracksResponse(BaseModel):
+    """Tracks that sound like a reference track, most similar first."""
+
+    track_id: Optional[UUID] = None
+    index: Optional[str] = Field(
+        None, description="Search used: exact, or ivf (partitioned, approximate)"
+    )
+    data: Optional[List[SimilarTrack]] = None
+
+
+class BeatGridResponse(BaseModel):
+    """Beat positions of a track, from batch metadata analysis."""
+
+    track_id: UUID
+    bpm: float = Field(..., description="Tempo fitted over all beats", example=124.02)
+    first_beat_ms: Optional[int] = Field(
+        None, description="Position of the first beat in milliseconds"
+    )
+    beat_times_ms: List[int] = Field(..., description="Beat positions in milliseconds")
+    downbeat_times_ms: List[int] = Field(
+        ..., description="Estimated first beats of each bar (4/4) in milliseconds"
+    )
+
+
+class TrackExportFormat(Enum):
+    """Supported formats for streaming track library exports."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportTracksQueryParams(TrackFilterParams):
+    """Query parameters for streaming a filtered track library export."""
+
+    format: TrackExportFormat = Field(
+        TrackExportFormat.NDJSON, description="Export format (ndjson/csv)"
+    )
+
+
 class TracksListResponse(BaseModel):
     """Response wrapper for paginated track listings."""
 
@@ -238,6 +436,14 @@ class ScanStatusResponse(BaseModel):
     files_skipped: Optional[int] = Field(
         None, description="Number of files skipped (duplicates)", example=47
     )
+    files_moved: Optional[int] = Field(
+        None,
+        description=(
+            "Number of files recognised as moved or renamed tracks, whose "
+            "path was updated in place"
+        ),
+        example=12,
+    )
     errors: Optional[List[str]] = Field(
         None, description="List of errors encountered during the scan"
     )
@@ -248,6 +454,118 @@ class ScanStatusResponse(BaseModel):
     )
 
 
+class DuplicateScanStatus(Enum):
+    """Status values for duplicate detection jobs."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class DuplicateScanResponse(BaseModel):
+    """Response returned when a duplicate detection job is queued."""
+
+    job_id: Optional[UUID] = None
+    status: Optional[DuplicateScanStatus] = None
+    message: Optional[str] = Field(None, example="Duplicate scan queued")
+
+
+class DuplicateScanStatusResponse(BaseModel):
+    """Progress and summary of a duplicate detection job."""
+
+    job_id: Optional[UUID] = None
+    status: Optional[DuplicateScanStatus] = None
+    message: Optional[str] = Field(None, example="Comparing fingerprints...")
+    tracks_fingerprinted: Optional[int] = Field(
+        None, description="Tracks with a stored fingerprint that were compared"
+    )
+    duplicate_groups: Optional[int] = Field(
+        None, description="Number of groups of tracks with the same recording"
+    )
+    duplicate_tracks: Optional[int] = Field(
+        None, description="Number of tracks that belong to a duplicate group"
+    )
+    duration_seconds: Optional[float] = None
+    errors: Optional[List[str]] = None
+
+
+class DuplicateReportQueryParams(BaseModel):
+    """Query parameters for a duplicate detection report."""
+
+    fields: str = Field(
+        "",
+        description="Comma-separated track fields to return (id is always included)",
+    )
+
+
+class DuplicateGroup(BaseModel):
+    """Tracks whose audio is the same recording."""
+
+    tracks: Optional[List[Track]] = None
+    bit_error_rate: Optional[float] = Field(
+        None,
+        description=(
+            "Largest fingerprint bit error rate between matched tracks in the "
+            "group (0 for identical audio; unrelated audio is about 0.5)"
+        ),
+    )
+
+
+class DuplicateReportResponse(BaseModel):
+    """Duplicate groups found by a duplicate detection job, closest first."""
+
+    job_id: Optional[UUID] = None
+    data: Optional[List[DuplicateGroup]] = None
+
+
+class ReconcileStatus(Enum):
+    """Status values for missing-file reconciliation jobs."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ReconcileResponse(BaseModel):
+    """Response returned when a missing-file reconciliation job is queued."""
+
+    job_id: Optional[UUID] = None
+    status: Optional[ReconcileStatus] = None
+    message: Optional[str] = Field(None, example="Reconciliation queued")
+
+
+class ReconcileStatusResponse(BaseModel):
+    """Progress and counts of a missing-file reconciliation job."""
+
+    job_id: Optional[UUID] = None
+    status: Optional[ReconcileStatus] = None
+    message: Optional[str] = Field(None, example="Checking 200000 file(s)...")
+    progress: Optional[float] = Field(
+        None, description="Progress percentage (0-100)", example=42.0
+    )
+    tracks_total: Optional[int] = None
+    tracks_checked: Optional[int] = None
+    tracks_missing: Optional[int] = Field(
+        None, description="Tracks whose file is missing, including earlier sweeps"
+    )
+    newly_missing: Optional[int] = Field(
+        None, description="Tracks flagged as missing by this job"
+    )
+    found_again: Optional[int] = Field(
+        None, description="Previously missing tracks whose file is back"
+    )
+    tracks_unchecked: Optional[int] = Field(
+        None,
+        description="Tracks whose path could not be checked; their flag is unchanged",
+    )
+    duration_seconds: Optional[float] = None
+    errors: Optional[List[str]] = Field(
+        None, description="First paths that could not be checked, with the reason"
+    )
+
+
 class BulkDeleteTracksRequest(BaseModel):
     """Request to delete multiple tracks from the library."""
 
@@ -260,6 +578,56 @@ class BulkDeleteTracksResponse(BaseModel):
     deleted_count: Optional[int] = None
 
 
+class BulkCreateTracksRequest(BaseModel):
+    """Request to add multiple tracks to the library."""
+
+    tracks: List[TrackCreate] = Field(..., description="Tracks to create")
+
+
+class BulkCreateTracksResponse(BaseModel):
+    """Response from bulk track creation operation."""
+
+    track_ids: Optional[List[UUID]] = Field(
+        None,
+        description="ID for each requested track, in request order (existing tracks keep their ID)",
+    )
+    created_count: Optional[int] = None
+    skipped_count: Optional[int] = Field(
+        None,
+        description="Number of tracks skipped because their file path already exists",
+    )
+
+
+class TrackPatch(TrackUpdate):
+    """Metadata changes for a single track in a bulk update."""
+
+    track_id: UUID
+
+
+class BulkUpdateTracksRequest(BaseModel):
+    """
+    Request to update metadata for multiple tracks in one transaction.
+
+    Provide either `updates` (one patch per track), or a single `patch`
+    applied to `track_ids` or to every track matching `filter`.
+    """
+
+    updates: Optional[List[TrackPatch]] = None
+    patch: Optional[TrackUpdate] = None
+    track_ids: Optional[List[UUID]] = None
+    filter: Optional[TrackFilter] = None
+    return_tracks: Optional[bool] = Field(
+        False, description="If true, include the updated tracks in the response"
+    )
+
+
+class BulkUpdateTracksResponse(BaseModel):
+    """Response from bulk track update operation."""
+
+    updated_count: Optional[int] = None
+    tracks: Optional[List[Track]] = None
+
+
 class AnalysisOptions(BaseModel):
     """Options for controlling metadata analysis behavior."""
 
@@ -311,6 +679,13 @@ class BatchAnalyzeMetadataRequest(BaseModel):
     """Request to analyze metadata for multiple tracks."""
 
     track_ids: Optional[List[UUID]] = None
+    reanalyze: Optional[bool] = Field(
+        False,
+        description=(
+            "Decode tracks whose waveform, beat grid, features, fingerprint "
+            "and loudness are already stored again, instead of skipping them"
+        ),
+    )
 
 
 class BatchAnalyzeMetadataResponse(BaseModel):
@@ -412,6 +787,9 @@ class CreatePlaylistRequest(BaseModel):
     description: Optional[str] = Field(
         None, example="High energy house tracks for summer sets"
     )
+    smart_rules: Optional[SmartPlaylistRules] = Field(
+        None, description="Create a smart playlist whose tracks follow these rules"
+    )
 
 
 class UpdatePlaylistRequest(BaseModel):
@@ -419,6 +797,13 @@ class UpdatePlaylistRequest(BaseModel):
 
     name: Optional[str] = None
     description: Optional[str] = None
+    smart_rules: Optional[SmartPlaylistRules] = Field(
+        None,
+        description=(
+            "Replace a smart playlist's rules and rebuild its tracks; null turns "
+            "it back into a manual playlist that keeps its current tracks"
+        ),
+    )
 
 
 class AddTracksToPlaylistRequest(BaseModel):
@@ -427,19 +812,94 @@ class AddTracksToPlaylistRequest(BaseModel):
     track_ids: Optional[List[UUID]] = None
 
 
+class AddTracksToPlaylistResponse(BaseModel):
+    """Response from adding tracks to a playlist."""
+
+    message: Optional[str] = Field(None, example="Tracks added successfully")
+    added_count: Optional[int] = None
+    skipped_count: Optional[int] = Field(
+        None,
+        description="Tracks skipped because they do not exist or are already in the playlist",
+    )
+
+
 class RemoveTracksFromPlaylistRequest(BaseModel):
     """Request to remove tracks from a playlist."""
 
     track_ids: Optional[List[UUID]] = None
 
 
+class MovePlaylistTrackRequest(BaseModel):
+    """Request to move a track to a new place within a playlist."""
+
+    track_id: UUID
+    after_track_id: Optional[UUID] = Field(
+        None,
+        description="Track to place the moved track after; omit to move it to the top",
+    )
+
+
+class OrderPlaylistRequest(BaseModel):
+    """Request to reorder a playlist for smooth harmonic and tempo transitions."""
+
+    start_track_id: Optional[UUID] = Field(
+        None, description="Track the set must open with; omit to let the solver choose"
+    )
+    key_weight: float = Field(1.0, ge=0, description="Cost per Camelot wheel step")
+    bpm_weight: float = Field(
+        0.2,
+        ge=0,
+        description="Cost per percent of tempo change (half/double time aware)",
+    )
+    energy_weight: float = Field(
+        1.0,
+        ge=0,
+        description=(
+            "Cost per unit of energy change (0-1 scale); tracks without an "
+            "analyzed energy add no energy cost"
+        ),
+    )
+    time_budget_ms: int = Field(
+        500, ge=10, le=10000, description="Maximum time spent improving the order"
+    )
+    apply: bool = Field(True, description="Save the new order; false only previews it")
+
+
+class OrderPlaylistResponse(BaseModel):
+    """Result of ordering a playlist."""
+
+    track_ids: Optional[List[UUID]] = None
+    cost_before: Optional[float] = Field(
+        None, description="Transition cost of the previous order"
+    )
+    cost_after: Optional[float] = Field(
+        None, description="Transition cost of the new order"
+    )
+    converged: Optional[bool] = Field(
+        None,
+        description="False if the time budget ran out before no move could improve the order",
+    )
+    solve_ms: Optional[float] = None
+    applied: Optional[bool] = None
+
+
 class Format(Enum):
     """Supported playlist export formats."""
 
     M3U = "m3u"
+    M3U8 = "m3u8"
     PLS = "pls"
     XSPF = "xspf"
     JSON = "json"
+    REKORDBOX = "rekordbox"
+
+
+class CopyMode(Enum):
+    """How exported audio files are placed in the export folder."""
+
+    COPY = "copy"
+    HARDLINK = "hardlink"
+    REFLINK = "reflink"
 
 
 class ExportPlaylistRequest(BaseModel):
@@ -447,6 +907,7 @@ class ExportPlaylistRequest(BaseModel):
 
     format: Optional[Format] = Format.M3U
     output_path: Optional[str] = None
+    copy_mode: Optional[CopyMode] = CopyMode.COPY
 
 
 class ExportPlaylistResponse(BaseModel):
@@ -454,6 +915,43 @@ class ExportPlaylistResponse(BaseModel):
 
     file_path: Optional[str] = None
     format: Optional[str] = None
+    files_copied: Optional[int] = None
+    files_skipped: Optional[int] = None
+    bytes_copied: Optional[int] = None
+    duration_seconds: Optional[float] = None
+    throughput_bytes_per_second: Optional[float] = None
+
+
+class ExportStatus(Enum):
+    """Status values for playlist export jobs."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class ExportJobResponse(BaseModel):
+    """Response returned when a playlist export job is queued."""
+
+    job_id: Optional[UUID] = None
+    status: Optional[ExportStatus] = None
+    message: Optional[str] = Field(None, example="Playlist export queued")
+
+
+class ExportJobStatusResponse(ExportPlaylistResponse):
+    """Progress and result of a playlist export job."""
+
+    job_id: Optional[UUID] = None
+    playlist_id: Optional[UUID] = None
+    status: Optional[ExportStatus] = None
+    message: Optional[str] = None
+    progress: Optional[float] = Field(
+        None, description="Progress percentage (0-100)", example=42.0
+    )
+    files_total: Optional[int] = None
+    errors: Optional[List[str]] = None
 
 
 class DistributionItem(BaseModel):
@@ -84,6 +84,10 @@ def get_library_overview(
     # Tracks missing metadata
     tracks_missing_metadata = total_tracks - complete_tracks
 
+    # Tracks whose file was not found by the last reconciliation
+    cursor.execute("SELECT COUNT(*) FROM tracks WHERE missing = 1")
+    tracks_missing_files = cursor.fetchone()[0]
+
     cursor.close()
 
     return LibraryOverview(
@@ -95,6 +99,7 @@ def get_library_overview(
         most_common_key=most_common_key,
         metadata_completeness=metadata_completeness,
         tracks_missing_metadata=tracks_missing_metadata,
+        tracks_missing_files=tracks_missing_files,
     )
 
 
@@ -2,18 +2,59 @@
 
 import os
 import re
+import time
 import uuid
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from models import ScanLibraryRequest, ScanLibraryResponse, ScanStatusResponse, Status
-from utils.scan_utils import find_audio_files, extract_metadata
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from models import (
+    DuplicateGroup,
+    DuplicateReportQueryParams,
+    DuplicateReportResponse,
+    DuplicateScanResponse,
+    DuplicateScanStatus,
+    DuplicateScanStatusResponse,
+    ReconcileResponse,
+    ReconcileStatus,
+    ReconcileStatusResponse,
+    ScanLibraryRequest,
+    ScanLibraryResponse,
+    ScanStatusResponse,
+    Status,
+    Track,
+)
+from services.fingerprint import find_duplicate_pairs, group_duplicates
+from utils.duplicate_progress import duplicate_tracker
+from utils.reconcile_progress import (
+    RECONCILE_BATCH_SIZE,
+    RECONCILE_STAT_WORKERS,
+    reconcile_tracker,
+)
+from utils.scan_utils import (
+    check_file_exists,
+    extract_metadata,
+    find_audio_files,
+    partial_content_hash,
+)
 from utils.scan_progress import scan_tracker
-from storage.track_storage import storage
+from storage.artwork_storage import artwork_storage
+from storage.feature_storage import fingerprint_storage
+from storage.track_storage import resolve_track_fields, storage
 
 router = APIRouter(prefix="/library", tags=["Library"])
 
 
+def _find_moved_track(content_hash: Optional[str]) -> Optional[Track]:
+    """Find a track whose file no longer exists and had the same content hash."""
+    if content_hash is None:
+        return None
+    for track in storage.get_tracks_by_content_hash(content_hash):
+        if not os.path.exists(track.file_path):
+            return track
+    return None
+
+
 def _process_file(
     scan_id: UUID, file_path: str, total_files: int, skip_duplicates: bool, counts: dict
 ) -> dict:
@@ -25,6 +66,14 @@ def _process_file(
         existing_track = storage.get_track_by_path(file_path)
         # If skip_duplicates is True and track exists, skip it
         if skip_duplicates and existing_track:
+            # Tracks added before content hashes were stored get one now, so
+            # a later move is still recognised
+            if existing_track.content_hash is None:
+                content_hash = partial_content_hash(file_path)
+                if content_hash:
+                    storage.update_track(
+                        existing_track.id, {"content_hash": content_hash}
+                    )
             counts["files_skipped"] += 1
 
             progress = (counts["files_scanned"] / total_files) * 100
@@ -36,8 +85,37 @@ def _process_file(
             )
             return counts
 
+        content_hash = partial_content_hash(file_path)
+        moved_track = None if existing_track else _find_moved_track(content_hash)
+        if moved_track:
+            # Same file at a new path: keep the track, its analysis and its
+            # playlist entries, and only point it at the new location
+            storage.update_track(moved_track.id, {"file_path": file_path})
+            storage.set_tracks_missing([str(moved_track.id)], False)
+            counts["files_moved"] += 1
+
+            progress = (counts["files_scanned"] / total_files) * 100
+            scan_tracker.update_scan(
+                scan_id,
+                files_scanned=counts["files_scanned"],
+                files_moved=counts["files_moved"],
+                progress=progress,
+            )
+            return counts
+
         # Process the file (extract metadata and create/update track)
         track_data, error, file_props = extract_metadata(file_path)
+        file_props["content_hash"] = content_hash
+        try:
+            # Tracks of an album usually embed the same cover, which is
+            # stored (and thumbnailed) only the first time it is seen
+            file_props["artwork_hash"] = artwork_storage.save(
+                file_props.pop("artwork", None)
+            )
+        except OSError as e:
+            scan_tracker.update_scan(
+                scan_id, error=f"{file_path}: could not store artwork: {e}"
+            )
         if existing_track:
             # Track already exists - update it with new metadata
             storage.update_track(
@@ -53,6 +131,8 @@ def _process_file(
                     "duration_seconds": file_props.get("duration_seconds"),
                     "bitrate_bps": file_props.get("bitrate_bps"),
                     "sample_rate_hz": file_props.get("sample_rate_hz"),
+                    "content_hash": content_hash,
+                    "artwork_hash": file_props.get("artwork_hash"),
                 },
             )
             counts["files_added"] += 1  # Count as added even though it's an update
@@ -129,7 +209,12 @@ def process_scan(
             progress=0.0,
         )
 
-        counts = {"files_scanned": 0, "files_added": 0, "files_skipped": 0}
+        counts = {
+            "files_scanned": 0,
+            "files_added": 0,
+            "files_skipped": 0,
+            "files_moved": 0,
+        }
         for file_path in all_audio_files:
             counts = _process_file(
                 scan_id, file_path, total_files, skip_duplicates, counts
@@ -220,3 +305,194 @@ def get_scan_status(scan_id: UUID) -> ScanStatusResponse:
     if status is None:
         raise HTTPException(status_code=404, detail=f"Scan {scan_id} not found")
     return status
+
+
+def process_duplicate_scan(job_id: UUID):
+    """Duplicate scan job: compare every stored fingerprint and group copies."""
+    try:
+        started = time.perf_counter()
+        duplicate_tracker.update_job(
+            job_id,
+            status=DuplicateScanStatus.RUNNING,
+            message="Loading fingerprints...",
+        )
+        track_ids, fingerprints = fingerprint_storage.load_all()
+
+        duplicate_tracker.update_job(
+            job_id,
+            message=f"Comparing fingerprints of {len(track_ids)} track(s)...",
+            tracks_fingerprinted=len(track_ids),
+        )
+        groups = group_duplicates(find_duplicate_pairs(fingerprints))
+        report = [
+            ([UUID(track_ids[row]) for row in rows], error_rate)
+            for rows, error_rate in groups
+        ]
+        duplicate_tracker.complete_job(job_id, report, time.perf_counter() - started)
+    except Exception as e:
+        # Anything else would leave the scan running and its report unreachable
+        duplicate_tracker.fail_job(job_id, str(e))
+
+
+@router.post("/duplicates/scan", status_code=202)
+def scan_duplicates() -> DuplicateScanResponse:
+    """
+    Find tracks that are copies of the same recording (e.g. an MP3 and a
+    FLAC rip) by comparing acoustic fingerprints.
+
+    Fingerprints are stored by batch metadata analysis; tracks that were not
+    analyzed are not compared. The scan runs as a queued job; poll its status
+    endpoint, then fetch the report.
+    """
+    job_id = uuid.uuid4()
+    duplicate_tracker.create_job(job_id)
+    duplicate_tracker.submit(job_id, process_duplicate_scan)
+    return DuplicateScanResponse(
+        job_id=job_id,
+        status=DuplicateScanStatus.QUEUED,
+        message="Duplicate scan queued",
+    )
+
+
+@router.get("/duplicates/scan/{job_id}/status")
+def get_duplicate_scan_status(job_id: UUID) -> DuplicateScanStatusResponse:
+    """
+    Get the progress of a duplicate scan job.
+    """
+    status = duplicate_tracker.get_job_status(job_id)
+    if status is None:
+        raise HTTPException(
+            status_code=404, detail=f"Duplicate scan {job_id} not found"
+        )
+    return status
+
+
+@router.get("/duplicates/scan/{job_id}/report", response_model_exclude_unset=True)
+def get_duplicate_report(
+    job_id: UUID, query_params: DuplicateReportQueryParams = Depends()
+) -> DuplicateReportResponse:
+    """
+    Get the duplicate groups found by a completed duplicate scan, closest
+    copies first. Tracks deleted since the scan are left out.
+    """
+    try:
+        columns = resolve_track_fields(query_params.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if duplicate_tracker.get_job_status(job_id) is None:
+        raise HTTPException(
+            status_code=404, detail=f"Duplicate scan {job_id} not found"
+        )
+    report = duplicate_tracker.get_report(job_id)
+    if report is None:
+        raise HTTPException(
+            status_code=400, detail=f"Duplicate scan {job_id} has not completed"
+        )
+
+    tracks_by_id = {
+        str(track.id): track
+        for track in storage.get_tracks_by_ids(
+            [track_id for track_ids, _ in report for track_id in track_ids], columns
+        )
+    }
+    groups = []
+    for track_ids, error_rate in report:
+        tracks = [
+            tracks_by_id[str(track_id)]
+            for track_id in track_ids
+            if str(track_id) in tracks_by_id
+        ]
+        if len(tracks) > 1:
+            groups.append(
+                DuplicateGroup(tracks=tracks, bit_error_rate=round(error_rate, 4))
+            )
+    return DuplicateReportResponse(job_id=job_id, data=groups)
+
+
+def process_reconcile(job_id: UUID):
+    """Reconciliation job: stat every track path and flag missing files."""
+    try:
+        started = time.perf_counter()
+        reconcile_tracker.update_job(
+            job_id, status=ReconcileStatus.RUNNING, message="Loading track paths..."
+        )
+        track_paths = storage.get_track_paths()
+        total = len(track_paths)
+        reconcile_tracker.update_job(
+            job_id, tracks_total=total, message=f"Checking {total} file(s)..."
+        )
+
+        counts = {"tracks_checked": 0, "newly_missing": 0, "found_again": 0}
+        tracks_missing = 0
+        with ThreadPoolExecutor(
+            max_workers=RECONCILE_STAT_WORKERS, thread_name_prefix="reconcile-stat"
+        ) as pool:
+            for start in range(0, total, RECONCILE_BATCH_SIZE):
+                batch = track_paths[start : start + RECONCILE_BATCH_SIZE]
+                results = pool.map(check_file_exists, [path for _, path, _ in batch])
+                now_missing, now_present = [], []
+                for (track_id, path, was_missing), (exists, error) in zip(
+                    batch, results
+                ):
+                    if exists is None:
+                        # Unreachable paths keep their current flag
+                        reconcile_tracker.update_job(job_id, error=f"{path}: {error}")
+                        tracks_missing += was_missing
+                    elif exists:
+                        if was_missing:
+                            now_present.append(track_id)
+                    else:
+                        tracks_missing += 1
+                        if not was_missing:
+                            now_missing.append(track_id)
+
+                counts["newly_missing"] += storage.set_tracks_missing(now_missing, True)
+                counts["found_again"] += storage.set_tracks_missing(now_present, False)
+                counts["tracks_checked"] += len(batch)
+                reconcile_tracker.update_job(
+                    job_id,
+                    progress=round(counts["tracks_checked"] / total * 100, 1),
+                    tracks_missing=tracks_missing,
+                    **counts,
+                )
+
+        reconcile_tracker.update_job(job_id, tracks_missing=tracks_missing)
+        reconcile_tracker.complete_job(job_id, time.perf_counter() - started)
+    except Exception as e:
+        reconcile_tracker.fail_job(job_id, str(e))
+    finally:
+        # A job left active would be returned by every later request, so the
+        # scheduled sweep would never run again
+        if reconcile_tracker.is_active(job_id):
+            reconcile_tracker.fail_job(job_id, "Reconciliation stopped unexpectedly")
+
+
+@router.post("/reconcile", status_code=202)
+def reconcile_library() -> ReconcileResponse:
+    """
+    Check that every track's file still exists.
+
+    Tracks whose file is gone are flagged as missing (with the time it was
+    first noticed) rather than deleted, and the flag is cleared when the
+    file comes back. Filter them with `GET /tracks?missing=true`.
+
+    Only one reconciliation runs at a time; while one is queued or running
+    this returns it instead of starting another, so the endpoint can be
+    called on a schedule.
+    """
+    job = reconcile_tracker.start_job(process_reconcile)
+    return ReconcileResponse(job_id=job.job_id, status=job.status, message=job.message)
+
+
+@router.get("/reconcile/{job_id}/status")
+def get_reconcile_status(job_id: UUID) -> ReconcileStatusResponse:
+    """
+    Get the progress and counts of a missing-file reconciliation job.
+    """
+    status = reconcile_tracker.get_job_status(job_id)
+    if status is None:
+        raise HTTPException(
+            status_code=404, detail=f"Reconciliation {job_id} not found"
+        )
+    return status
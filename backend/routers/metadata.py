@@ -13,12 +13,27 @@ from models import (
     ConfidenceScores,
     MetadataAnalysis,
 )
+from services.loudness import LOUDNESS_FIELDS
 from services.metadata_service import analyze_metadata
+from storage.feature_storage import (
+    beat_grid_storage,
+    feature_storage,
+    fingerprint_storage,
+    waveform_storage,
+)
 from storage.track_storage import storage
 from utils.analysis_progress import analysis_tracker
 
 router = APIRouter(prefix="/metadata", tags=["Metadata"])
 
+# Analysis result keys stored as per-track arrays, with their storage
+ANALYSIS_ARRAY_STORAGE = {
+    "features": feature_storage,
+    "fingerprint": fingerprint_storage,
+    "waveform": waveform_storage,
+    "beat_grid": beat_grid_storage,
+}
+
 
 def _should_use_audio_analysis(analysis_options: Optional[AnalysisOptions]) -> bool:
     """Determine if audio analysis should be used based on options."""
@@ -36,11 +51,29 @@ def _build_update_dict(
         update_dict["bpm"] = result["bpm"]
     if result.get("key") and (not analysis_options or analysis_options.detect_key):
         update_dict["key"] = result["key"]
+    # Loudness and energy come from the full decode, whatever the options
+    for field in LOUDNESS_FIELDS:
+        if result.get(field) is not None:
+            update_dict[field] = result[field]
     return update_dict
 
 
+def _has_full_analysis(track_id: UUID, loudness_lufs: Optional[float]) -> bool:
+    """
+    Whether a track already has everything the full-track decode stores.
+
+    A fingerprint, beat grid or loudness can be missing for short, silent or
+    beatless audio, so such tracks are decoded again on every batch.
+    """
+    return loudness_lufs is not None and all(
+        array_storage.has(track_id) for array_storage in ANALYSIS_ARRAY_STORAGE.values()
+    )
+
+
 def _process_single_track(
-    track_id: UUID, analysis_options: Optional[AnalysisOptions]
+    track_id: UUID,
+    analysis_options: Optional[AnalysisOptions],
+    reanalyze: bool = False,
 ) -> tuple[bool, Optional[str]]:
     """Process metadata analysis for a single track.
 
@@ -53,25 +86,40 @@ def _process_single_track(
         if not track or not track.file_path:
             return False, f"Track {track_id} not found or missing file path"
 
-        # Analyze metadata
+        # Analyze metadata; similar-track features, the duplicate-detection
+        # fingerprint, the waveform overview and the beat grid come from the
+        # same decode, which is skipped when they are already stored
         use_audio = _should_use_audio_analysis(analysis_options)
         result = analyze_metadata(
-            file_path=track.file_path, use_audio_analysis=use_audio
+            file_path=track.file_path,
+            use_audio_analysis=use_audio,
+            extract_features=reanalyze
+            or not _has_full_analysis(track_id, track.loudness_lufs),
         )
 
+        stored_arrays = False
+        for name, array_storage in ANALYSIS_ARRAY_STORAGE.items():
+            array = result.get(name)
+            if array is not None:
+                array_storage.save([(track_id, array)])
+                stored_arrays = True
+
         # Update track with detected metadata
         update_dict = _build_update_dict(result, analysis_options)
         if update_dict:
             storage.update_track(track_id, update_dict)
             return True, None
 
-        return False, None
+        return stored_arrays, None
     except (OSError, ValueError, RuntimeError) as e:
         return False, f"Error processing track {track_id}: {str(e)}"
 
 
 def _process_analysis(
-    job_id: UUID, track_ids: List[UUID], analysis_options: AnalysisOptions
+    job_id: UUID,
+    track_ids: List[UUID],
+    analysis_options: AnalysisOptions,
+    reanalyze: bool = False,
 ):
     """Background task to process batch metadata analysis."""
     try:
@@ -79,7 +127,7 @@ def _process_analysis(
             analysis_tracker.create_job(job_id)
 
         for track_id in track_ids:
-            _, error = _process_single_track(track_id, analysis_options)
+            _, error = _process_single_track(track_id, analysis_options, reanalyze)
             if error:
                 # Add error to job's error list
                 job = analysis_tracker.get_job_status(job_id)
@@ -149,6 +197,9 @@ def batch_analyze_metadata(
 ) -> BatchAnalyzeMetadataResponse:
     """
     Analyze metadata for multiple tracks in the background.
+
+    Tracks whose full-track analysis is already stored are only checked for
+    a missing BPM or key, unless `reanalyze` is set.
     """
     if not request.track_ids:
         raise HTTPException(status_code=400, detail="track_ids list is required")
@@ -168,6 +219,7 @@ def batch_analyze_metadata(
         job_id,
         request.track_ids,
         analysis_options,
+        bool(request.reanalyze),
     )
 
     return BatchAnalyzeMetadataResponse(
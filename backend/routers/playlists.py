@@ -1,27 +1,47 @@
 """Playlist management endpoints."""
 
-import json
 import os
-import shutil
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from models import (
     AddTracksToPlaylistRequest,
+    AddTracksToPlaylistResponse,
+    CopyMode,
     CreatePlaylistRequest,
+    ExportJobResponse,
+    ExportJobStatusResponse,
     ExportPlaylistRequest,
-    ExportPlaylistResponse,
+    ExportStatus,
     Format,
+    MovePlaylistTrackRequest,
+    OrderPlaylistRequest,
+    OrderPlaylistResponse,
     Playlist,
     PlaylistDetail,
     RemoveTracksFromPlaylistRequest,
     Track,
     UpdatePlaylistRequest,
 )
+from services.set_ordering import build_cost_matrix, order_set, path_cost
 from storage.playlist_storage import playlist_storage
+from storage.track_storage import resolve_track_fields
+from utils.export_progress import export_tracker
+from utils.file_ops import plan_destinations, sync_files
+from utils.playlist_writers import (
+    encode_playlist,
+    get_writer,
+    playlist_entries,
+    write_playlist_file,
+)
+from utils.zip_stream import stream_zip
 
 router = APIRouter(prefix="/playlists", tags=["Playlists"])
 
@@ -38,31 +58,69 @@ def get_all_playlists() -> List[Playlist]:
 def create_playlist(request: CreatePlaylistRequest) -> Playlist:
     """
     Create a new playlist.
+    With `smart_rules`, the playlist's tracks follow the rules automatically.
     """
     playlist = playlist_storage.create_playlist(
-        name=request.name, description=request.description
+        name=request.name,
+        description=request.description,
+        smart_rules=request.smart_rules,
     )
     return playlist
 
 
-@router.get("/{playlist_id}")
-def get_playlist(playlist_id: UUID) -> PlaylistDetail:
+@router.get("/{playlist_id}", response_model_exclude_unset=True)
+def get_playlist(
+    playlist_id: UUID,
+    fields: str = Query(
+        "", description="Comma-separated track fields to return (id is always included)"
+    ),
+    page: int = Query(1, ge=1, description="Page number (1-based)"),
+    size: Optional[int] = Query(
+        None, ge=1, le=500, description="Tracks per page; omit to return all tracks"
+    ),
+) -> PlaylistDetail:
     """
     Get playlist details including tracks.
+    Tracks can be paged with `page`/`size` and projected with `fields`.
     """
-    playlist = playlist_storage.get_playlist_detail(playlist_id)
+    try:
+        columns = resolve_track_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    playlist = playlist_storage.get_playlist_detail(
+        playlist_id, columns, page=page, size=size
+    )
     if not playlist:
         raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
     return playlist
 
 
+@router.get("/{playlist_id}/track-ids")
+def get_playlist_track_ids(playlist_id: UUID) -> List[UUID]:
+    """
+    Get only the IDs of a playlist's tracks, in playlist order.
+    """
+    track_ids = playlist_storage.get_playlist_track_ids(playlist_id)
+    if track_ids is None:
+        raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
+    return track_ids
+
+
 @router.put("/{playlist_id}")
 def update_playlist(playlist_id: UUID, request: UpdatePlaylistRequest) -> Playlist:
     """
-    Update playlist name or description.
+    Update playlist name, description or smart playlist rules.
+    Sending `smart_rules: null` turns a smart playlist back into a manual one.
     """
     updated_playlist = playlist_storage.update_playlist(
-        playlist_id=playlist_id, name=request.name, description=request.description
+        playlist_id=playlist_id,
+        name=request.name,
+        description=request.description,
+        smart_rules=request.smart_rules,
+        clear_smart_rules=(
+            "smart_rules" in request.model_fields_set and request.smart_rules is None
+        ),
     )
     if not updated_playlist:
         raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
@@ -81,17 +139,28 @@ def delete_playlist(playlist_id: UUID):
 
 
 @router.post("/{playlist_id}/tracks")
-def add_tracks_to_playlist(playlist_id: UUID, request: AddTracksToPlaylistRequest):
+def add_tracks_to_playlist(
+    playlist_id: UUID, request: AddTracksToPlaylistRequest
+) -> AddTracksToPlaylistResponse:
     """
     Add one or more tracks to a playlist.
     """
     if not request.track_ids:
         raise HTTPException(status_code=400, detail="No track IDs provided")
 
-    success = playlist_storage.add_tracks_to_playlist(playlist_id, request.track_ids)
-    if not success:
+    try:
+        result = playlist_storage.add_tracks_to_playlist(playlist_id, request.track_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if result is None:
         raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
-    return {"message": "Tracks added successfully"}
+
+    added_count, skipped_count = result
+    return AddTracksToPlaylistResponse(
+        message="Tracks added successfully",
+        added_count=added_count,
+        skipped_count=skipped_count,
+    )
 
 
 @router.delete("/{playlist_id}/tracks")
@@ -104,14 +173,96 @@ def remove_tracks_from_playlist(
     if not request.track_ids:
         raise HTTPException(status_code=400, detail="No track IDs provided")
 
-    success = playlist_storage.remove_tracks_from_playlist(
-        playlist_id, request.track_ids
-    )
+    try:
+        success = playlist_storage.remove_tracks_from_playlist(
+            playlist_id, request.track_ids
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     if not success:
         raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
     return {"message": "Tracks removed successfully"}
 
 
+@router.patch("/{playlist_id}/tracks")
+def move_playlist_track(
+    playlist_id: UUID,
+    request: MovePlaylistTrackRequest,
+    background_tasks: BackgroundTasks,
+):
+    """
+    Move a track within a playlist (after another track, or to the top).
+    """
+    try:
+        needs_renumber = playlist_storage.move_track(
+            playlist_id, request.track_id, request.after_track_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if needs_renumber is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Track {request.track_id} not found in playlist {playlist_id}",
+        )
+
+    if needs_renumber:
+        # Respace positions after responding so the next moves stay O(1)
+        background_tasks.add_task(playlist_storage.renumber_playlist, playlist_id)
+    return {"message": "Track moved successfully"}
+
+
+@router.post("/{playlist_id}/order")
+def order_playlist(
+    playlist_id: UUID, request: OrderPlaylistRequest
+) -> OrderPlaylistResponse:
+    """
+    Reorder a playlist as a DJ set, minimizing the combined key, tempo and
+    energy change between consecutive tracks.
+    """
+    playlist = playlist_storage.get_playlist_detail(
+        playlist_id, ["id", "key", "bpm", "energy"]
+    )
+    if not playlist:
+        raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
+
+    tracks_list = playlist.tracks or []
+    track_ids = [track.id for track in tracks_list]
+    start = None
+    if request.start_track_id is not None:
+        if request.start_track_id not in track_ids:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Track {request.start_track_id} is not in playlist {playlist_id}",
+            )
+        start = track_ids.index(request.start_track_id)
+
+    started = time.perf_counter()
+    cost = build_cost_matrix(
+        [track.key for track in tracks_list],
+        [track.bpm for track in tracks_list],
+        [track.energy for track in tracks_list],
+        key_weight=request.key_weight,
+        bpm_weight=request.bpm_weight,
+        energy_weight=request.energy_weight,
+    )
+    order, converged = order_set(cost, start, request.time_budget_ms / 1000)
+    solve_ms = (time.perf_counter() - started) * 1000
+
+    ordered_ids = [track_ids[index] for index in order]
+    if request.apply:
+        playlist_storage.set_track_order(playlist_id, ordered_ids)
+
+    return OrderPlaylistResponse(
+        track_ids=ordered_ids,
+        cost_before=round(path_cost(cost, range(len(track_ids))), 3),
+        cost_after=round(path_cost(cost, order), 3),
+        converged=converged,
+        solve_ms=round(solve_ms, 1),
+        applied=request.apply,
+    )
+
+
 def _normalize_format(export_format: Optional[Format]) -> Format:
     """Normalize export format from request."""
     if export_format is None:
@@ -119,9 +270,11 @@ def _normalize_format(export_format: Optional[Format]) -> Format:
     if isinstance(export_format, str):
         format_map = {
             "m3u": Format.M3U,
+            "m3u8": Format.M3U8,
             "pls": Format.PLS,
             "xspf": Format.XSPF,
             "json": Format.JSON,
+            "rekordbox": Format.REKORDBOX,
         }
         return format_map.get(export_format.lower(), Format.M3U)
     return export_format
@@ -134,237 +287,208 @@ def _generate_safe_filename(playlist_name: Optional[str]) -> str:
     return safe_name.replace(" ", "_")[:50]
 
 
-def _export_m3u(
-    file_path: Path, tracks_list: List[Track], file_mapping: dict[str, Path]
-):
-    """Export playlist in M3U format with relative paths to copied files."""
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write("#EXTM3U\n")
-        for track in tracks_list:
-            if track.file_path and track.file_path in file_mapping:
-                copied_file = file_mapping[track.file_path]
-                relative_path = copied_file.relative_to(file_path.parent)
-                artist = track.artist or "Unknown"
-                title = track.title or "Unknown"
-                duration = track.duration_seconds or -1
-                f.write(f"#EXTINF:{duration},{artist} - {title}\n")
-                f.write(f"{relative_path}\n")
-
-
-def _export_pls(
-    file_path: Path, tracks_list: List[Track], file_mapping: dict[str, Path]
-):
-    """Export playlist in PLS format with relative paths to copied files."""
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write("[playlist]\n")
-        f.write(f"NumberOfEntries={len(tracks_list)}\n")
-        for i, track in enumerate(tracks_list, 1):
-            if track.file_path and track.file_path in file_mapping:
-                copied_file = file_mapping[track.file_path]
-                relative_path = copied_file.relative_to(file_path.parent)
-                artist = track.artist or "Unknown"
-                title = track.title or "Unknown"
-                f.write(f"File{i}={relative_path}\n")
-                f.write(f"Title{i}={artist} - {title}\n")
-                if track.duration_seconds:
-                    f.write(f"Length{i}={track.duration_seconds}\n")
-                f.write("\n")
-
-
-def _write_xspf_track(
-    f, track: Track, file_mapping: dict[str, Path], playlist_file: Path
-):
-    """Write a single track entry in XSPF format with relative path."""
-    if not track.file_path or track.file_path not in file_mapping:
-        return
-    copied_file = file_mapping[track.file_path]
-    relative_path = copied_file.relative_to(playlist_file.parent)
-    f.write("    <track>\n")
-    if track.title:
-        f.write(f"      <title>{track.title}</title>\n")
-    if track.artist:
-        f.write(f"      <creator>{track.artist}</creator>\n")
-    if track.album:
-        f.write(f"      <album>{track.album}</album>\n")
-    if track.duration_seconds:
-        f.write(f"      <duration>{track.duration_seconds * 1000}</duration>\n")
-    f.write(f"      <location>{relative_path}</location>\n")
-    f.write("    </track>\n")
-
-
-def _export_xspf(
-    file_path: Path,
-    playlist: PlaylistDetail,
-    tracks_list: List[Track],
-    file_mapping: dict[str, Path],
-):
-    """Export playlist in XSPF format with relative paths to copied files."""
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-        f.write('<playlist version="1" xmlns="http://xspf.org/ns/0/">\n')
-        f.write(f"  <title>{playlist.name}</title>\n")
-        if playlist.description:
-            f.write(f"  <annotation>{playlist.description}</annotation>\n")
-        f.write("  <trackList>\n")
-        for track in tracks_list:
-            _write_xspf_track(f, track, file_mapping, file_path)
-        f.write("  </trackList>\n")
-        f.write("</playlist>\n")
-
-
-def _export_json(
-    file_path: Path,
-    playlist: PlaylistDetail,
-    tracks_list: List[Track],
-    file_mapping: dict[str, Path],
-):
-    """Export playlist in JSON format with relative paths to copied files."""
-    tracks_data = []
-    for track in tracks_list:
-        if track.file_path and track.file_path in file_mapping:
-            copied_file = file_mapping[track.file_path]
-            relative_path = str(copied_file.relative_to(file_path.parent))
-        else:
-            relative_path = None
-
-        tracks_data.append(
-            {
-                "id": str(track.id),
-                "title": track.title,
-                "artist": track.artist,
-                "album": track.album,
-                "file_path": relative_path,
-                "duration_seconds": track.duration_seconds,
-            }
-        )
-
-    export_data = {
-        "name": playlist.name,
-        "description": playlist.description,
-        "track_count": playlist.track_count,
-        "total_duration_seconds": playlist.total_duration_seconds,
-        "tracks": tracks_data,
-    }
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
+def _playlist_filename(safe_name: str, export_format: Format) -> str:
+    """Return the playlist file name for an export format."""
+    return f"{safe_name}.{get_writer(export_format).extension}"
 
 
 def _copy_track_files(
-    tracks_list: List[Track], destination_folder: Path
-) -> tuple[dict[str, Path], List[str]]:
-    """Copy track files to destination folder.
+    tracks_list: List[Track],
+    destination_folder: Path,
+    copy_mode: CopyMode = CopyMode.COPY,
+    on_progress: Optional[Callable[[dict, Optional[str]], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> tuple[dict[str, Path], List[str], dict]:
+    """Sync track files into the destination folder.
+
+    Files already exported with matching size and mtime are skipped, so
+    re-exporting a playlist only transfers new or changed tracks.
 
     Returns:
-        Tuple of (mapping from original file_path to copied file Path, list of error messages)
+        Tuple of (mapping from original file_path to copied file Path,
+        list of error messages, transfer stats)
     """
-    file_mapping = {}
-    errors = []
-    for track in tracks_list:
-        if not track.file_path:
-            continue
-        try:
-            source_path = Path(track.file_path)
-            if not source_path.exists():
-                errors.append(f"File not found: {track.file_path}")
-                continue
-
-            # Use original filename, handle duplicates by appending number
-            dest_file = destination_folder / source_path.name
-            counter = 1
-            while dest_file.exists():
-                stem = source_path.stem
-                suffix = source_path.suffix
-                dest_file = destination_folder / f"{stem}_{counter}{suffix}"
-                counter += 1
-
-            shutil.copy2(source_path, dest_file)
-            file_mapping[track.file_path] = dest_file
-        except OSError as e:
-            errors.append(f"Error copying {track.file_path}: {str(e)}")
-    return file_mapping, errors
-
-
-def _export_playlist_file(
-    export_format: Format,
-    file_path: Path,
-    playlist: PlaylistDetail,
-    tracks_list: List[Track],
-    file_mapping: dict[str, Path],
+    source_paths = [track.file_path for track in tracks_list if track.file_path]
+    return sync_files(
+        source_paths,
+        destination_folder,
+        copy_mode,
+        on_progress=on_progress,
+        cancel_event=cancel_event,
+    )
+
+
+def process_export(
+    job_id: UUID, playlist_id: UUID, export_format: Format, copy_mode: CopyMode
 ):
-    """Export playlist to file based on format."""
-    if export_format == Format.M3U:
-        _export_m3u(file_path, tracks_list, file_mapping)
-    elif export_format == Format.PLS:
-        _export_pls(file_path, tracks_list, file_mapping)
-    elif export_format == Format.XSPF:
-        _export_xspf(file_path, playlist, tracks_list, file_mapping)
-    elif export_format == Format.JSON:
-        _export_json(file_path, playlist, tracks_list, file_mapping)
-    else:
-        raise HTTPException(
-            status_code=400, detail=f"Unsupported format: {export_format}"
+    """Export job: sync audio files, then write the playlist file."""
+    try:
+        cancel_event = export_tracker.get_cancel_event(job_id)
+        if cancel_event is not None and cancel_event.is_set():
+            export_tracker.mark_cancelled(job_id)
+            return
+
+        # Get playlist with tracks
+        playlist = playlist_storage.get_playlist_detail(playlist_id)
+        if not playlist or not playlist.tracks:
+            export_tracker.fail_job(job_id, "Playlist not found or empty")
+            return
+
+        tracks_list = playlist.tracks
+        export_tracker.update_job(
+            job_id,
+            status=ExportStatus.RUNNING,
+            message=f"Copying {len(tracks_list)} track(s)...",
+            files_total=len({t.file_path for t in tracks_list if t.file_path}),
         )
 
+        # Create exports directory if it doesn't exist
+        export_dir = Path("exports")
+        export_dir.mkdir(exist_ok=True)
+
+        # Generate folder name for this playlist export
+        safe_name = _generate_safe_filename(playlist.name)
+        playlist_folder = export_dir / safe_name
+        playlist_folder.mkdir(exist_ok=True)
+
+        # Create music subfolder for copied files
+        music_folder = playlist_folder / "music"
+        music_folder.mkdir(exist_ok=True)
+
+        def on_progress(stats: dict, error: Optional[str]):
+            if error:
+                export_tracker.update_job(job_id, error=error)
+            export_tracker.record_copy_stats(job_id, stats)
+
+        # Copy track files to music folder
+        file_mapping, _, copy_stats = _copy_track_files(
+            tracks_list, music_folder, copy_mode, on_progress, cancel_event
+        )
+        export_tracker.record_copy_stats(job_id, copy_stats)
+        if copy_stats["cancelled"]:
+            export_tracker.mark_cancelled(job_id)
+            return
+
+        # Export playlist file with relative paths to copied music files
+        export_tracker.update_job(job_id, message="Writing playlist file...")
+        playlist_file = playlist_folder / _playlist_filename(safe_name, export_format)
+        write_playlist_file(
+            export_format, playlist_file, playlist, tracks_list, file_mapping
+        )
 
-@router.post("/{playlist_id}/export")
+        # Report the absolute path to the folder (not just the playlist file)
+        export_tracker.complete_job(job_id, os.path.abspath(playlist_folder))
+    except Exception as e:
+        # Anything else would leave the job running forever
+        export_tracker.fail_job(job_id, str(e))
+
+
+@router.post("/{playlist_id}/export", status_code=202)
 def export_playlist(
     playlist_id: UUID, request: ExportPlaylistRequest
-) -> ExportPlaylistResponse:
+) -> ExportJobResponse:
     """
-    Export playlist in various formats (M3U, PLS, XSPF, JSON).
+    Export playlist in various formats (M3U, M3U8, PLS, XSPF, JSON, Rekordbox XML).
+
+    The export runs as a queued job; poll its status endpoint for progress.
     """
-    # Get playlist with tracks
-    playlist = playlist_storage.get_playlist_detail(playlist_id)
+    playlist = playlist_storage.get_playlist_by_id(playlist_id)
     if not playlist:
         raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
 
-    if not playlist.tracks:
+    if not playlist.track_count:
         raise HTTPException(status_code=400, detail="Playlist is empty")
 
     # Normalize format
     export_format = _normalize_format(request.format)
 
-    # Create exports directory if it doesn't exist
-    export_dir = Path("exports")
-    export_dir.mkdir(exist_ok=True)
+    job_id = uuid.uuid4()
+    export_tracker.create_job(job_id, playlist_id, export_format.value)
+    export_tracker.submit(
+        job_id,
+        process_export,
+        playlist_id,
+        export_format,
+        request.copy_mode or CopyMode.COPY,
+    )
+
+    return ExportJobResponse(
+        job_id=job_id,
+        status=ExportStatus.QUEUED,
+        message=f"Export of playlist '{playlist.name}' queued",
+    )
 
-    # Generate folder name for this playlist export
-    safe_name = _generate_safe_filename(playlist.name)
-    playlist_folder = export_dir / safe_name
-    playlist_folder.mkdir(exist_ok=True)
 
-    # Create music subfolder for copied files
-    music_folder = playlist_folder / "music"
-    music_folder.mkdir(exist_ok=True)
+@router.get("/{playlist_id}/export/{job_id}/status")
+def get_export_status(playlist_id: UUID, job_id: UUID) -> ExportJobStatusResponse:
+    """
+    Get the progress of a playlist export job.
+    """
+    status = export_tracker.get_job_status(job_id)
+    if status is None or status.playlist_id != playlist_id:
+        raise HTTPException(status_code=404, detail=f"Export job {job_id} not found")
+    return status
+
+
+@router.post("/{playlist_id}/export/{job_id}/cancel")
+def cancel_export(playlist_id: UUID, job_id: UUID) -> ExportJobStatusResponse:
+    """
+    Cancel a queued or running playlist export job.
+
+    Files already being copied are finished; no playlist file is written.
+    """
+    status = export_tracker.get_job_status(job_id)
+    if status is None or status.playlist_id != playlist_id:
+        raise HTTPException(status_code=404, detail=f"Export job {job_id} not found")
+    if not export_tracker.cancel_job(job_id):
+        raise HTTPException(
+            status_code=400, detail=f"Export job {job_id} has already finished"
+        )
+    return status
+
+
+@router.get("/{playlist_id}/export/download")
+def download_playlist_export(
+    playlist_id: UUID,
+    format: Optional[Format] = Query(None, description="Playlist file format"),
+):
+    """
+    Download a playlist and its audio files as a ZIP archive.
+
+    The archive is streamed straight from the source files, nothing is
+    written to the exports folder.
+    """
+    playlist = playlist_storage.get_playlist_detail(playlist_id)
+    if not playlist:
+        raise HTTPException(status_code=404, detail=f"Playlist {playlist_id} not found")
+
+    if not playlist.tracks:
+        raise HTTPException(status_code=400, detail="Playlist is empty")
+
+    export_format = _normalize_format(format)
+    safe_name = _generate_safe_filename(playlist.name)
+    playlist_filename = _playlist_filename(safe_name, export_format)
 
-    # Copy track files to music folder
     tracks_list = playlist.tracks or []
-    file_mapping, copy_errors = _copy_track_files(tracks_list, music_folder)
-
-    if copy_errors:
-        # Log errors but continue with export
-        # Could optionally raise an error if all files failed
-        pass
-
-    # Generate playlist filename
-    extension_map = {
-        Format.M3U: "m3u",
-        Format.PLS: "pls",
-        Format.XSPF: "xspf",
-        Format.JSON: "json",
-    }
-    extension = extension_map.get(export_format, "m3u")
-    playlist_file = playlist_folder / f"{safe_name}.{extension}"
-
-    # Export playlist file with relative paths to copied music files
-    _export_playlist_file(
-        export_format, playlist_file, playlist, tracks_list, file_mapping
+    source_paths = [
+        track.file_path
+        for track in tracks_list
+        if track.file_path and os.path.isfile(track.file_path)
+    ]
+
+    # Paths inside the archive, relative to the playlist file at its root
+    file_mapping = plan_destinations(source_paths, Path("music"))
+    playlist_data = encode_playlist(
+        export_format, playlist, playlist_entries(tracks_list, file_mapping, Path("."))
     )
 
-    # Return absolute path to the folder (not just the playlist file)
-    abs_path = os.path.abspath(playlist_folder)
-    format_str = (
-        export_format.value if hasattr(export_format, "value") else str(export_format)
+    entries = [(playlist_filename, playlist_data)]
+    entries.extend(
+        (destination.as_posix(), source) for source, destination in file_mapping.items()
     )
 
-    return ExportPlaylistResponse(file_path=abs_path, format=format_str)
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{safe_name}.zip"'},
+    )
@@ -1,107 +1,97 @@
 """Track management endpoints."""
 
+import hashlib
+import os
 import sqlite3
+import stat
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from core.database import get_db_connection
 from models import (
+    BeatGridResponse,
+    BulkCreateTracksRequest,
+    BulkCreateTracksResponse,
     BulkDeleteTracksRequest,
     BulkDeleteTracksResponse,
+    BulkUpdateTracksRequest,
+    BulkUpdateTracksResponse,
+    CompatibleTrack,
+    CompatibleTracksQueryParams,
+    CompatibleTracksResponse,
+    ExportTracksQueryParams,
     GetTracksQueryParams,
     Pagination,
     ResetMetadataRequest,
     ResetMetadataResponse,
+    SimilarTrack,
+    SimilarTracksQueryParams,
+    SimilarTracksResponse,
     Track,
     TrackCreate,
+    TrackExportFormat,
     TrackUpdate,
     TracksListResponse,
 )
-from storage.track_storage import storage
+from services.beat_grid import decode_beat_grid
+from services.similarity import SEARCH_PADDING, get_similarity_index
+from services.waveform import WAVEFORM_RESOLUTIONS, waveform_level
+from storage.artwork_storage import ARTWORK_SIZES, artwork_storage
+from storage.feature_storage import beat_grid_storage, waveform_storage
+from storage.track_storage import (
+    TRACK_FIELDS,
+    build_track_order_clause,
+    build_track_where_clause,
+    resolve_track_fields,
+    storage,
+    track_columns_sql,
+)
+from utils.http_cache import etag_matches, is_not_modified
 from utils.scan_utils import extract_metadata
+from utils.track_export import encode_csv, encode_ndjson, iter_track_row_batches
 
 router = APIRouter(prefix="/tracks", tags=["Tracks"])
 
 
-@router.get("")
+@router.get("", response_model_exclude_unset=True)
 def get_all_tracks(
     query_params: GetTracksQueryParams = Depends(),
     db: sqlite3.Connection = Depends(get_db_connection),
 ) -> TracksListResponse:
     """
     Get all tracks in the library with filtering, sorting, and pagination.
+    Use `fields` to return only a subset of track fields.
     """
+    try:
+        columns = resolve_track_fields(query_params.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
     cursor = db.cursor()
 
     # Build WHERE clause for filtering
-    where_conditions = []
-    params = []
-
-    if query_params.search:
-        where_conditions.append("(title LIKE ? OR artist LIKE ? OR album LIKE ?)")
-        search_param = f"%{query_params.search}%"
-        params.extend([search_param, search_param, search_param])
-
-    if query_params.genre:
-        where_conditions.append("genre = ?")
-        params.append(query_params.genre)
-
-    if query_params.mood:
-        where_conditions.append("mood = ?")
-        params.append(query_params.mood)
-
-    if query_params.bpm_min > 0:
-        where_conditions.append("bpm >= ?")
-        params.append(query_params.bpm_min)
-
-    if query_params.bpm_max > 0:
-        where_conditions.append("bpm <= ?")
-        params.append(query_params.bpm_max)
-
-    if query_params.key:
-        where_conditions.append("key = ?")
-        params.append(query_params.key)
-
-    if query_params.artist:
-        where_conditions.append("artist = ?")
-        params.append(query_params.artist)
-
-    if query_params.year_min > 0:
-        where_conditions.append("year >= ?")
-        params.append(query_params.year_min)
-
-    if query_params.year_max > 0:
-        where_conditions.append("year <= ?")
-        params.append(query_params.year_max)
-
-    where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    where_clause, params = build_track_where_clause(query_params)
 
     # Get total count for pagination
     count_query = f"SELECT COUNT(*) FROM tracks WHERE {where_clause}"
     cursor.execute(count_query, params)
     total_items = cursor.fetchone()[0]
 
-    # Build ORDER BY clause - validate sort_by parameter
-    valid_sort_columns = ["title", "artist", "bpm", "key", "year", "created_at"]
-    sort_by = query_params.sort_by
-    if sort_by not in valid_sort_columns:
-        sort_by = "title"
-
-    db_sort_column = sort_by
-    sort_direction = "DESC" if query_params.sort_order.lower() == "desc" else "ASC"
-    order_clause = f"ORDER BY {db_sort_column} {sort_direction}"
+    order_clause = build_track_order_clause(query_params)
 
     offset = (query_params.page - 1) * query_params.size
     limit_clause = f"LIMIT {query_params.size} OFFSET {offset}"
 
     # Execute query
-    query = f"SELECT * FROM tracks WHERE {where_clause} {order_clause} {limit_clause}"
+    select_columns = track_columns_sql(columns)
+    query = f"SELECT {select_columns} FROM tracks WHERE {where_clause} {order_clause} {limit_clause}"
     cursor.execute(query, params)
     results = cursor.fetchall()
     cursor.close()
 
     # Convert database rows to Track objects
-    tracks = [storage.row_to_track(row) for row in results]
+    tracks = storage.rows_to_tracks(results)
 
     # Calculate pagination metadata (page starts from 1)
     total_pages = (total_items + query_params.size - 1) // query_params.size if query_params.size > 0 else 0
@@ -120,6 +110,42 @@ def get_all_tracks(
     return TracksListResponse(data=tracks, pagination=pagination)
 
 
+@router.get("/export")
+def export_tracks(
+    query_params: ExportTracksQueryParams = Depends(),
+) -> StreamingResponse:
+    """
+    Stream the whole (optionally filtered) track library as NDJSON or CSV.
+    Accepts the same filters, sorting and `fields` as the track listing.
+    """
+    try:
+        columns = resolve_track_fields(query_params.fields) or list(TRACK_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    where_clause, params = build_track_where_clause(query_params)
+    order_clause = build_track_order_clause(query_params)
+    query = (
+        f"SELECT {track_columns_sql(columns)} FROM tracks "
+        f"WHERE {where_clause} {order_clause}"
+    )
+    batches = iter_track_row_batches(query, params)
+
+    if query_params.format == TrackExportFormat.CSV:
+        content = encode_csv(batches, columns)
+        media_type = "text/csv"
+    else:
+        content = encode_ndjson(batches, columns)
+        media_type = "application/x-ndjson"
+
+    extension = query_params.format.value
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tracks.{extension}"'},
+    )
+
+
 @router.post("", status_code=201)
 def create_track(track_data: TrackCreate) -> Track:
     """
@@ -141,6 +167,262 @@ def get_track(track_id: UUID) -> Track:
     return track
 
 
+@router.get("/{track_id}/compatible", response_model_exclude_unset=True)
+def get_compatible_tracks(
+    track_id: UUID, query_params: CompatibleTracksQueryParams = Depends()
+) -> CompatibleTracksResponse:
+    """
+    Find tracks to mix into next: compatible Camelot keys (same, one step
+    either way or the relative major/minor) within a BPM tolerance,
+    including half/double time. Best matches come first.
+    """
+    try:
+        columns = resolve_track_fields(query_params.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    track = storage.get_track_by_id(track_id)
+    if not track:
+        raise HTTPException(status_code=404, detail=f"Track {track_id} not found")
+
+    try:
+        matches = storage.find_compatible_tracks(
+            track,
+            query_params.bpm_tolerance,
+            half_double=query_params.half_double,
+            limit=query_params.limit,
+            columns=columns,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    return CompatibleTracksResponse(
+        track_id=track_id,
+        camelot=track.camelot,
+        bpm=track.bpm,
+        data=[
+            CompatibleTrack(
+                track=match,
+                key_distance=key_distance,
+                bpm_difference_percent=difference,
+                half_double_time=half_double_time,
+                score=score,
+            )
+            for match, key_distance, difference, half_double_time, score in matches
+        ],
+    )
+
+
+@router.get("/{track_id}/similar", response_model_exclude_unset=True)
+def get_similar_tracks(
+    track_id: UUID, query_params: SimilarTracksQueryParams = Depends()
+) -> SimilarTracksResponse:
+    """
+    Find tracks that sound like a track, by cosine similarity of their audio
+    features (chroma, tempo, spectral and timbre summary). Features are
+    stored by batch metadata analysis.
+    """
+    try:
+        columns = resolve_track_fields(query_params.fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    # The index can lag behind deletes, so check the track itself
+    if not storage.get_track_by_id(track_id):
+        raise HTTPException(status_code=404, detail=f"Track {track_id} not found")
+
+    index = get_similarity_index()
+    matches = index.search(
+        str(track_id), query_params.limit + SEARCH_PADDING, exact=query_params.exact
+    )
+    if matches is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Track {track_id} has no audio features; run batch analysis first",
+        )
+
+    tracks_by_id = {
+        str(track.id): track
+        for track in storage.get_tracks_by_ids(
+            [UUID(match_id) for match_id, _ in matches], columns
+        )
+    }
+    return SimilarTracksResponse(
+        track_id=track_id,
+        index="exact" if query_params.exact else index.kind,
+        data=[
+            SimilarTrack(track=tracks_by_id[match_id], similarity=round(similarity, 4))
+            for match_id, similarity in matches
+            if match_id in tracks_by_id
+        ][: query_params.limit],
+    )
+
+
+@router.get(
+    "/{track_id}/waveform",
+    response_class=Response,
+    responses={200: {"content": {"application/octet-stream": {}}}},
+)
+def get_track_waveform(
+    track_id: UUID,
+    resolution: int = Query(
+        WAVEFORM_RESOLUTIONS[1],
+        description=(
+            "Number of min/max buckets over the whole track, one of "
+            + ", ".join(str(r) for r in WAVEFORM_RESOLUTIONS)
+        ),
+    ),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Get a track's waveform overview as raw bytes: `resolution` pairs of
+    signed 8-bit (min, max) sample peaks, interleaved, with 127 as full
+    scale. Waveforms are stored by batch metadata analysis.
+    """
+    waveform = waveform_storage.get(track_id)
+    if waveform is None:
+        if not storage.get_track_by_id(track_id):
+            raise HTTPException(status_code=404, detail=f"Track {track_id} not found")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Track {track_id} has no waveform; run batch analysis first",
+        )
+
+    try:
+        content = waveform_level(waveform, resolution).tobytes()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+    # Clients keep the bytes and revalidate; re-analysis changes the ETag
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    headers["X-Waveform-Resolution"] = str(resolution)
+    return Response(
+        content=content, media_type="application/octet-stream", headers=headers
+    )
+
+
+@router.get("/{track_id}/beat-grid")
+def get_track_beat_grid(track_id: UUID) -> BeatGridResponse:
+    """
+    Get a track's beat grid: fractional BPM, beat and estimated downbeat
+    positions. Beat grids are stored by batch metadata analysis.
+    """
+    beat_grid = beat_grid_storage.get(track_id)
+    if beat_grid is None:
+        if not storage.get_track_by_id(track_id):
+            raise HTTPException(status_code=404, detail=f"Track {track_id} not found")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Track {track_id} has no beat grid; run batch analysis first",
+        )
+    return BeatGridResponse(track_id=track_id, **decode_beat_grid(beat_grid))
+
+
+@router.get(
+    "/{track_id}/audio",
+    response_class=FileResponse,
+    responses={200: {"content": {"audio/*": {}}}, 206: {"content": {"audio/*": {}}}},
+)
+def get_track_audio(
+    track_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+) -> Response:
+    """
+    Stream a track's audio file for preview.
+
+    Supports byte Range requests (206) for seeking, and ETag/Last-Modified
+    revalidation (304). The file is sent in chunks (or with zero-copy
+    pathsend where the ASGI server supports it), never loaded whole. Each
+    chunk is read in a worker thread under anyio's default limiter, the
+    same one that runs sync endpoints, so many slow streams can hold up
+    other requests.
+    """
+    track = storage.get_track_by_id(track_id)
+    if not track:
+        raise HTTPException(status_code=404, detail=f"Track {track_id} not found")
+
+    try:
+        stat_result = os.stat(track.file_path)
+    except OSError:
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(
+            status_code=404, detail=f"Audio file for track {track_id} not found"
+        )
+
+    response = FileResponse(
+        track.file_path,
+        stat_result=stat_result,
+        filename=os.path.basename(track.file_path),
+        content_disposition_type="inline",
+        headers={"Cache-Control": "private, no-cache"},
+    )
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+    if is_not_modified(if_none_match, if_modified_since, etag, last_modified):
+        return Response(
+            status_code=304,
+            headers={
+                "ETag": etag,
+                "Last-Modified": last_modified,
+                "Cache-Control": "private, no-cache",
+            },
+        )
+    return response
+
+
+@router.get(
+    "/{track_id}/artwork",
+    response_class=FileResponse,
+    responses={200: {"content": {"image/*": {}}}},
+)
+def get_track_artwork(
+    track_id: UUID,
+    size: Optional[int] = Query(
+        None,
+        description=(
+            "Thumbnail edge length in pixels, one of "
+            + ", ".join(str(s) for s in ARTWORK_SIZES)
+            + "; omit for the original image"
+        ),
+    ),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Get a track's embedded cover art, as stored by library scans.
+
+    Artwork is cached by clients for a week; the ETag changes when the
+    image does, and clients that need a change sooner can add the track's
+    artwork_hash to the URL.
+    """
+    track = storage.get_track_by_id(track_id)
+    if not track:
+        raise HTTPException(status_code=404, detail=f"Track {track_id} not found")
+
+    try:
+        path = (
+            artwork_storage.get_path(track.artwork_hash, size)
+            if track.artwork_hash
+            else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Track {track_id} has no artwork")
+
+    headers = {
+        "ETag": f'"{path.stem}"',
+        "Cache-Control": "public, max-age=604800",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
+
+
 @router.put("/{track_id}")
 def update_track(track_id: UUID, track_update: TrackUpdate) -> Track:
     """
@@ -174,14 +456,78 @@ def bulk_delete_tracks(request: BulkDeleteTracksRequest) -> BulkDeleteTracksResp
     if not request.track_ids:
         return BulkDeleteTracksResponse(deleted_count=0)
 
-    deleted_count = 0
-    for track_id in request.track_ids:
-        if storage.delete_track(track_id):
-            deleted_count += 1
-
+    deleted_count = storage.delete_tracks(request.track_ids)
     return BulkDeleteTracksResponse(deleted_count=deleted_count)
 
 
+@router.post("/bulk/create", status_code=201)
+def bulk_create_tracks(request: BulkCreateTracksRequest) -> BulkCreateTracksResponse:
+    """
+    Manually add multiple tracks to the library in a single transaction.
+    """
+    track_ids, created_count = storage.create_tracks(
+        [(track_data, None) for track_data in request.tracks]
+    )
+    return BulkCreateTracksResponse(
+        track_ids=track_ids,
+        created_count=created_count,
+        skipped_count=len(request.tracks) - created_count,
+    )
+
+
+@router.post("/bulk/update")
+def bulk_update_tracks(request: BulkUpdateTracksRequest) -> BulkUpdateTracksResponse:
+    """
+    Update metadata for multiple tracks in a single transaction.
+    Accepts per-track patches, or one patch for a set of IDs or a filter.
+    """
+    modes = [request.updates, request.track_ids, request.filter]
+    if sum(mode is not None for mode in modes) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide exactly one of updates, track_ids or filter",
+        )
+
+    if request.updates is not None:
+        if request.patch is not None:
+            raise HTTPException(
+                status_code=400, detail="patch cannot be combined with updates"
+            )
+        patches = [
+            (
+                update.track_id,
+                update.model_dump(exclude_unset=True, exclude={"track_id"}),
+            )
+            for update in request.updates
+        ]
+    else:
+        if request.patch is None:
+            raise HTTPException(
+                status_code=400, detail="patch is required with track_ids or filter"
+            )
+        patch = request.patch.model_dump(exclude_unset=True)
+
+        if request.filter is not None:
+            where_clause, params = build_track_where_clause(request.filter)
+            if not request.return_tracks:
+                updated_count = storage.update_tracks_matching(
+                    patch, where_clause, params
+                )
+                return BulkUpdateTracksResponse(updated_count=updated_count)
+            track_ids = storage.get_track_ids_matching(where_clause, params)
+        else:
+            track_ids = request.track_ids
+        patches = [(track_id, patch) for track_id in track_ids]
+
+    updated_count = storage.bulk_update_tracks(patches)
+
+    tracks = None
+    if request.return_tracks:
+        tracks = storage.get_tracks_by_ids([track_id for track_id, _ in patches])
+
+    return BulkUpdateTracksResponse(updated_count=updated_count, tracks=tracks)
+
+
 @router.post("/{track_id}/reset-metadata")
 def reset_track_metadata(
     track_id: UUID, request: Optional[ResetMetadataRequest] = None
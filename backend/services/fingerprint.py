@@ -0,0 +1,244 @@
+"""
+Acoustic fingerprints for finding duplicate tracks.
+
+A fingerprint is FINGERPRINT_FRAMES 32-bit sub-fingerprints taken from a
+fixed window of the decoded audio (after leading silence), following
+Haitsma & Kalker: each bit says whether the energy difference between two
+neighbouring frequency bands rose or fell since the previous frame. The
+bits survive re-encoding (MP3 vs FLAC), gain changes and small time shifts,
+so copies of a track differ in few bits while unrelated tracks differ in
+about half.
+
+Duplicates are found without comparing every pair of tracks: identical
+sub-fingerprint values are grouped with an inverted index, tracks that
+share several values at a consistent time offset become candidates, and
+only candidates are compared bit by bit.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Sub-fingerprints per track; stored as a 1 KiB BLOB
+FINGERPRINT_FRAMES = 256
+
+# Analysis frames (about 0.37s, overlapping) and the band range they cover
+FRAME_SECONDS = 0.37
+HOP_SECONDS = 0.0464
+MIN_FREQUENCY_HZ = 300
+MAX_FREQUENCY_HZ = 2000
+BAND_COUNT = 33
+
+# Fingerprints start this far after the leading silence, when the track is
+# long enough, to skip fade-ins
+START_OFFSET_SECONDS = 10.0
+
+# Leading 10ms blocks quieter than this fraction of the loudest block's RMS
+# (-30 dB) count as silence
+SILENCE_THRESHOLD = 0.0316
+ONSET_BLOCK_SECONDS = 0.01
+
+# Sub-fingerprint values shared by more tracks than this are too common
+# (silence, steady tones) to suggest a duplicate
+MAX_BUCKET_SIZE = 32
+
+# Largest time shift between copies that is searched, in frames
+MAX_OFFSET_FRAMES = 16
+
+# Candidate pairs need this many identical sub-fingerprints at one offset
+MIN_MATCHING_FRAMES = 3
+
+# Copies differ in few bits; unrelated audio in about half of them
+MAX_BIT_ERROR_RATE = 0.3
+
+# Fingerprint frames two tracks must overlap by to be compared
+MIN_OVERLAP_FRAMES = FINGERPRINT_FRAMES // 2
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _onset(samples: np.ndarray, sr: int) -> Optional[int]:
+    """First sample of the first block louder than the silence threshold."""
+    block = max(1, int(ONSET_BLOCK_SECONDS * sr))
+    blocks = samples[: samples.size // block * block].reshape(-1, block)
+    if blocks.size == 0:
+        return None
+    rms = np.sqrt((blocks.astype(np.float64) ** 2).mean(axis=1))
+    if rms.max() == 0:
+        return None
+    return int(np.argmax(rms > rms.max() * SILENCE_THRESHOLD)) * block
+
+
+def compute_fingerprint(y: np.ndarray, sr: int) -> Optional[np.ndarray]:
+    """
+    Compute the fingerprint of decoded mono audio.
+
+    Returns:
+        uint32 array of FINGERPRINT_FRAMES sub-fingerprints, or None if the
+        audio is silent or too short
+    """
+    samples = np.asarray(y, dtype=np.float32)
+    start = _onset(samples, sr)
+    if start is None:
+        return None
+
+    frame = round(FRAME_SECONDS * sr)
+    hop = round(HOP_SECONDS * sr)
+    # One extra frame, since bits compare each frame with the previous one
+    needed = frame + hop * FINGERPRINT_FRAMES
+    if samples.size - start < needed:
+        return None
+    offset = int(START_OFFSET_SECONDS * sr)
+    if samples.size - start - offset >= needed:
+        start += offset
+
+    window = samples[start : start + needed]
+    frames = np.lib.stride_tricks.sliding_window_view(window, frame)[::hop]
+    n_fft = 1 << (frame - 1).bit_length()
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame), n=n_fft)) ** 2
+
+    # Logarithmically spaced bands between the frequency limits
+    edges = np.geomspace(MIN_FREQUENCY_HZ, MAX_FREQUENCY_HZ, BAND_COUNT + 1)
+    bins = np.round(edges * n_fft / sr).astype(int)
+    energy = np.add.reduceat(
+        spectrum[:, bins[0] : bins[-1]], bins[:-1] - bins[0], axis=1
+    )
+
+    band_difference = energy[:, :-1] - energy[:, 1:]
+    bits = (band_difference[1:] - band_difference[:-1]) > 0
+    weights = np.left_shift(np.uint32(1), np.arange(BAND_COUNT - 1, dtype=np.uint32))
+    return (bits.astype(np.uint32) * weights).sum(axis=1, dtype=np.uint32)
+
+
+def bit_error_rate(a: np.ndarray, b: np.ndarray) -> float:
+    """Share of differing bits between two equally long fingerprint slices."""
+    differing = _POPCOUNT[np.bitwise_xor(a, b).view(np.uint8)].sum()
+    return float(differing) / (a.size * 32)
+
+
+def _aligned_bit_error_rate(
+    a: np.ndarray, b: np.ndarray, offset: int
+) -> Optional[float]:
+    """Bit error rate with b shifted `offset` frames later than a."""
+    if offset >= 0:
+        a, b = a[: a.size - offset], b[offset:]
+    else:
+        a, b = a[-offset:], b[: b.size + offset]
+    if a.size < MIN_OVERLAP_FRAMES:
+        return None
+    return bit_error_rate(a, b)
+
+
+def _candidate_pairs(fingerprints: np.ndarray) -> Dict[Tuple[int, int], int]:
+    """
+    Track pairs sharing sub-fingerprints, with their best frame offset.
+
+    Every (value, track, frame) triple is sorted by value, which groups
+    identical sub-fingerprints like a hash table's buckets. Pairs within a
+    bucket vote for their (track, track, offset); pairs with enough votes
+    become candidates.
+    """
+    count, frames = fingerprints.shape
+    values = fingerprints.ravel()
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    tracks = order // frames
+    positions = order % frames
+
+    # Bucket boundaries, and which rows sit in buckets worth pairing
+    starts = np.flatnonzero(np.r_[True, sorted_values[1:] != sorted_values[:-1]])
+    sizes = np.diff(np.r_[starts, values.size])
+    usable = np.repeat((sizes >= 2) & (sizes <= MAX_BUCKET_SIZE), sizes)
+    bucket = np.repeat(np.arange(starts.size), sizes)
+
+    keys = []
+    span = 2 * MAX_OFFSET_FRAMES + 1
+    # Pair each row with the rows `step` places after it in the same bucket
+    for step in range(1, MAX_BUCKET_SIZE):
+        first = np.flatnonzero(usable[:-step] & (bucket[:-step] == bucket[step:]))
+        if first.size == 0:
+            break
+        second = first + step
+        a, b = tracks[first], tracks[second]
+        shift = positions[second] - positions[first]
+        keep = (a != b) & (np.abs(shift) <= MAX_OFFSET_FRAMES)
+        a, b, shift = a[keep], b[keep], shift[keep]
+        # Order each pair by track, flipping the offset to match
+        swap = a > b
+        low, high = np.where(swap, b, a), np.where(swap, a, b)
+        shift = np.where(swap, -shift, shift)
+        keys.append(
+            (low.astype(np.int64) * count + high) * span + shift + MAX_OFFSET_FRAMES
+        )
+
+    if not keys:
+        return {}
+    unique_keys, votes = np.unique(np.concatenate(keys), return_counts=True)
+    enough = votes >= MIN_MATCHING_FRAMES
+    unique_keys, votes = unique_keys[enough], votes[enough]
+
+    candidates: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    for key, vote in zip(unique_keys.tolist(), votes.tolist()):
+        pair, shift = divmod(key, span)
+        low, high = divmod(pair, count)
+        best = candidates.get((low, high))
+        if best is None or vote > best[1]:
+            candidates[(low, high)] = (shift - MAX_OFFSET_FRAMES, vote)
+    return {pair: shift for pair, (shift, _) in candidates.items()}
+
+
+def find_duplicate_pairs(fingerprints: np.ndarray) -> List[Tuple[int, int, float]]:
+    """
+    Find pairs of fingerprints that belong to the same recording.
+
+    Args:
+        fingerprints: uint32 matrix with one fingerprint per row
+
+    Returns:
+        List of (row, row, bit error rate) for duplicate pairs
+    """
+    if len(fingerprints) < 2:
+        return []
+    pairs = []
+    for (a, b), shift in _candidate_pairs(fingerprints).items():
+        error_rate = _aligned_bit_error_rate(fingerprints[a], fingerprints[b], shift)
+        if error_rate is not None and error_rate <= MAX_BIT_ERROR_RATE:
+            pairs.append((a, b, error_rate))
+    return pairs
+
+
+def group_duplicates(
+    pairs: List[Tuple[int, int, float]],
+) -> List[Tuple[List[int], float]]:
+    """
+    Merge duplicate pairs into groups of rows (union-find).
+
+    Returns:
+        List of (rows, largest bit error rate among the group's pairs),
+        closest copies first
+    """
+    parent: Dict[int, int] = {}
+
+    def find(row: int) -> int:
+        parent.setdefault(row, row)
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    for a, b, _ in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups: Dict[int, List[int]] = {}
+    for row in parent:
+        groups.setdefault(find(row), []).append(row)
+    worst: Dict[int, float] = {}
+    for a, _, error_rate in pairs:
+        root = find(a)
+        worst[root] = max(worst.get(root, 0.0), error_rate)
+    return sorted(
+        ((sorted(rows), worst[root]) for root, rows in groups.items()),
+        key=lambda group: (group[1], group[0][0]),
+    )
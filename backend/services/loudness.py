@@ -0,0 +1,278 @@
+"""
+Loudness, peak and energy descriptors of decoded audio.
+
+Integrated loudness follows ITU-R BS.1770-4 / EBU R128: the K-weighted mean
+square of 400 ms blocks (75% overlap), gated at -70 LUFS and then 10 LU
+below the ungated level. K-weighting is applied in the frequency domain:
+the power spectrum of each 100 ms segment is weighted by the filter's
+squared magnitude response, so the measurement is a few batched FFTs
+instead of a sample-by-sample IIR filter. A block's mean square is the mean
+of its four segments.
+
+Energy and danceability are heuristic 0-1 scores for comparing tracks:
+energy combines loudness, brightness (share of power above 2 kHz) and onset
+density; danceability is pulse clarity, the strongest autocorrelation of
+the onset envelope at a beat period between 60 and 200 BPM, scaled down
+for tracks with few onsets.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Gating segments; four make one 400 ms measurement block
+SEGMENT_SECONDS = 0.1
+SEGMENTS_PER_BLOCK = 4
+
+# Segments transformed per FFT batch, bounding memory for long tracks
+SEGMENT_BATCH = 600
+
+LOUDNESS_OFFSET = -0.691
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+
+# ReplayGain 2.0 reference level
+REPLAY_GAIN_REFERENCE_LUFS = -18.0
+
+# Decimal places kept in results
+RESULT_DECIMALS = 3
+
+# Keys of analyze_loudness results, stored as track columns of the same name
+LOUDNESS_FIELDS = (
+    "loudness_lufs",
+    "replay_gain_db",
+    "peak_dbfs",
+    "energy",
+    "danceability",
+)
+
+# K-weighting stages (pre-filter shelf and RLB high-pass), as analogue
+# prototypes so they can be evaluated at any sample rate
+SHELF_FREQUENCY_HZ = 1681.974450955533
+SHELF_GAIN_DB = 3.999843853973347
+SHELF_Q = 0.7071752369554196
+SHELF_BAND_RATIO = 0.4996667741545416
+HIGH_PASS_FREQUENCY_HZ = 38.13547087602444
+HIGH_PASS_Q = 0.5003270373238773
+
+# Energy inputs mapped to 0-1: loudness range, share of power above
+# BRIGHTNESS_CUTOFF_HZ that counts as fully bright, and onsets per second
+ENERGY_LOUDNESS_RANGE_LUFS = (-30.0, -6.0)
+BRIGHTNESS_CUTOFF_HZ = 2000.0
+FULL_BRIGHTNESS = 0.25
+FULL_ONSET_RATE = 8.0
+
+# Onset envelope frames, onset threshold (rise in dB between frames), the
+# beat periods searched for a pulse, and the onset rate below which a
+# regular envelope is too sparse (pads, drones) to count as a full pulse
+ONSET_FRAME_SECONDS = 0.0232
+ONSET_THRESHOLD_DB = 3.0
+PULSE_BPM_RANGE = (60.0, 200.0)
+FULL_PULSE_ONSET_RATE = 1.0
+
+
+def _k_weighting_filters(sr: int):
+    """Biquad (b, a) coefficients of the two K-weighting stages at `sr`."""
+    k = np.tan(np.pi * SHELF_FREQUENCY_HZ / sr)
+    vh = 10 ** (SHELF_GAIN_DB / 20)
+    vb = vh**SHELF_BAND_RATIO
+    a0 = 1 + k / SHELF_Q + k * k
+    shelf = (
+        np.array(
+            [
+                vh + vb * k / SHELF_Q + k * k,
+                2 * (k * k - vh),
+                vh - vb * k / SHELF_Q + k * k,
+            ]
+        )
+        / a0,
+        np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / SHELF_Q + k * k) / a0]),
+    )
+    k = np.tan(np.pi * HIGH_PASS_FREQUENCY_HZ / sr)
+    a0 = 1 + k / HIGH_PASS_Q + k * k
+    high_pass = (
+        np.array([1.0, -2.0, 1.0]),
+        np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / HIGH_PASS_Q + k * k) / a0]),
+    )
+    return shelf, high_pass
+
+
+def k_weighting_power(n_fft: int, sr: int) -> np.ndarray:
+    """Squared magnitude response of K-weighting at the rfft bins of n_fft."""
+    z_inverse = np.exp(-2j * np.pi * np.arange(n_fft // 2 + 1) / n_fft)
+    power = np.ones(z_inverse.size)
+    for b, a in _k_weighting_filters(sr):
+        response = np.polyval(b[::-1], z_inverse) / np.polyval(a[::-1], z_inverse)
+        power *= np.abs(response) ** 2
+    return power
+
+
+def _rfft_power_weights(n_fft: int) -> np.ndarray:
+    """Parseval weights turning an rfft power spectrum into a mean square."""
+    weights = np.full(n_fft // 2 + 1, 2.0)
+    weights[0] = 1.0
+    if n_fft % 2 == 0:
+        weights[-1] = 1.0
+    return weights / (n_fft * n_fft)
+
+
+def _segment_powers(
+    signal: np.ndarray, segment: int, weights: np.ndarray
+) -> np.ndarray:
+    """
+    Weighted mean square of each whole segment of a 1-D signal. With 2-D
+    weights (bins, k), each segment gets k powers from one FFT.
+    """
+    count = signal.size // segment
+    segments = signal[: count * segment].reshape(count, segment)
+    powers = np.empty((count,) + weights.shape[1:])
+    for start in range(0, count, SEGMENT_BATCH):
+        spectrum = np.fft.rfft(segments[start : start + SEGMENT_BATCH], axis=1)
+        powers[start : start + SEGMENT_BATCH] = (np.abs(spectrum) ** 2) @ weights
+    return powers
+
+
+def _to_lufs(mean_square) -> np.ndarray:
+    with np.errstate(divide="ignore"):
+        return LOUDNESS_OFFSET + 10 * np.log10(mean_square)
+
+
+def integrated_loudness(channels: np.ndarray, sr: int) -> Optional[float]:
+    """
+    Integrated loudness in LUFS of audio shaped (channels, samples), with
+    every channel weighted 1 as for front left/right.
+
+    Returns:
+        Loudness, or None if the audio is shorter than one block or silent
+    """
+    segment = round(SEGMENT_SECONDS * sr)
+    if channels.shape[1] < segment * SEGMENTS_PER_BLOCK:
+        return None
+    weights = k_weighting_power(segment, sr) * _rfft_power_weights(segment)
+    segment_power = sum(
+        _segment_powers(channel, segment, weights) for channel in channels
+    )
+    window = np.ones(SEGMENTS_PER_BLOCK) / SEGMENTS_PER_BLOCK
+    block_power = np.convolve(segment_power, window, mode="valid")
+
+    gated = block_power[_to_lufs(block_power) > ABSOLUTE_GATE_LUFS]
+    if gated.size == 0:
+        return None
+    relative_gate = _to_lufs(gated.mean()) + RELATIVE_GATE_LU
+    gated = gated[_to_lufs(gated) > relative_gate]
+    return float(_to_lufs(gated.mean()))
+
+
+def sample_peak_dbfs(channels: np.ndarray) -> Optional[float]:
+    """
+    Highest absolute sample of any channel in dBFS, or None for digital
+    silence. This is the sample peak, not the inter-sample true peak, so it
+    is only exact for the file's own samples (native rate, no downmix).
+    """
+    peak = float(np.max(np.abs(channels)))
+    if peak == 0:
+        return None
+    return float(20 * np.log10(peak))
+
+
+def _brightness(y: np.ndarray, sr: int) -> float:
+    """Share of the signal's power above BRIGHTNESS_CUTOFF_HZ."""
+    segment = round(SEGMENT_SECONDS * sr)
+    weights = _rfft_power_weights(segment)
+    high = weights * (np.fft.rfftfreq(segment, 1 / sr) >= BRIGHTNESS_CUTOFF_HZ)
+    total, high_total = _segment_powers(
+        y, segment, np.stack([weights, high], axis=1)
+    ).sum(axis=0)
+    if total == 0:
+        return 0.0
+    return float(high_total / total)
+
+
+def _onset_envelope(y: np.ndarray, sr: int) -> Tuple[np.ndarray, float]:
+    """
+    Half-wave rectified rise in frame energy (dB) between short frames.
+
+    Returns:
+        Tuple of (envelope, frames per second)
+    """
+    frame = round(ONSET_FRAME_SECONDS * sr)
+    count = y.size // frame
+    frame_power = np.mean(y[: count * frame].reshape(count, frame) ** 2, axis=1)
+    level_db = 10 * np.log10(frame_power + 1e-10)
+    return np.maximum(np.diff(level_db), 0.0), sr / frame
+
+
+def pulse_clarity(envelope: np.ndarray, frame_rate: float) -> float:
+    """
+    Strongest normalized autocorrelation of an onset envelope at a beat
+    period in PULSE_BPM_RANGE (0 for no pulse, near 1 for a steady one).
+    """
+    centered = envelope - envelope.mean()
+    n_fft = 1 << int(2 * centered.size - 1).bit_length()
+    spectrum = np.fft.rfft(centered, n_fft)
+    autocorrelation = np.fft.irfft(np.abs(spectrum) ** 2, n_fft)[: centered.size]
+    if autocorrelation[0] <= 0:
+        return 0.0
+    shortest = int(frame_rate * 60 / PULSE_BPM_RANGE[1])
+    longest = min(int(frame_rate * 60 / PULSE_BPM_RANGE[0]) + 1, centered.size)
+    if shortest >= longest:
+        return 0.0
+    lags = np.arange(shortest, longest)
+    # Unbiased: later lags overlap fewer frames
+    unbiased = autocorrelation[lags] * centered.size / (centered.size - lags)
+    return float(np.clip(unbiased.max() / autocorrelation[0], 0.0, 1.0))
+
+
+def _scale(value: float, low: float, high: float) -> float:
+    return float(np.clip((value - low) / (high - low), 0.0, 1.0))
+
+
+def analyze_loudness(
+    channels: np.ndarray, channels_sr: int, y: np.ndarray, sr: int
+) -> Dict[str, Optional[float]]:
+    """
+    Loudness and energy of a whole decoded track.
+
+    Args:
+        channels: Samples shaped (channels, samples) at the file's own
+            rate, for loudness and peak
+        channels_sr: Sample rate of channels
+        y: Mono downmix of the same audio, for energy and danceability
+        sr: Sample rate of y
+
+    Returns:
+        Dictionary with the LOUDNESS_FIELDS (None where the audio is too
+        short or silent)
+    """
+    loudness = integrated_loudness(channels, channels_sr)
+    peak = sample_peak_dbfs(channels)
+    result = {
+        "loudness_lufs": None if loudness is None else round(loudness, RESULT_DECIMALS),
+        "replay_gain_db": None,
+        "peak_dbfs": None if peak is None else round(peak, RESULT_DECIMALS),
+        "energy": None,
+        "danceability": None,
+    }
+    if loudness is None:
+        return result
+    result["replay_gain_db"] = round(
+        REPLAY_GAIN_REFERENCE_LUFS - loudness, RESULT_DECIMALS
+    )
+
+    envelope, frame_rate = _onset_envelope(y, sr)
+    onset_rate = (
+        np.count_nonzero(envelope > ONSET_THRESHOLD_DB) * frame_rate / envelope.size
+    )
+    energy = np.mean(
+        [
+            _scale(loudness, *ENERGY_LOUDNESS_RANGE_LUFS),
+            _scale(_brightness(y, sr), 0.0, FULL_BRIGHTNESS),
+            _scale(onset_rate, 0.0, FULL_ONSET_RATE),
+        ]
+    )
+    danceability = pulse_clarity(envelope, frame_rate) * _scale(
+        onset_rate, 0.0, FULL_PULSE_ONSET_RATE
+    )
+    result["energy"] = round(float(energy), RESULT_DECIMALS)
+    result["danceability"] = round(danceability, RESULT_DECIMALS)
+    return result
@@ -1,9 +1,14 @@
 """Service for analyzing audio metadata including BPM and key detection."""
 
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from mutagen import File as MutagenFile
 
+from services.beat_grid import beat_grid_bpm, build_beat_grid
+from services.fingerprint import compute_fingerprint
+from services.loudness import analyze_loudness
+from services.waveform import compute_waveform
+
 try:
     import librosa
     import numpy as np
@@ -12,16 +17,46 @@ try:
 except ImportError:
     LIBROSA_AVAILABLE = False
 
+# Sample rate analyses run at (librosa's default)
+ANALYSIS_SAMPLE_RATE = 22050
 
-def analyze_bpm_from_audio(file_path: str) -> Optional[int]:
-    """
-    Analyze audio file to detect BPM using librosa.
+# Seconds of audio decoded for analysis (from the start of the file)
+ANALYSIS_DURATION_SECONDS = 60
 
-    Args:
-        file_path: Path to audio file
+# Seconds of the decoded audio used for key detection
+KEY_ANALYSIS_SECONDS = 30
+
+# Longest audio decoded whole for the full-track stages (waveform, beat grid,
+# loudness). Per minute of audio, the 44.1 kHz stereo samples need about
+# 21 MB, their mono downmix and its resampling to 22.05 kHz 16 MB and the
+# beat tracker's spectrogram 21 MB, so this keeps one file's analysis
+# around 0.5 GB. Longer files such as DJ mixes only get the analyses of
+# their first ANALYSIS_DURATION_SECONDS.
+MAX_FULL_TRACK_SECONDS = 15 * 60
+
+# Chroma order: C, C#, D, D#, E, F, F#, G, G#, A, A#, B
+CHROMA_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+# Feature vector layout: chroma mean (12), log2 tempo (1), spectral summary
+# (centroid, bandwidth, rolloff, flatness, zero-crossing rate, RMS) and
+# timbre (13 MFCC means)
+FEATURE_DIM = 32
+
+
+def load_audio(
+    file_path: str,
+    duration: Optional[float] = ANALYSIS_DURATION_SECONDS,
+    mono: bool = True,
+    sr: Optional[int] = ANALYSIS_SAMPLE_RATE,
+) -> Optional[Tuple[Any, int]]:
+    """
+    Decode the start of an audio file (the whole file if duration is None)
+    as mono samples, or as an array shaped (channels, samples) when mono is
+    False. Samples are resampled to `sr`, or kept at the file's own rate
+    when it is None.
 
     Returns:
-        Detected BPM as integer, or None if analysis fails
+        Tuple of (samples, sample rate), or None if decoding fails
     """
     if not LIBROSA_AVAILABLE:
         return None
@@ -30,25 +65,110 @@ def analyze_bpm_from_audio(file_path: str) -> Optional[int]:
         return None
 
     try:
-        # Load audio file (librosa automatically handles resampling)
-        y, sr = librosa.load(
-            file_path, duration=60
-        )  # Analyze first 60 seconds for speed
+        y, sr = librosa.load(file_path, sr=sr, duration=duration, mono=mono)
+    except (OSError, ValueError, RuntimeError, MemoryError):
+        return None
+    if y.size == 0:
+        return None
+    return (y if mono else np.atleast_2d(y)), sr
+
+
+def _valid_bpm(tempo: float) -> Optional[int]:
+    """Round a detected tempo, or None if it is outside the plausible range."""
+    # Round to nearest integer
+    bpm = round(tempo)
+
+    # Validate BPM range (typical music is 60-200 BPM)
+    if 30 <= bpm <= 300:
+        return bpm
+    return None
+
 
-        # Use librosa's tempo detection
+def _detect_bpm(y, sr) -> Optional[int]:
+    """Detect BPM from decoded audio."""
+    try:
         tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+    except (ValueError, RuntimeError):
+        return None
+    return _valid_bpm(float(np.atleast_1d(tempo)[0]))
 
-        # Round to nearest integer
-        bpm = int(round(tempo))
 
-        # Validate BPM range (typical music is 60-200 BPM)
-        if 30 <= bpm <= 300:
-            return bpm
+def _detect_beat_grid(y, sr):
+    """
+    Track beats through decoded audio and build its encoded beat grid.
 
+    Returns:
+        int32 beat grid (see services.beat_grid), or None if too few beats
+        were found
+    """
+    try:
+        onset_envelope = librosa.onset.onset_strength(y=y, sr=sr)
+        _, beat_frames = librosa.beat.beat_track(onset_envelope=onset_envelope, sr=sr)
+    except (ValueError, RuntimeError, MemoryError):
         return None
-    except (OSError, ValueError, RuntimeError):
-        # If analysis fails (file errors, invalid audio, or librosa errors), return None
+    beat_times = librosa.frames_to_time(beat_frames, sr=sr)
+    return build_beat_grid(beat_times, onset_envelope[beat_frames])
+
+
+def _chroma_mean(y, sr):
+    """Pitch class profile of decoded audio, averaged across time."""
+    chroma = librosa.feature.chroma_stft(y=y, sr=sr)
+    return np.mean(chroma, axis=1)
+
+
+def _key_from_chroma(chroma_mean) -> str:
+    """
+    Map a pitch class profile to a key name.
+
+    Only the strongest pitch class is used, so keys are reported as major.
+    This is a simplified approach - more sophisticated methods exist.
+    """
+    return CHROMA_NAMES[int(np.argmax(chroma_mean))]
+
+
+def extract_feature_vector(y, sr, bpm: Optional[float], chroma_mean):
+    """
+    Summarize decoded audio as a float32 feature vector of FEATURE_DIM values.
+
+    An unknown tempo is stored as NaN, so the similarity index can treat it
+    as average.
+    """
+    spectral = [
+        librosa.feature.spectral_centroid(y=y, sr=sr),
+        librosa.feature.spectral_bandwidth(y=y, sr=sr),
+        librosa.feature.spectral_rolloff(y=y, sr=sr),
+        librosa.feature.spectral_flatness(y=y),
+        librosa.feature.zero_crossing_rate(y),
+        librosa.feature.rms(y=y),
+    ]
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    vector = np.concatenate(
+        [
+            chroma_mean,
+            [np.log2(bpm) if bpm else np.nan],
+            [feature.mean() for feature in spectral],
+            mfcc.mean(axis=1),
+        ]
+    ).astype(np.float32)
+    if vector.shape != (FEATURE_DIM,):
+        raise ValueError(f"Expected {FEATURE_DIM} features, got {vector.shape[0]}")
+    return vector
+
+
+def analyze_bpm_from_audio(file_path: str) -> Optional[int]:
+    """
+    Analyze audio file to detect BPM using librosa.
+
+    Args:
+        file_path: Path to audio file
+
+    Returns:
+        Detected BPM as integer, or None if analysis fails
+    """
+    audio = load_audio(file_path)
+    if audio is None:
         return None
+    return _detect_bpm(*audio)
 
 
 def analyze_key_from_audio(file_path: str) -> Optional[str]:
@@ -61,38 +181,12 @@ def analyze_key_from_audio(file_path: str) -> Optional[str]:
     Returns:
         Detected key as string (e.g., "C", "Am", "F#m"), or None if analysis fails
     """
-    if not LIBROSA_AVAILABLE:
-        return None
-
-    if not os.path.exists(file_path):
+    audio = load_audio(file_path, duration=KEY_ANALYSIS_SECONDS)
+    if audio is None:
         return None
-
     try:
-        # Load audio file
-        y, sr = librosa.load(file_path, duration=30)  # Analyze first 30 seconds
-
-        # Extract chroma features (pitch class profile)
-        chroma = librosa.feature.chroma_stft(y=y, sr=sr)
-
-        # Average chroma across time
-        chroma_mean = np.mean(chroma, axis=1)
-
-        # Map chroma to key
-        # Chroma order: C, C#, D, D#, E, F, F#, G, G#, A, A#, B
-        chroma_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-
-        # Find the strongest pitch class
-        strongest_idx = np.argmax(chroma_mean)
-        key = chroma_names[strongest_idx]
-
-        # Determine if major or minor
-        # Compare energy in major vs minor intervals
-        # This is a simplified approach - more sophisticated methods exist
-        # For now, default to major (can be enhanced later)
-
-        return key
-    except (OSError, ValueError, RuntimeError):
-        # If analysis fails (file errors, invalid audio, or librosa errors), return None
+        return _key_from_chroma(_chroma_mean(*audio))
+    except (ValueError, RuntimeError):
         return None
 
 
@@ -149,35 +243,111 @@ def _read_metadata_from_tags(file_path: str) -> Dict[str, Any]:
     return result
 
 
+def _mark_audio_source(result: Dict[str, Any]):
+    """Record that a value came from audio analysis."""
+    if result["source"] == "none":
+        result["source"] = "audio_analysis"
+    elif result["source"] == "tags":
+        result["source"] = "hybrid"
+
+
 def _update_result_with_audio_analysis(
-    result: Dict[str, Any], file_path: str
+    result: Dict[str, Any],
+    file_path: str,
+    detect_missing: bool = True,
+    extract_features: bool = False,
 ) -> Dict[str, Any]:
-    """Update result with audio analysis if values are missing."""
-    # Analyze BPM if missing
-    if result["bpm"] is None:
-        bpm = analyze_bpm_from_audio(file_path)
-        if bpm:
-            result["bpm"] = bpm
-            if result["source"] == "none":
-                result["source"] = "audio_analysis"
-            elif result["source"] == "tags":
-                result["source"] = "hybrid"
-
-    # Analyze key if missing
-    if result["key"] is None:
-        key = analyze_key_from_audio(file_path)
-        if key:
-            result["key"] = key
-            if result["source"] == "none":
-                result["source"] = "audio_analysis"
-            elif result["source"] == "tags":
-                result["source"] = "hybrid"
+    """
+    Update result with audio analysis if values are missing.
+
+    The file is decoded once and every analysis step works on that buffer.
+    Key, features and fingerprint use the first ANALYSIS_DURATION_SECONDS;
+    the waveform overview, beat grid and loudness need the whole track, so
+    extracting features decodes all of it at the file's own rate (keeping
+    the channels apart for loudness and peak) and then downmixes and
+    resamples it for the other stages, and BPM is taken from the beat grid
+    instead of tracking beats a second time. Decoding stops at MAX_FULL_TRACK_SECONDS, and files
+    that reach it skip the full-track stages.
+    """
+    needs_bpm = detect_missing and result["bpm"] is None
+    needs_key = detect_missing and result["key"] is None
+    if not (needs_bpm or needs_key or extract_features):
+        return result
+
+    if extract_features:
+        audio = load_audio(
+            file_path, duration=MAX_FULL_TRACK_SECONDS, mono=False, sr=None
+        )
+    else:
+        audio = load_audio(file_path)
+    if audio is None:
+        return result
+    full_track, sr = audio
+    del audio
+    channels = channels_sr = None
+    if extract_features:
+        channels, channels_sr = full_track, sr
+        # Same downmix and resampling as librosa's mono loading
+        sr = ANALYSIS_SAMPLE_RATE
+        try:
+            full_track = librosa.resample(
+                channels.mean(axis=0), orig_sr=channels_sr, target_sr=sr
+            )
+        except (ValueError, MemoryError):
+            return result
+    y = full_track[: ANALYSIS_DURATION_SECONDS * sr].copy()
+    if extract_features and full_track.size >= (MAX_FULL_TRACK_SECONDS - 1) * sr:
+        # Decoding hit the cap, so the full-track stages would describe only
+        # part of the file
+        channels = full_track = None
+
+    try:
+        beat_grid = None
+        if channels is not None:
+            result.update(analyze_loudness(channels, channels_sr, full_track, sr))
+            # The stereo samples are only needed for loudness
+            channels = None
+            beat_grid = _detect_beat_grid(full_track, sr)
+            result["beat_grid"] = beat_grid
+            result["waveform"] = compute_waveform(full_track)
+        full_track = None
+
+        # Analyze BPM if missing
+        if needs_bpm:
+            if beat_grid is not None:
+                bpm = _valid_bpm(beat_grid_bpm(beat_grid))
+            else:
+                bpm = _detect_bpm(y, sr)
+            if bpm:
+                result["bpm"] = bpm
+                _mark_audio_source(result)
+
+        chroma_mean = None
+        if needs_key or extract_features:
+            chroma_mean = _chroma_mean(y[: KEY_ANALYSIS_SECONDS * sr], sr)
+
+        # Analyze key if missing
+        if needs_key:
+            result["key"] = _key_from_chroma(chroma_mean)
+            _mark_audio_source(result)
+
+        if extract_features:
+            result["features"] = extract_feature_vector(
+                y, sr, result["bpm"], chroma_mean
+            )
+            result["fingerprint"] = compute_fingerprint(y, sr)
+    except (ValueError, RuntimeError, MemoryError):
+        # If analysis fails on this signal (or it is too large to analyze),
+        # keep whatever was found so far
+        pass
 
     return result
 
 
 def analyze_metadata(
-    file_path: Optional[str] = None, use_audio_analysis: bool = True
+    file_path: Optional[str] = None,
+    use_audio_analysis: bool = True,
+    extract_features: bool = False,
 ) -> Dict[str, Any]:
     """
     Analyze metadata for a track using hybrid approach:
@@ -187,6 +357,12 @@ def analyze_metadata(
     Args:
         file_path: Path to audio file
         use_audio_analysis: Whether to fall back to audio analysis if tags are missing
+        extract_features: Whether to also compute the similarity feature
+            vector, the duplicate-detection fingerprint, the waveform
+            overview and the beat grid (added as "features", "fingerprint",
+            "waveform" and "beat_grid" when the audio could be decoded),
+            plus the loudness and energy values in LOUDNESS_FIELDS of
+            services.loudness
 
     Returns:
         Dictionary with detected metadata (bpm, key, etc.)
@@ -200,7 +376,9 @@ def analyze_metadata(
     result = _read_metadata_from_tags(file_path)
 
     # Step 2: If missing and audio analysis enabled, analyze audio signal
-    if use_audio_analysis:
-        result = _update_result_with_audio_analysis(result, file_path)
+    if use_audio_analysis or extract_features:
+        result = _update_result_with_audio_analysis(
+            result, file_path, use_audio_analysis, extract_features
+        )
 
     return result
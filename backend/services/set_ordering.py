@@ -0,0 +1,278 @@
+"""Service for ordering DJ sets by harmonic and tempo compatibility."""
+
+import math
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.camelot import UNKNOWN_KEY_DISTANCE, parse_camelot
+
+# BPM distance (in percent) used when either tempo is unknown
+UNKNOWN_BPM_DISTANCE = 10.0
+
+# Number of nearest neighbours considered per track by the local search
+NEIGHBOUR_COUNT = 10
+
+# Number of starting tracks tried by the greedy construction
+GREEDY_STARTS = 8
+
+
+def build_cost_matrix(
+    keys: Sequence[Optional[str]],
+    bpms: Sequence[Optional[float]],
+    energies: Optional[Sequence[Optional[float]]] = None,
+    key_weight: float = 1.0,
+    bpm_weight: float = 0.2,
+    energy_weight: float = 1.0,
+) -> np.ndarray:
+    """
+    Build the symmetric transition cost matrix between tracks.
+
+    Costs combine Camelot distance (wheel steps), tempo distance (percent,
+    allowing half/double time) and the energy difference (0-1 scale).
+    """
+    n = len(keys)
+    if n == 0:
+        return np.zeros((0, 0))
+    codes = [parse_camelot(key) for key in keys]
+    numbers = np.array([c[0] if c else 0 for c in codes], dtype=np.int64)
+    minor = np.array([c is not None and c[1] == "A" for c in codes])
+    known_key = np.array([c is not None for c in codes])
+
+    steps = np.abs(numbers[:, None] - numbers[None, :]) % 12
+    key_cost = np.minimum(steps, 12 - steps) + (minor[:, None] != minor[None, :])
+    key_cost = np.where(
+        known_key[:, None] & known_key[None, :], key_cost, UNKNOWN_KEY_DISTANCE
+    ).astype(np.float64)
+
+    bpm = np.array([b if b and b > 0 else np.nan for b in bpms], dtype=np.float64)
+    log_bpm = np.log(bpm)
+    diff = log_bpm[None, :] - log_bpm[:, None]
+    # Half/double time mixes are a tempo ratio of 2 either way
+    tempo = np.minimum(np.abs(diff), np.abs(np.abs(diff) - math.log(2))) * 100
+    tempo = np.where(np.isnan(tempo), UNKNOWN_BPM_DISTANCE, tempo)
+
+    cost = key_weight * key_cost + bpm_weight * tempo
+    if energies is not None and energy_weight:
+        energy = np.array(
+            [e if e is not None else np.nan for e in energies], dtype=np.float64
+        )
+        energy_cost = np.abs(energy[:, None] - energy[None, :])
+        cost += energy_weight * np.where(np.isnan(energy_cost), 0.0, energy_cost)
+
+    np.fill_diagonal(cost, 0.0)
+    return cost
+
+
+def path_cost(cost: np.ndarray, order: Sequence[int]) -> float:
+    """Total transition cost of playing tracks in `order`."""
+    if len(order) < 2:
+        return 0.0
+    order = np.asarray(order)
+    return float(cost[order[:-1], order[1:]].sum())
+
+
+def _greedy_path(cost: np.ndarray, start: int) -> List[int]:
+    """Nearest-neighbour path from `start`."""
+    n = cost.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    path = [start]
+    visited[start] = True
+    current = start
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, cost[current])
+        current = int(np.argmin(row))
+        visited[current] = True
+        path.append(current)
+    return path
+
+
+class _Tour:
+    """
+    Cyclic tour with a dummy node 0 that links the two ends of the path.
+
+    Solving the open path as a cycle through a zero-cost dummy lets 2-opt and
+    or-opt moves treat the set's first and last tracks like any other.
+    """
+
+    def __init__(self, cost: List[List[float]], order: List[int]):
+        self.cost = cost
+        self.tour = [0] + [i + 1 for i in order]
+        self.pos = [0] * len(self.tour)
+        self._reindex(0, len(self.tour) - 1)
+
+    def _reindex(self, start: int, end: int):
+        for index in range(start, end + 1):
+            self.pos[self.tour[index]] = index
+
+    def succ(self, node: int) -> int:
+        return self.tour[(self.pos[node] + 1) % len(self.tour)]
+
+    def pred(self, node: int) -> int:
+        return self.tour[self.pos[node] - 1]
+
+    def reverse(self, i: int, j: int):
+        """Reverse tour[i..j] (inclusive), wrapping past the end if i > j."""
+        if i > j:
+            # Reversing the complement gives the same cycle
+            i, j = j + 1, i - 1
+            if i > j:
+                return
+        self.tour[i : j + 1] = self.tour[i : j + 1][::-1]
+        self._reindex(i, j)
+
+    def path(self) -> List[int]:
+        """Tour as a path of original indexes, starting after the dummy."""
+        start = self.pos[0]
+        rotated = self.tour[start + 1 :] + self.tour[:start]
+        return [node - 1 for node in rotated]
+
+
+def _two_opt_pass(tour: _Tour, neighbours: List[List[int]], deadline: float) -> bool:
+    """One pass of neighbour-list 2-opt. Returns whether the tour improved."""
+    cost = tour.cost
+    improved = False
+    for a in range(len(tour.tour)):
+        if time.perf_counter() > deadline:
+            break
+        for direction in (1, -1):
+            b = tour.succ(a) if direction == 1 else tour.pred(a)
+            ab = cost[a][b]
+            for c in neighbours[a]:
+                ac = cost[a][c]
+                if ac >= ab:
+                    break
+                d = tour.succ(c) if direction == 1 else tour.pred(c)
+                if c == b or d == a:
+                    continue
+                delta = ac + cost[b][d] - ab - cost[c][d]
+                if delta < -1e-9:
+                    if direction == 1:
+                        tour.reverse(tour.pos[b], tour.pos[c])
+                    else:
+                        tour.reverse(tour.pos[a], tour.pos[d])
+                    improved = True
+                    b = tour.succ(a) if direction == 1 else tour.pred(a)
+                    ab = cost[a][b]
+                    break
+    return improved
+
+
+def _or_opt_pass(
+    tour: _Tour, neighbours: List[List[int]], deadline: float, max_segment: int = 3
+) -> bool:
+    """One pass moving segments of up to `max_segment` tracks next to a neighbour."""
+    cost = tour.cost
+    m = len(tour.tour)
+    improved = False
+    for length in range(1, max_segment + 1):
+        if m - length < 3:
+            break
+        for first in range(m):
+            if time.perf_counter() > deadline:
+                return improved
+            start = tour.pos[first]
+            segment = [tour.tour[(start + k) % m] for k in range(length)]
+            last = segment[-1]
+            p, n = tour.pred(first), tour.succ(last)
+            removal_gain = cost[p][first] + cost[last][n] - cost[p][n]
+            if removal_gain <= 1e-9:
+                continue
+
+            best = None
+            for endpoint in (first, last):
+                for c in neighbours[endpoint]:
+                    if c in segment:
+                        continue
+                    e = tour.succ(c)
+                    if e in segment:
+                        continue
+                    forward = cost[c][first] + cost[last][e] - cost[c][e]
+                    backward = cost[c][last] + cost[first][e] - cost[c][e]
+                    added, reverse = min((forward, False), (backward, True))
+                    if added < removal_gain - 1e-9 and (
+                        best is None or added < best[0]
+                    ):
+                        best = (added, c, reverse)
+            if best is None:
+                continue
+
+            _, c, reverse = best
+            rest = [node for node in tour.tour if node not in segment]
+            insert_at = rest.index(c) + 1
+            rest[insert_at:insert_at] = segment[::-1] if reverse else segment
+            tour.tour = rest
+            tour._reindex(0, m - 1)
+            improved = True
+    return improved
+
+
+def order_set(
+    cost: np.ndarray,
+    start: Optional[int] = None,
+    time_budget: float = 0.5,
+) -> Tuple[List[int], bool]:
+    """
+    Find a low-cost order for a set of tracks.
+
+    A greedy nearest-neighbour path (from `start`, or the best of several
+    starting tracks) is improved by 2-opt and or-opt moves restricted to
+    each track's nearest neighbours, until no move helps or the time budget
+    (seconds) runs out.
+
+    Returns:
+        Tuple of (order as indexes into the cost matrix, whether the search
+        converged before the deadline)
+    """
+    n = cost.shape[0]
+    if n <= 2:
+        order = list(range(n))
+        if start is not None and n == 2:
+            order = [start, 1 - start]
+        return order, True
+
+    deadline = time.perf_counter() + time_budget
+
+    if start is not None:
+        candidates = [start]
+    else:
+        # Tracks with the cheapest transitions make good starting points
+        candidates = np.argsort(cost.sum(axis=1))[:GREEDY_STARTS].tolist()
+    order = min(
+        (_greedy_path(cost, candidate) for candidate in candidates),
+        key=lambda path: path_cost(cost, path),
+    )
+
+    # Dummy node 0 joins the path's ends; a fixed start is enforced by making
+    # every other track expensive to reach from the dummy
+    padded = np.zeros((n + 1, n + 1))
+    padded[1:, 1:] = cost
+    if start is not None:
+        penalty = cost.max() * n + 1
+        padded[0, 1:] = padded[1:, 0] = penalty
+        padded[0, start + 1] = padded[start + 1, 0] = 0.0
+
+    k = min(NEIGHBOUR_COUNT, n)
+    masked = padded + np.diag(np.full(n + 1, np.inf))
+    nearest = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    rows = np.arange(n + 1)[:, None]
+    nearest = np.take_along_axis(
+        nearest, np.argsort(masked[rows, nearest], axis=1), axis=1
+    )
+
+    tour = _Tour(padded.tolist(), order)
+    neighbours = nearest.tolist()
+    converged = False
+    while time.perf_counter() < deadline:
+        improved = _two_opt_pass(tour, neighbours, deadline)
+        improved = _or_opt_pass(tour, neighbours, deadline) or improved
+        if not improved:
+            converged = True
+            break
+
+    path = tour.path()
+    if start is not None and path[0] != start:
+        # The tour can run either way round the dummy
+        path.reverse()
+    return path, converged
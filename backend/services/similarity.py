@@ -0,0 +1,214 @@
+"""Service for content-based "similar tracks" search over audio feature vectors."""
+
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from services.metadata_service import FEATURE_DIM
+from storage.feature_storage import feature_storage
+
+# Feature groups in the vector layout: chroma, tempo, spectral, timbre.
+# Each group is weighted to contribute equally however many values it has.
+FEATURE_GROUPS = [slice(0, 12), slice(12, 13), slice(13, 19), slice(19, FEATURE_DIM)]
+
+# Libraries at least this large also get a partitioned (IVF) index
+IVF_MIN_TRACKS = 100_000
+
+# Partitions searched per query by the IVF index
+IVF_PROBES = 12
+
+# k-means training for the IVF partitions
+IVF_TRAIN_ITERATIONS = 8
+IVF_TRAIN_POINTS_PER_LIST = 64
+
+# Extra neighbours searched so callers that drop some results (e.g. tracks
+# deleted since the index was built) can still return the requested number
+SEARCH_PADDING = 10
+
+# Minimum seconds between index rebuilds after feature writes
+INDEX_REBUILD_SECONDS = 30
+
+# Rows scored at a time when assigning tracks to partitions
+ASSIGN_BATCH_SIZE = 16_384
+
+_GROUP_WEIGHTS = np.ones(FEATURE_DIM, dtype=np.float32)
+for _group in FEATURE_GROUPS:
+    _GROUP_WEIGHTS[_group] = 1 / np.sqrt(_group.stop - _group.start)
+
+
+def normalize_features(features: np.ndarray) -> np.ndarray:
+    """
+    Turn raw feature vectors into unit vectors whose dot product is their
+    cosine similarity.
+
+    Each feature is standardized across the library, so different units
+    (Hz, log BPM, MFCC coefficients) compare fairly. Missing values (NaN)
+    become the library average.
+    """
+    matrix = np.array(features, dtype=np.float32)
+    valid = ~np.isnan(matrix)
+    counts = np.maximum(valid.sum(axis=0), 1)
+    mean = np.where(valid, matrix, 0).sum(axis=0) / counts
+    matrix = np.where(valid, matrix - mean, 0)
+    std = np.sqrt((matrix**2).sum(axis=0) / counts)
+    std[std == 0] = 1
+    matrix *= _GROUP_WEIGHTS / std
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the `k` highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class SimilarityIndex:
+    """
+    Nearest-neighbour index over normalized feature vectors.
+
+    Exact search is one matrix-vector product over the whole library. The
+    optional IVF index partitions the vectors with k-means and only scores
+    the partitions whose centroids are closest to the query.
+    """
+
+    def __init__(self, track_ids: List[str], features: np.ndarray, ivf_lists: int = 0):
+        self.track_ids = track_ids
+        self.rows = {track_id: row for row, track_id in enumerate(track_ids)}
+        self.vectors = (
+            normalize_features(features)
+            if len(track_ids)
+            else np.zeros((0, FEATURE_DIM), dtype=np.float32)
+        )
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+        if ivf_lists and len(track_ids) > ivf_lists:
+            self._build_ivf(ivf_lists)
+
+    @property
+    def kind(self) -> str:
+        """Search used by default: ivf when partitions were built, else exact."""
+        return "exact" if self.centroids is None else "ivf"
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid for each vector, in batches to bound memory."""
+        return np.concatenate(
+            [
+                np.argmax(
+                    vectors[start : start + ASSIGN_BATCH_SIZE] @ centroids.T, axis=1
+                )
+                for start in range(0, len(vectors), ASSIGN_BATCH_SIZE)
+            ]
+        )
+
+    def _build_ivf(self, n_lists: int):
+        """Partition the vectors with spherical k-means on a sample."""
+        rng = np.random.default_rng(0)
+        n = len(self.vectors)
+        sample_size = min(n, n_lists * IVF_TRAIN_POINTS_PER_LIST)
+        sample = self.vectors[rng.choice(n, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assignment = self._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty partitions keep their previous centroid
+            filled = norms[:, 0] > 0
+            centroids[filled] = sums[filled] / norms[filled]
+
+        assignment = self._assign(self.vectors, centroids)
+        order = np.argsort(assignment, kind="stable")
+        boundaries = np.cumsum(np.bincount(assignment, minlength=n_lists))[:-1]
+        self.centroids = centroids
+        self.lists = np.split(order, boundaries)
+
+    def search(
+        self, track_id: str, k: int, exact: bool = False
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        Find the `k` tracks most similar to a track.
+
+        Returns:
+            List of (track ID, cosine similarity), best first, or None if
+            the track has no feature vector
+        """
+        row = self.rows.get(track_id)
+        if row is None:
+            return None
+        query = self.vectors[row]
+
+        if exact or self.centroids is None:
+            candidates = None
+            scores = self.vectors @ query
+            scores[row] = -np.inf
+        else:
+            probes = min(IVF_PROBES, len(self.centroids))
+            nearest = _top_k(self.centroids @ query, probes)
+            candidates = np.concatenate([self.lists[i] for i in nearest])
+            candidates = candidates[candidates != row]
+            scores = self.vectors[candidates] @ query
+
+        top = _top_k(scores, k)
+        rows = top if candidates is None else candidates[top]
+        return [
+            (self.track_ids[r], float(score))
+            for r, score in zip(rows.tolist(), scores[top].tolist())
+            if score != -np.inf
+        ]
+
+
+_index: Optional[SimilarityIndex] = None
+_index_generation: Optional[int] = None
+_index_built_at = 0.0
+_rebuild_lock = threading.Lock()
+
+
+def _rebuild_index(generation: int):
+    """Build the index over all stored features and make it current."""
+    global _index, _index_generation, _index_built_at
+    track_ids, features = feature_storage.load_all()
+    ivf_lists = 0
+    if len(track_ids) >= IVF_MIN_TRACKS:
+        ivf_lists = int(np.sqrt(len(track_ids)))
+    _index = SimilarityIndex(track_ids, features, ivf_lists)
+    _index_generation = generation
+    _index_built_at = time.monotonic()
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """
+    Return the index over stored features.
+
+    Feature writes make the index stale, but it is rebuilt at most once
+    every INDEX_REBUILD_SECONDS, so batch analysis saving tracks one by one
+    does not turn every search into a rebuild. Only the request that
+    rebuilds waits for it; concurrent requests keep using the previous
+    index. Tracks analyzed since the last rebuild are not searchable yet.
+    """
+    generation = feature_storage.generation
+    index = _index
+    if index is not None and (
+        _index_generation == generation
+        or time.monotonic() - _index_built_at < INDEX_REBUILD_SECONDS
+    ):
+        return index
+
+    # Without an index there is nothing to serve meanwhile, so wait
+    if not _rebuild_lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is None or (
+            _index_generation != generation
+            and time.monotonic() - _index_built_at >= INDEX_REBUILD_SECONDS
+        ):
+            _rebuild_index(generation)
+        return _index
+    finally:
+        _rebuild_lock.release()
@@ -0,0 +1,67 @@
+"""
+Waveform overviews: per-track min/max peaks at a few fixed resolutions.
+
+Each resolution is a number of buckets spread over the whole track; a
+bucket is stored as two int8 values (its lowest and highest sample, with
+127 as full scale), interleaved as min, max, min, max, ... All resolutions
+are computed from one decode and stored together in a single blob, lowest
+resolution first.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Buckets per resolution; each one divides the next, so lower resolutions
+# are reduced from the highest instead of rescanning the samples
+WAVEFORM_RESOLUTIONS = (256, 1024, 4096)
+
+# Size of the stored blob: two int8 values per bucket at every resolution
+WAVEFORM_BYTES = 2 * sum(WAVEFORM_RESOLUTIONS)
+
+
+def compute_waveform(y: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Compute the peak overview of decoded mono audio (the whole track).
+
+    Returns:
+        int8 array of WAVEFORM_BYTES values, or None for empty audio
+    """
+    samples = np.clip(np.asarray(y, dtype=np.float32), -1.0, 1.0)
+    if samples.size == 0:
+        return None
+    highest = WAVEFORM_RESOLUTIONS[-1]
+    if samples.size < highest:
+        # Every bucket needs at least one sample
+        samples = np.pad(samples, (0, highest - samples.size))
+
+    edges = np.linspace(0, samples.size, highest + 1).astype(np.int64)[:-1]
+    peaks = np.stack(
+        [np.minimum.reduceat(samples, edges), np.maximum.reduceat(samples, edges)],
+        axis=1,
+    )
+
+    levels = []
+    for resolution in WAVEFORM_RESOLUTIONS:
+        grouped = peaks.reshape(resolution, -1, 2)
+        level = np.stack(
+            [grouped[:, :, 0].min(axis=1), grouped[:, :, 1].max(axis=1)], axis=1
+        )
+        levels.append(level.ravel())
+    return np.round(np.concatenate(levels) * 127).astype(np.int8)
+
+
+def waveform_level(waveform: np.ndarray, resolution: int) -> np.ndarray:
+    """
+    Slice one resolution out of a stored waveform blob.
+
+    Raises:
+        ValueError: If the resolution is not one of WAVEFORM_RESOLUTIONS
+    """
+    if resolution not in WAVEFORM_RESOLUTIONS:
+        supported = ", ".join(str(r) for r in WAVEFORM_RESOLUTIONS)
+        raise ValueError(
+            f"Unsupported resolution {resolution}; use one of: {supported}"
+        )
+    start = 2 * sum(WAVEFORM_RESOLUTIONS[: WAVEFORM_RESOLUTIONS.index(resolution)])
+    return waveform[start : start + 2 * resolution]
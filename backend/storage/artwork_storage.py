@@ -0,0 +1,145 @@
+"""
+Storage module for embedded cover artwork.
+
+Images are content-addressed: each distinct image is stored once on disk
+under the hash of its bytes, so the tracks of an album share one copy.
+JPEG thumbnails are rendered once, when an image is first stored, if
+Pillow is installed; without it only the original image is kept.
+"""
+
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Directory for artwork files, relative to the backend working directory
+ARTWORK_DIR = "artwork"
+
+# Edge lengths (in pixels) of the pre-scaled thumbnails, largest last
+ARTWORK_SIZES = (64, 256, 512)
+
+THUMBNAIL_QUALITY = 85
+
+# Leading bytes of the image formats found in audio tags
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "jpg",
+    b"\x89PNG\r\n\x1a\n": "png",
+    b"GIF87a": "gif",
+    b"GIF89a": "gif",
+    b"BM": "bmp",
+}
+
+
+def image_extension(image: bytes) -> Optional[str]:
+    """Get the file extension for image bytes, or None if not a known image."""
+    if image[:4] == b"RIFF" and image[8:12] == b"WEBP":
+        return "webp"
+    for signature, extension in IMAGE_SIGNATURES.items():
+        if image.startswith(signature):
+            return extension
+    return None
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write a file via a temporary file, so readers never see partial data."""
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class ArtworkStorage:
+    """Content-addressed artwork files with pre-scaled thumbnails."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _directory(self, artwork_hash: str) -> Path:
+        # Two-character fan-out keeps directories small for large libraries
+        return self.root / artwork_hash[:2]
+
+    def _original_path(self, artwork_hash: str, extension: str) -> Path:
+        return self._directory(artwork_hash) / f"{artwork_hash}.{extension}"
+
+    def _thumbnail_path(self, artwork_hash: str, size: int) -> Path:
+        return self._directory(artwork_hash) / f"{artwork_hash}_{size}.jpg"
+
+    def _write_thumbnails(self, artwork_hash: str, image: bytes):
+        with Image.open(BytesIO(image)) as source:
+            largest = ARTWORK_SIZES[-1]
+            # Lets the JPEG decoder scale down while decoding
+            source.draft("RGB", (largest, largest))
+            picture = source.convert("RGB")
+        # Each size is scaled from the previous one rather than the original
+        for size in reversed(ARTWORK_SIZES):
+            picture.thumbnail((size, size), Image.LANCZOS)
+            buffer = BytesIO()
+            picture.save(buffer, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+            _write_atomic(self._thumbnail_path(artwork_hash, size), buffer.getvalue())
+
+    def save(self, image: Optional[bytes]) -> Optional[str]:
+        """
+        Store an image and its thumbnails unless it is already stored.
+
+        Returns:
+            Hash identifying the artwork, or None if the bytes are not a
+            readable image
+        """
+        if not image:
+            return None
+        extension = image_extension(image)
+        if extension is None:
+            return None
+        artwork_hash = hashlib.blake2b(image, digest_size=16).hexdigest()
+        original = self._original_path(artwork_hash, extension)
+        if original.exists():
+            return artwork_hash
+
+        original.parent.mkdir(parents=True, exist_ok=True)
+        if PIL_AVAILABLE:
+            try:
+                self._write_thumbnails(artwork_hash, image)
+            except (OSError, ValueError, Image.DecompressionBombError):
+                return None
+        # Written last, so an existing original means its thumbnails exist too
+        _write_atomic(original, image)
+        return artwork_hash
+
+    def get_path(self, artwork_hash: str, size: Optional[int] = None) -> Optional[Path]:
+        """
+        Get the file for stored artwork: the thumbnail for `size` (one of
+        ARTWORK_SIZES), or the original image when size is None or no
+        thumbnail was rendered.
+
+        Raises:
+            ValueError: If size is not one of ARTWORK_SIZES
+        """
+        if size is not None:
+            if size not in ARTWORK_SIZES:
+                supported = ", ".join(str(s) for s in ARTWORK_SIZES)
+                raise ValueError(f"Unsupported size {size}; use one of: {supported}")
+            thumbnail = self._thumbnail_path(artwork_hash, size)
+            if thumbnail.exists():
+                return thumbnail
+        for extension in sorted(set(IMAGE_SIGNATURES.values()) | {"webp"}):
+            original = self._original_path(artwork_hash, extension)
+            if original.exists():
+                return original
+        return None
+
+
+# Global storage instance
+artwork_storage = ArtworkStorage(ARTWORK_DIR)
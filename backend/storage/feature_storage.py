@@ -0,0 +1,110 @@
+"""
+Storage module for per-track audio analysis arrays (feature vectors,
+fingerprints, waveform peaks and beat grids). Arrays are stored as raw
+bytes, one BLOB per track.
+"""
+
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from core.database import get_db
+
+FEATURE_DTYPE = np.float32
+FINGERPRINT_DTYPE = np.uint32
+WAVEFORM_DTYPE = np.int8
+BEAT_GRID_DTYPE = np.int32
+
+
+class TrackArrayStorage:
+    """Database-backed storage for one fixed-width array per track."""
+
+    def __init__(self, table: str, column: str, dtype):
+        self.table = table
+        self.column = column
+        self.dtype = dtype
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter that changes whenever stored arrays change, kept by database
+        triggers so deletes cascading from tracks count too.
+        """
+        with get_db() as (_, cursor):
+            cursor.execute(
+                "SELECT version FROM track_array_versions WHERE array_table = ?",
+                (self.table,),
+            )
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def save(self, arrays: Iterable[Tuple[UUID, np.ndarray]]) -> int:
+        """
+        Insert or replace arrays in a single transaction.
+
+        Returns:
+            Number of arrays written
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (str(track_id), np.asarray(array, dtype=self.dtype).tobytes(), now)
+            for track_id, array in arrays
+        ]
+        if not rows:
+            return 0
+        with get_db() as (conn, cursor):
+            cursor.executemany(
+                f"""INSERT OR REPLACE INTO {self.table} (track_id, {self.column}, updated_at)
+                   VALUES (?, ?, ?)""",
+                rows,
+            )
+            conn.commit()
+        return len(rows)
+
+    def get(self, track_id: UUID) -> Optional[np.ndarray]:
+        """Get a track's array, or None if it was not analyzed."""
+        with get_db() as (_, cursor):
+            cursor.execute(
+                f"SELECT {self.column} FROM {self.table} WHERE track_id = ?",
+                (str(track_id),),
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=self.dtype)
+
+    def has(self, track_id: UUID) -> bool:
+        """Whether a track's array is stored, without reading it."""
+        with get_db() as (_, cursor):
+            cursor.execute(
+                f"SELECT 1 FROM {self.table} WHERE track_id = ?", (str(track_id),)
+            )
+            return cursor.fetchone() is not None
+
+    def load_all(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Load every stored array as one matrix (for fixed-width arrays only).
+
+        Returns:
+            Tuple of (track IDs, matrix with one row per track)
+        """
+        with get_db() as (_, cursor):
+            cursor.execute(f"SELECT track_id, {self.column} FROM {self.table}")
+            rows = cursor.fetchall()
+        if not rows:
+            return [], np.zeros((0, 0), dtype=self.dtype)
+        track_ids = [row[0] for row in rows]
+        # Rows are fixed width, so the blobs concatenate into one matrix
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=self.dtype)
+        return track_ids, matrix.reshape(len(rows), -1)
+
+
+# Global storage instances
+feature_storage = TrackArrayStorage("track_features", "features", FEATURE_DTYPE)
+fingerprint_storage = TrackArrayStorage(
+    "track_fingerprints", "fingerprint", FINGERPRINT_DTYPE
+)
+waveform_storage = TrackArrayStorage("track_waveforms", "peaks", WAVEFORM_DTYPE)
+beat_grid_storage = TrackArrayStorage("track_beat_grids", "grid", BEAT_GRID_DTYPE)
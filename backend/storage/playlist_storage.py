@@ -3,40 +3,94 @@ Storage module for managing playlists in the library.
 Uses SQLite database for persistent storage.
 """
 
-from datetime import datetime
-from typing import List, Optional
+import json
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
-from core.database import get_db
-from models import Playlist, PlaylistDetail, Track
+from core.database import SQLITE_MAX_VARIABLES, chunked, get_db
+from models import Pagination, Playlist, PlaylistDetail, SmartPlaylistRules, Track
+from storage.track_storage import build_track_where_clause, storage, track_columns_sql
+
+# Playlist positions are sparse so a move only rewrites the moved row. New
+# tracks are spaced POSITION_GAP apart; once a move leaves less than
+# MIN_POSITION_GAP on either side, the playlist should be renumbered.
+POSITION_GAP = 1024
+MIN_POSITION_GAP = 8
+
+# Seconds between sweeps for smart playlist members that aged out of an
+# "added within N days" rule
+SMART_EXPIRY_SWEEP_SECONDS = 15 * 60
+
+# Track columns smart playlist rules can depend on; updates that touch none
+# of them cannot change membership
+SMART_RULE_COLUMNS = {
+    "title",
+    "artist",
+    "album",
+    "genre",
+    "mood",
+    "bpm",
+    "key",
+    "year",
+    "missing",
+    "loudness_lufs",
+    "energy",
+    "danceability",
+}
+
+
+def build_smart_where_clause(rules: SmartPlaylistRules) -> Tuple[str, List]:
+    """Build the WHERE clause selecting the tracks of a smart playlist."""
+    where_clause, params = build_track_where_clause(rules)
+    if rules.added_within_days:
+        cutoff = datetime.now() - timedelta(days=rules.added_within_days)
+        where_clause = f"{where_clause} AND created_at >= ?"
+        params = params + [cutoff.isoformat()]
+    return where_clause, params
 
 
 class PlaylistStorage:
     """Database-backed storage for playlists."""
 
     @staticmethod
-    def row_to_playlist(row) -> Playlist:
-        """Convert a database row to a Playlist object."""
+    def _playlist_row_dict(row) -> dict:
+        """Convert a playlist row to a dict with smart rules decoded."""
         row_dict = dict(row)
-        return Playlist(**row_dict)
+        if row_dict.get("smart_rules"):
+            row_dict["smart_rules"] = json.loads(row_dict["smart_rules"])
+        return row_dict
+
+    @classmethod
+    def row_to_playlist(cls, row) -> Playlist:
+        """Convert a database row to a Playlist object."""
+        return Playlist(**cls._playlist_row_dict(row))
 
-    def create_playlist(self, name: str, description: Optional[str] = None) -> Playlist:
-        """Create a new playlist."""
+    def create_playlist(
+        self,
+        name: str,
+        description: Optional[str] = None,
+        smart_rules: Optional[SmartPlaylistRules] = None,
+    ) -> Playlist:
+        """Create a new playlist, filled from its rules if it is a smart playlist."""
         playlist_id = uuid4()
         now = datetime.now()
 
         with get_db() as (conn, cursor):
             cursor.execute(
-                """INSERT INTO playlists (id, name, description, created_at, updated_at)
-                   VALUES (?, ?, ?, ?, ?)""",
+                """INSERT INTO playlists (id, name, description, smart_rules, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
                 (
                     str(playlist_id),
                     name,
                     description,
+                    smart_rules.model_dump_json() if smart_rules else None,
                     now.isoformat(),
                     now.isoformat(),
                 ),
             )
+            if smart_rules:
+                self._populate_smart_playlist(cursor, playlist_id, smart_rules)
             conn.commit()
 
             # Fetch the created playlist
@@ -59,30 +113,27 @@ class PlaylistStorage:
     def get_all_playlists(self) -> List[Playlist]:
         """Get all playlists with track count and duration."""
         with get_db() as (_, cursor):
-            cursor.execute("""
-                SELECT p.*,
-                       COUNT(pt.track_id) as track_count,
-                       COALESCE(SUM(t.duration_seconds), 0) as total_duration_seconds
-                FROM playlists p
-                LEFT JOIN playlist_tracks pt ON p.id = pt.playlist_id
-                LEFT JOIN tracks t ON pt.track_id = t.id
-                GROUP BY p.id
-                ORDER BY p.created_at DESC
-            """)
+            # Aggregates are maintained by triggers (see core.database)
+            cursor.execute("SELECT * FROM playlists ORDER BY created_at DESC")
             results = cursor.fetchall()
-            playlists = []
-            for row in results:
-                row_dict = dict(row)
-                playlists.append(Playlist(**row_dict))
-            return playlists
+            return [self.row_to_playlist(row) for row in results]
 
     def update_playlist(
         self,
         playlist_id: UUID,
         name: Optional[str] = None,
         description: Optional[str] = None,
+        smart_rules: Optional[SmartPlaylistRules] = None,
+        clear_smart_rules: bool = False,
     ) -> Optional[Playlist]:
-        """Update a playlist's metadata."""
+        """
+        Update a playlist's metadata.
+
+        Setting `smart_rules` turns the playlist into a smart playlist (or
+        replaces its rules) and rebuilds its tracks from the new rules.
+        `clear_smart_rules` turns it back into a manual playlist that keeps
+        its current tracks.
+        """
         with get_db() as (conn, cursor):
             # Check if playlist exists
             cursor.execute("SELECT * FROM playlists WHERE id = ?", (str(playlist_id),))
@@ -102,6 +153,12 @@ class PlaylistStorage:
                 update_fields.append("description = ?")
                 update_values.append(description)
 
+            if smart_rules is not None:
+                update_fields.append("smart_rules = ?")
+                update_values.append(smart_rules.model_dump_json())
+            elif clear_smart_rules:
+                update_fields.append("smart_rules = NULL")
+
             if not update_fields:
                 # No fields to update, return existing playlist
                 return self.row_to_playlist(result)
@@ -118,6 +175,8 @@ class PlaylistStorage:
                 f"UPDATE playlists SET {', '.join(update_fields)} WHERE id = ?"
             )
             cursor.execute(update_query, update_values)
+            if smart_rules is not None:
+                self._populate_smart_playlist(cursor, playlist_id, smart_rules)
             conn.commit()
 
             # Fetch updated playlist
@@ -143,8 +202,20 @@ class PlaylistStorage:
             conn.commit()
             return True
 
-    def get_playlist_detail(self, playlist_id: UUID) -> Optional[PlaylistDetail]:
-        """Get a playlist with its tracks."""
+    def get_playlist_detail(
+        self,
+        playlist_id: UUID,
+        columns: Optional[List[str]] = None,
+        page: int = 1,
+        size: Optional[int] = None,
+    ) -> Optional[PlaylistDetail]:
+        """
+        Get a playlist with its tracks, optionally projected to `columns`.
+
+        Track count and duration come from the playlist row, where they are
+        maintained by triggers. When `size` is given only that page of
+        tracks is loaded and pagination metadata is included.
+        """
         with get_db() as (_, cursor):
             # Get playlist
             cursor.execute("SELECT * FROM playlists WHERE id = ?", (str(playlist_id),))
@@ -152,96 +223,154 @@ class PlaylistStorage:
             if not playlist_row:
                 return None
 
-            playlist_dict = dict(playlist_row)
+            playlist_dict = self._playlist_row_dict(playlist_row)
+            track_count = playlist_dict["track_count"]
 
-            # Get tracks for this playlist
+            # Get tracks for this playlist (or one page of them)
+            limit_clause = ""
+            if size is not None:
+                limit_clause = f"LIMIT {size} OFFSET {(page - 1) * size}"
             cursor.execute(
-                """
-                SELECT t.*
-                FROM tracks t
-                INNER JOIN playlist_tracks pt ON t.id = pt.track_id
+                f"""
+                SELECT {track_columns_sql(columns, "t")}
+                FROM playlist_tracks pt
+                INNER JOIN tracks t ON t.id = pt.track_id
                 WHERE pt.playlist_id = ?
                 ORDER BY pt.position ASC, pt.added_at ASC
+                {limit_clause}
             """,
                 (str(playlist_id),),
             )
-            track_rows = cursor.fetchall()
-
-            # Convert tracks
-            from storage.track_storage import storage
-
-            tracks = [storage.row_to_track(row) for row in track_rows]
-
-            # Calculate track_count and total_duration_seconds
-            track_count = len(tracks)
-            total_duration_seconds = sum(track.duration_seconds or 0 for track in tracks)
-
-            playlist_dict["track_count"] = track_count
-            playlist_dict["total_duration_seconds"] = total_duration_seconds
-
-            return PlaylistDetail(**playlist_dict, tracks=tracks)
-
-    def add_tracks_to_playlist(self, playlist_id: UUID, track_ids: List[UUID]) -> bool:
-        """Add tracks to a playlist."""
-        if not track_ids:
-            return True
+            tracks = storage.rows_to_tracks(cursor.fetchall())
+
+            if size is None:
+                return PlaylistDetail(**playlist_dict, tracks=tracks)
+
+            total_pages = (track_count + size - 1) // size
+            pagination = Pagination(
+                page=page,
+                size=size,
+                total_pages=total_pages,
+                total_items=track_count,
+                has_next=page < total_pages,
+                has_previous=page > 1,
+            )
+            return PlaylistDetail(**playlist_dict, tracks=tracks, pagination=pagination)
 
-        with get_db() as (conn, cursor):
-            # Check if playlist exists
+    def get_playlist_track_ids(self, playlist_id: UUID) -> Optional[List[UUID]]:
+        """Get the IDs of a playlist's tracks in playlist order."""
+        with get_db() as (_, cursor):
             cursor.execute(
                 "SELECT COUNT(*) FROM playlists WHERE id = ?", (str(playlist_id),)
             )
             if cursor.fetchone()[0] == 0:
-                return False
+                return None
 
-            # Get current max position
             cursor.execute(
-                "SELECT COALESCE(MAX(position), -1) FROM playlist_tracks WHERE playlist_id = ?",
+                """
+                SELECT pt.track_id
+                FROM playlist_tracks pt
+                INNER JOIN tracks t ON t.id = pt.track_id
+                WHERE pt.playlist_id = ?
+                ORDER BY pt.position ASC, pt.added_at ASC
+            """,
                 (str(playlist_id),),
             )
-            max_position = cursor.fetchone()[0] or -1
+            return [UUID(row[0]) for row in cursor.fetchall()]
 
-            now = datetime.now().isoformat()
-            for i, track_id in enumerate(track_ids):
-                # Check if track exists
-                cursor.execute(
-                    "SELECT COUNT(*) FROM tracks WHERE id = ?", (str(track_id),)
-                )
-                if cursor.fetchone()[0] == 0:
-                    continue  # Skip non-existent tracks
+    def add_tracks_to_playlist(
+        self, playlist_id: UUID, track_ids: List[UUID]
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Add tracks to the end of a playlist.
+
+        Requested IDs are staged in a temp table and inserted with a single
+        INSERT ... SELECT joined against tracks. Unknown tracks and tracks
+        already in the playlist are skipped, and new tracks are appended in
+        request order, POSITION_GAP apart.
+
+        Returns:
+            Tuple of (added count, skipped count), or None if the playlist
+            does not exist
+
+        Raises:
+            ValueError: If the playlist is a smart playlist
+        """
+        if not track_ids:
+            return 0, 0
 
-                # Check if already in playlist
-                cursor.execute(
-                    "SELECT COUNT(*) FROM playlist_tracks WHERE playlist_id = ? AND track_id = ?",
-                    (str(playlist_id), str(track_id)),
+        with get_db() as (conn, cursor):
+            # Check if playlist exists and is a manual playlist
+            cursor.execute(
+                "SELECT smart_rules FROM playlists WHERE id = ?", (str(playlist_id),)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            if row[0]:
+                raise ValueError(
+                    "Tracks of a smart playlist follow its rules and cannot be added manually"
                 )
-                if cursor.fetchone()[0] > 0:
-                    continue  # Skip duplicates
 
-                # Add track
-                cursor.execute(
-                    """INSERT INTO playlist_tracks (playlist_id, track_id, position, added_at)
-                       VALUES (?, ?, ?, ?)""",
-                    (str(playlist_id), str(track_id), max_position + 1 + i, now),
-                )
+            # Stage requested IDs, keeping the first occurrence of each
+            requested_ids = list(dict.fromkeys(str(tid) for tid in track_ids))
+            cursor.execute("""CREATE TEMP TABLE IF NOT EXISTS requested_tracks
+                   (seq INTEGER PRIMARY KEY, track_id TEXT NOT NULL)""")
+            cursor.execute("DELETE FROM requested_tracks")
+            cursor.executemany(
+                "INSERT INTO requested_tracks (seq, track_id) VALUES (?, ?)",
+                enumerate(requested_ids),
+            )
 
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO playlist_tracks (playlist_id, track_id, position, added_at)
+                SELECT ?,
+                       r.track_id,
+                       (SELECT COALESCE(MAX(position), 0)
+                        FROM playlist_tracks WHERE playlist_id = ?)
+                           + ROW_NUMBER() OVER (ORDER BY r.seq) * ?,
+                       ?
+                FROM requested_tracks r
+                INNER JOIN tracks t ON t.id = r.track_id
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM playlist_tracks pt
+                    WHERE pt.playlist_id = ? AND pt.track_id = r.track_id
+                )
+                ORDER BY r.seq
+            """,
+                (
+                    str(playlist_id),
+                    str(playlist_id),
+                    POSITION_GAP,
+                    datetime.now().isoformat(),
+                    str(playlist_id),
+                ),
+            )
+            added_count = cursor.rowcount
+            cursor.execute("DROP TABLE requested_tracks")
             conn.commit()
-            return True
+            return added_count, len(track_ids) - added_count
 
     def remove_tracks_from_playlist(
         self, playlist_id: UUID, track_ids: List[UUID]
     ) -> bool:
-        """Remove tracks from a playlist."""
+        """Remove tracks from a playlist. Raises ValueError for smart playlists."""
         if not track_ids:
             return True
 
         with get_db() as (conn, cursor):
-            # Check if playlist exists
+            # Check if playlist exists and is a manual playlist
             cursor.execute(
-                "SELECT COUNT(*) FROM playlists WHERE id = ?", (str(playlist_id),)
+                "SELECT smart_rules FROM playlists WHERE id = ?", (str(playlist_id),)
             )
-            if cursor.fetchone()[0] == 0:
+            row = cursor.fetchone()
+            if row is None:
                 return False
+            if row[0]:
+                raise ValueError(
+                    "Tracks of a smart playlist follow its rules and cannot be removed manually"
+                )
 
             # Remove tracks
             placeholders = ",".join("?" * len(track_ids))
@@ -253,6 +382,266 @@ class PlaylistStorage:
             conn.commit()
             return True
 
+    @staticmethod
+    def _neighbour_positions(
+        cursor, playlist_id: UUID, track_id: UUID, after_track_id: Optional[UUID]
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Get the positions the moved track should be placed between."""
+        if after_track_id is None:
+            cursor.execute(
+                """SELECT MIN(position) FROM playlist_tracks
+                   WHERE playlist_id = ? AND track_id != ?""",
+                (str(playlist_id), str(track_id)),
+            )
+            return None, cursor.fetchone()[0]
+
+        cursor.execute(
+            "SELECT position FROM playlist_tracks WHERE playlist_id = ? AND track_id = ?",
+            (str(playlist_id), str(after_track_id)),
+        )
+        row = cursor.fetchone()
+        if not row:
+            raise ValueError(f"Track {after_track_id} is not in the playlist")
+        previous_position = row[0]
+
+        cursor.execute(
+            """SELECT MIN(position) FROM playlist_tracks
+               WHERE playlist_id = ? AND track_id NOT IN (?, ?) AND position >= ?""",
+            (str(playlist_id), str(track_id), str(after_track_id), previous_position),
+        )
+        return previous_position, cursor.fetchone()[0]
+
+    @staticmethod
+    def _renumber(cursor, playlist_id: UUID):
+        """Respace all positions of a playlist POSITION_GAP apart, keeping order."""
+        cursor.execute(
+            """SELECT track_id FROM playlist_tracks
+               WHERE playlist_id = ?
+               ORDER BY position ASC, added_at ASC""",
+            (str(playlist_id),),
+        )
+        track_ids = [row[0] for row in cursor.fetchall()]
+        cursor.executemany(
+            "UPDATE playlist_tracks SET position = ? WHERE playlist_id = ? AND track_id = ?",
+            [
+                ((index + 1) * POSITION_GAP, str(playlist_id), track_id)
+                for index, track_id in enumerate(track_ids)
+            ],
+        )
+
+    def move_track(
+        self, playlist_id: UUID, track_id: UUID, after_track_id: Optional[UUID]
+    ) -> Optional[bool]:
+        """
+        Move a track within a playlist, writing only the moved row.
+
+        The track is placed directly after `after_track_id`, or at the top
+        when it is None. The playlist is renumbered inline only when there
+        is no integer position left between the neighbours.
+
+        Returns:
+            None if the playlist does not contain the track, otherwise
+            whether the remaining gap is small enough that the playlist
+            should be renumbered
+
+        Raises:
+            ValueError: If after_track_id is the moved track or is not in
+                the playlist
+        """
+        if after_track_id == track_id:
+            raise ValueError("A track cannot be moved after itself")
+
+        with get_db() as (conn, cursor):
+            cursor.execute(
+                "SELECT COUNT(*) FROM playlist_tracks WHERE playlist_id = ? AND track_id = ?",
+                (str(playlist_id), str(track_id)),
+            )
+            if cursor.fetchone()[0] == 0:
+                return None
+
+            previous_position, next_position = self._neighbour_positions(
+                cursor, playlist_id, track_id, after_track_id
+            )
+            if (
+                previous_position is not None
+                and next_position is not None
+                and next_position - previous_position < 2
+            ):
+                # No room between the neighbours: respace and look again
+                self._renumber(cursor, playlist_id)
+                previous_position, next_position = self._neighbour_positions(
+                    cursor, playlist_id, track_id, after_track_id
+                )
+
+            if previous_position is None and next_position is None:
+                new_position = POSITION_GAP
+                remaining_gap = POSITION_GAP
+            elif previous_position is None:
+                new_position = next_position - POSITION_GAP
+                remaining_gap = POSITION_GAP
+            elif next_position is None:
+                new_position = previous_position + POSITION_GAP
+                remaining_gap = POSITION_GAP
+            else:
+                new_position = (previous_position + next_position) // 2
+                remaining_gap = min(
+                    new_position - previous_position, next_position - new_position
+                )
+
+            cursor.execute(
+                "UPDATE playlist_tracks SET position = ? WHERE playlist_id = ? AND track_id = ?",
+                (new_position, str(playlist_id), str(track_id)),
+            )
+            conn.commit()
+            return remaining_gap < MIN_POSITION_GAP
+
+    def renumber_playlist(self, playlist_id: UUID):
+        """Respace a playlist's positions so future moves stay single-row."""
+        with get_db() as (conn, cursor):
+            self._renumber(cursor, playlist_id)
+            conn.commit()
+
+    def set_track_order(self, playlist_id: UUID, track_ids: List[UUID]) -> int:
+        """
+        Rewrite positions so the given tracks come in this order.
+
+        Returns:
+            Number of playlist tracks repositioned
+        """
+        with get_db() as (conn, cursor):
+            cursor.executemany(
+                "UPDATE playlist_tracks SET position = ? WHERE playlist_id = ? AND track_id = ?",
+                [
+                    ((index + 1) * POSITION_GAP, str(playlist_id), str(track_id))
+                    for index, track_id in enumerate(track_ids)
+                ],
+            )
+            updated_count = cursor.rowcount
+            conn.commit()
+            return updated_count
+
+    @staticmethod
+    def _populate_smart_playlist(cursor, playlist_id: UUID, rules: SmartPlaylistRules):
+        """Replace a smart playlist's tracks with every track matching its rules."""
+        where_clause, params = build_smart_where_clause(rules)
+        cursor.execute(
+            "DELETE FROM playlist_tracks WHERE playlist_id = ?", (str(playlist_id),)
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO playlist_tracks (playlist_id, track_id, position, added_at)
+            SELECT ?, id, ROW_NUMBER() OVER (ORDER BY created_at, id) * ?, ?
+            FROM tracks
+            WHERE {where_clause}
+        """,
+            [str(playlist_id), POSITION_GAP, datetime.now().isoformat()] + params,
+        )
+
+    @staticmethod
+    def _load_smart_playlists(cursor) -> List[Tuple[str, SmartPlaylistRules]]:
+        """Get (playlist ID, rules) for all smart playlists."""
+        cursor.execute(
+            "SELECT id, smart_rules FROM playlists WHERE smart_rules IS NOT NULL"
+        )
+        return [
+            (row[0], SmartPlaylistRules.model_validate_json(row[1]))
+            for row in cursor.fetchall()
+        ]
+
+    def prune_expired_smart_members(self) -> int:
+        """
+        Drop tracks that have aged out of "added within N days" rules.
+
+        New tracks are added as they are inserted, so the only membership
+        change that happens without a track write is ageing out. Reads do
+        not check for it, so they never take the write lock; this runs
+        every SMART_EXPIRY_SWEEP_SECONDS instead (see main), and a member
+        can outlive its rule by up to that long.
+
+        Returns:
+            Number of memberships removed
+        """
+        removed = 0
+        with get_db() as (conn, cursor):
+            for smart_id, rules in self._load_smart_playlists(cursor):
+                if not rules.added_within_days:
+                    continue
+                cutoff = datetime.now() - timedelta(days=rules.added_within_days)
+                cursor.execute(
+                    """DELETE FROM playlist_tracks
+                       WHERE playlist_id = ?
+                         AND EXISTS (
+                             SELECT 1 FROM tracks t
+                             WHERE t.id = playlist_tracks.track_id AND t.created_at < ?
+                         )""",
+                    (smart_id, cutoff.isoformat()),
+                )
+                removed += cursor.rowcount
+            conn.commit()
+        return removed
+
+    def sync_smart_playlists(
+        self, cursor, track_ids: List[str], columns: Optional[Set[str]] = None
+    ):
+        """
+        Update smart playlist membership for inserted or updated tracks.
+
+        Registered as a track change listener, so it runs inside the same
+        transaction as the track write. Only the given tracks are evaluated
+        against each playlist's rules: matching tracks are appended, tracks
+        that no longer match are removed.
+        """
+        if columns is not None and not columns & SMART_RULE_COLUMNS:
+            return
+        smart_playlists = self._load_smart_playlists(cursor)
+        if not smart_playlists:
+            return
+
+        now = datetime.now().isoformat()
+        rule_clauses = [
+            (smart_id, *build_smart_where_clause(rules))
+            for smart_id, rules in smart_playlists
+        ]
+        # Leave room for the rule parameters next to the ID list
+        for batch in chunked(track_ids, SQLITE_MAX_VARIABLES - 32):
+            placeholders = ",".join("?" * len(batch))
+            for smart_id, where_clause, params in rule_clauses:
+                cursor.execute(
+                    f"""
+                    DELETE FROM playlist_tracks
+                    WHERE playlist_id = ? AND track_id IN ({placeholders})
+                      AND NOT EXISTS (
+                          SELECT 1 FROM tracks
+                          WHERE tracks.id = playlist_tracks.track_id AND {where_clause}
+                      )
+                """,
+                    [smart_id] + batch + params,
+                )
+                cursor.execute(
+                    f"""
+                    INSERT OR IGNORE INTO playlist_tracks (playlist_id, track_id, position, added_at)
+                    SELECT ?,
+                           id,
+                           (SELECT COALESCE(MAX(position), 0)
+                            FROM playlist_tracks WHERE playlist_id = ?)
+                               + ROW_NUMBER() OVER (ORDER BY created_at, id) * ?,
+                           ?
+                    FROM tracks
+                    WHERE id IN ({placeholders}) AND {where_clause}
+                      AND NOT EXISTS (
+                          SELECT 1 FROM playlist_tracks pt
+                          WHERE pt.playlist_id = ? AND pt.track_id = tracks.id
+                      )
+                """,
+                    [smart_id, smart_id, POSITION_GAP, now]
+                    + batch
+                    + params
+                    + [smart_id],
+                )
+
 
 # Global storage instance
 playlist_storage = PlaylistStorage()
+
+# Keep smart playlists in step with track inserts and updates
+storage.add_change_listener(playlist_storage.sync_smart_playlists)
@@ -3,21 +3,248 @@ Storage module for managing tracks in the library.
 Uses SQLite database for persistent storage.
 """
 
+import math
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
-from core.database import get_db
-from models import Track, TrackCreate
-
+from core.database import SQLITE_MAX_VARIABLES, chunked, get_db
+from models import Track, TrackCreate, TrackFilter, TrackFilterParams
+from utils.camelot import compatible_codes, parse_camelot, to_camelot
 
 # SQL query constants
 SELECT_TRACK_BY_ID = "SELECT * FROM tracks WHERE id = ?"
 
+# Track fields in declaration order, used to build models from trusted rows
+TRACK_FIELDS = tuple(Track.model_fields)
+
+# Ranking of compatible tracks (lower is better), on the same scale as the
+# set-ordering defaults: one Camelot step costs as much as 5% of tempo
+COMPATIBLE_KEY_STEP_SCORE = 1.0
+COMPATIBLE_BPM_PERCENT_SCORE = 0.2
+COMPATIBLE_HALF_DOUBLE_SCORE = 0.5
+
+# A compatible track: (track, key distance, BPM difference %, half/double time, score)
+CompatibleMatch = Tuple[Track, int, float, bool, float]
+
+
+def _to_datetime(value):
+    """Parse an ISO timestamp column, keeping NULL as None."""
+    return datetime.fromisoformat(value) if value else None
+
+
+def _to_bool(value):
+    """Convert an integer flag column to bool, keeping NULL as None."""
+    return bool(value) if value is not None else None
+
+
+def _check_score(value):
+    """Pass a 0-1 score column through, rejecting values outside its bounds."""
+    if value is not None and not 0 <= value <= 1:
+        raise ValueError(f"Score out of range: {value}")
+    return value
+
+
+# Column converters for the trusted-row fast path. Columns not listed here are
+# stored in SQLite with the same Python type the Track field expects and have
+# no constraints beyond it; a field that gains one needs a converter here.
+TRACK_COLUMN_CONVERTERS = {
+    "id": lambda value: UUID(value) if value else None,
+    "created_at": _to_datetime,
+    "updated_at": _to_datetime,
+    "last_played": _to_datetime,
+    "metadata_complete": _to_bool,
+    "missing": _to_bool,
+    "missing_since": _to_datetime,
+    "energy": _check_score,
+    "danceability": _check_score,
+}
+
+
+def resolve_track_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated `fields` parameter into track column names.
+
+    Returns None when every field is requested. The id column is always
+    included so clients can address the returned tracks.
+
+    Raises:
+        ValueError: If a requested field is not a Track field
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in TRACK_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown track field(s): {', '.join(unknown)}")
+    columns = ["id"] + [name for name in requested if name != "id"]
+    return list(dict.fromkeys(columns))
+
+
+def track_columns_sql(columns: Optional[List[str]], table_alias: str = "") -> str:
+    """Build the SELECT column list for a track projection."""
+    prefix = f"{table_alias}." if table_alias else ""
+    if not columns:
+        return f"{prefix}*"
+    return ", ".join(f"{prefix}{column}" for column in columns)
+
+
+def _with_camelot(values: dict) -> dict:
+    """Add the Camelot code derived from `key` to a column patch."""
+    if "key" in values:
+        return {**values, "camelot": to_camelot(values["key"])}
+    return values
+
+
+def _tempo_windows(
+    bpm: int, tolerance: float, half_double: bool
+) -> List[Tuple[float, float, int, int]]:
+    """
+    BPM ranges matching a tempo within `tolerance` percent.
+
+    Returns (factor, target BPM, low, high) per window, for the tempo and
+    optionally half/double it. Wide tolerances make neighbouring windows
+    overlap; they are split where the tempos are equally far apart (in
+    ratio), so each track is ranked once.
+    """
+    factors = (0.5, 1.0, 2.0) if half_double else (1.0,)
+    windows = []
+    for factor in factors:
+        target = bpm * factor
+        low = math.ceil(target * (1 - tolerance / 100))
+        high = math.floor(target * (1 + tolerance / 100))
+        if windows and windows[-1][3] >= low:
+            previous = windows[-1]
+            boundary = math.floor(math.sqrt(previous[1] * target))
+            windows[-1] = (
+                previous[0],
+                previous[1],
+                previous[2],
+                min(previous[3], boundary),
+            )
+            low = max(low, boundary + 1)
+        windows.append((factor, target, low, high))
+    return [window for window in windows if window[2] <= window[3]]
+
+
+# Called with (cursor, track IDs, updated columns or None for inserts)
+TrackChangeListener = Callable[[Any, List[str], Optional[Set[str]]], None]
+
+
+def build_track_where_clause(query_params: TrackFilter) -> Tuple[str, List]:
+    """Build the WHERE clause and its parameters from track filters."""
+    where_conditions = []
+    params = []
+
+    if query_params.search:
+        where_conditions.append("(title LIKE ? OR artist LIKE ? OR album LIKE ?)")
+        search_param = f"%{query_params.search}%"
+        params.extend([search_param, search_param, search_param])
+
+    if query_params.genre:
+        where_conditions.append("genre = ?")
+        params.append(query_params.genre)
+
+    if query_params.mood:
+        where_conditions.append("mood = ?")
+        params.append(query_params.mood)
+
+    if query_params.bpm_min > 0:
+        where_conditions.append("bpm >= ?")
+        params.append(query_params.bpm_min)
+
+    if query_params.bpm_max > 0:
+        where_conditions.append("bpm <= ?")
+        params.append(query_params.bpm_max)
+
+    if query_params.key:
+        where_conditions.append("key = ?")
+        params.append(query_params.key)
+
+    if query_params.artist:
+        where_conditions.append("artist = ?")
+        params.append(query_params.artist)
+
+    if query_params.year_min > 0:
+        where_conditions.append("year >= ?")
+        params.append(query_params.year_min)
+
+    if query_params.year_max > 0:
+        where_conditions.append("year <= ?")
+        params.append(query_params.year_max)
+
+    # Unanalyzed tracks (NULL) never match a loudness or energy bound
+    for column, low, high in (
+        ("loudness_lufs", query_params.loudness_min, query_params.loudness_max),
+        ("energy", query_params.energy_min, query_params.energy_max),
+        ("danceability", query_params.danceability_min, query_params.danceability_max),
+    ):
+        if low is not None:
+            where_conditions.append(f"{column} >= ?")
+            params.append(low)
+        if high is not None:
+            where_conditions.append(f"{column} <= ?")
+            params.append(high)
+
+    if query_params.missing is not None:
+        # A literal, so the partial index on missing tracks can be used
+        where_conditions.append(
+            "missing = 1" if query_params.missing else "missing = 0"
+        )
+
+    where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
+    return where_clause, params
+
+
+def build_track_order_clause(query_params: TrackFilterParams) -> str:
+    """Build the ORDER BY clause, validating the sort column."""
+    valid_sort_columns = [
+        "title",
+        "artist",
+        "bpm",
+        "key",
+        "year",
+        "created_at",
+        "missing_since",
+        "loudness_lufs",
+        "replay_gain_db",
+        "peak_dbfs",
+        "energy",
+        "danceability",
+    ]
+    sort_by = query_params.sort_by
+    if sort_by not in valid_sort_columns:
+        sort_by = "title"
+
+    sort_direction = "DESC" if query_params.sort_order.lower() == "desc" else "ASC"
+    return f"ORDER BY {sort_by} {sort_direction}"
+
 
 class TrackStorage:
     """Database-backed storage for tracks."""
 
+    def __init__(self):
+        self._change_listeners: List[TrackChangeListener] = []
+
+    def add_change_listener(self, listener: TrackChangeListener):
+        """
+        Register a callback run inside the transaction of every track insert
+        or update, before it commits.
+
+        Listeners receive the cursor, the affected track IDs and the set of
+        updated columns (None for inserts).
+        """
+        self._change_listeners.append(listener)
+
+    def _notify_changed(
+        self, cursor, track_ids: List[str], columns: Optional[Set[str]] = None
+    ):
+        """Run change listeners for inserted or updated tracks."""
+        if not track_ids:
+            return
+        for listener in self._change_listeners:
+            listener(cursor, track_ids, columns)
+
     @staticmethod
     def row_to_track(row) -> Track:
         """Convert a database row to a Track object."""
@@ -30,6 +257,46 @@ class TrackStorage:
             row_dict["metadata_complete"] = bool(row_dict["metadata_complete"])
         return Track(**row_dict)
 
+    @classmethod
+    def rows_to_tracks(cls, rows: Iterable) -> List[Track]:
+        """
+        Convert rows read from the tracks table to Track objects without
+        running pydantic validation on each row.
+
+        The column layout is resolved once from the first row, and every row is
+        then built with a handful of type conversions. Only the columns in
+        TRACK_COLUMN_CONVERTERS are converted or range-checked; every other
+        value is used as stored. Rows that fail conversion fall back to the
+        validating row_to_track.
+        """
+        tracks = []
+        columns = None
+        # Copying a constructed track skips model_construct's per-field
+        # default handling, which costs more than validating the row
+        template = Track.model_construct(_fields_set=set())
+        for row in rows:
+            if columns is None:
+                columns = row.keys()
+                # Joined or computed columns need the validating path
+                trusted = set(columns) <= set(TRACK_FIELDS)
+                converters = [
+                    (name, TRACK_COLUMN_CONVERTERS[name])
+                    for name in columns
+                    if name in TRACK_COLUMN_CONVERTERS
+                ]
+            if not trusted:
+                tracks.append(cls.row_to_track(row))
+                continue
+            values = dict(zip(columns, row))
+            try:
+                for name, convert in converters:
+                    values[name] = convert(values[name])
+            except (TypeError, ValueError):
+                tracks.append(cls.row_to_track(row))
+                continue
+            tracks.append(template.model_copy(update=values))
+        return tracks
+
     def create_track(
         self, track_data: TrackCreate, file_props: Optional[dict] = None
     ) -> Track:
@@ -52,8 +319,8 @@ class TrackStorage:
                 """INSERT INTO tracks 
                    (id, file_path, title, artist, album, year, genre, mood, bpm, key, 
                     file_size_bytes, file_format, duration_seconds, bitrate_bps, sample_rate_hz, 
-                    created_at, updated_at, play_count) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    created_at, updated_at, play_count, camelot, content_hash, artwork_hash) 
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (
                     str(track_id),
                     track_data.file_path,
@@ -73,8 +340,12 @@ class TrackStorage:
                     now.isoformat(),
                     now.isoformat(),
                     0,
+                    to_camelot(track_data.key),
+                    file_props.get("content_hash"),
+                    file_props.get("artwork_hash"),
                 ),
             )
+            self._notify_changed(cursor, [str(track_id)])
             conn.commit()
 
             # Fetch the created track
@@ -85,6 +356,88 @@ class TrackStorage:
             else:
                 raise RuntimeError("Failed to create track")
 
+    def create_tracks(
+        self, tracks_data: List[Tuple[TrackCreate, Optional[dict]]]
+    ) -> Tuple[List[UUID], int]:
+        """
+        Create many tracks in a single transaction.
+
+        Tracks whose file path already exists are left untouched, like
+        create_track. The returned IDs line up with `tracks_data`, so
+        duplicates resolve to the ID of the existing track.
+
+        Returns:
+            Tuple of (track ID for each input, number of tracks created)
+        """
+        if not tracks_data:
+            return [], 0
+
+        now = datetime.now().isoformat()
+        rows = []
+        for track_data, file_props in tracks_data:
+            file_props = file_props or {}
+            rows.append(
+                (
+                    str(uuid4()),
+                    track_data.file_path,
+                    track_data.title,
+                    track_data.artist,
+                    track_data.album,
+                    track_data.year,
+                    track_data.genre,
+                    track_data.mood,
+                    track_data.bpm,
+                    track_data.key,
+                    file_props.get("file_size_bytes"),
+                    file_props.get("file_format"),
+                    file_props.get("duration_seconds"),
+                    file_props.get("bitrate_bps"),
+                    file_props.get("sample_rate_hz"),
+                    now,
+                    now,
+                    0,
+                    to_camelot(track_data.key),
+                    file_props.get("content_hash"),
+                    file_props.get("artwork_hash"),
+                )
+            )
+
+        paths = list(
+            dict.fromkeys(track_data.file_path for track_data, _ in tracks_data)
+        )
+        ids_by_path = {}
+        with get_db() as (conn, cursor):
+            cursor.executemany(
+                """INSERT OR IGNORE INTO tracks
+                   (id, file_path, title, artist, album, year, genre, mood, bpm, key,
+                    file_size_bytes, file_format, duration_seconds, bitrate_bps, sample_rate_hz,
+                    created_at, updated_at, play_count, camelot, content_hash, artwork_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                rows,
+            )
+            created_count = cursor.rowcount
+            for batch in chunked(paths):
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(
+                    f"SELECT id, file_path FROM tracks WHERE file_path IN ({placeholders})",
+                    batch,
+                )
+                ids_by_path.update((row[1], UUID(row[0])) for row in cursor.fetchall())
+            if created_count:
+                created_ids = {row[0] for row in rows}
+                self._notify_changed(
+                    cursor,
+                    [
+                        str(tid)
+                        for tid in ids_by_path.values()
+                        if str(tid) in created_ids
+                    ],
+                )
+            conn.commit()
+
+        track_ids = [ids_by_path[track_data.file_path] for track_data, _ in tracks_data]
+        return track_ids, created_count
+
     def get_track_by_path(self, file_path: str) -> Optional[Track]:
         """Get a track by its file path."""
         with get_db() as (_, cursor):
@@ -94,6 +447,15 @@ class TrackStorage:
                 return self.row_to_track(result)
             return None
 
+    def get_tracks_by_content_hash(self, content_hash: str) -> List[Track]:
+        """Get the tracks whose file had this partial content hash, oldest first."""
+        with get_db() as (_, cursor):
+            cursor.execute(
+                "SELECT * FROM tracks WHERE content_hash = ? ORDER BY created_at",
+                (content_hash,),
+            )
+            return self.rows_to_tracks(cursor.fetchall())
+
     def track_exists(self, file_path: str) -> bool:
         """Check if a track with the given path exists."""
         with get_db() as (_, cursor):
@@ -107,8 +469,7 @@ class TrackStorage:
         """Get all tracks."""
         with get_db() as (_, cursor):
             cursor.execute("SELECT * FROM tracks")
-            results = cursor.fetchall()
-            return [self.row_to_track(row) for row in results]
+            return self.rows_to_tracks(cursor.fetchall())
 
     def get_track_by_id(self, track_id: UUID) -> Optional[Track]:
         """Get a track by its ID."""
@@ -119,6 +480,175 @@ class TrackStorage:
                 return self.row_to_track(result)
             return None
 
+    def get_tracks_by_ids(
+        self, track_ids: List[UUID], columns: Optional[List[str]] = None
+    ) -> List[Track]:
+        """Get the tracks with the given IDs (missing IDs are ignored)."""
+        tracks = []
+        select_columns = track_columns_sql(columns)
+        with get_db() as (_, cursor):
+            for batch in chunked([str(tid) for tid in track_ids]):
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(
+                    f"SELECT {select_columns} FROM tracks WHERE id IN ({placeholders})",
+                    batch,
+                )
+                tracks.extend(self.rows_to_tracks(cursor.fetchall()))
+        return tracks
+
+    def get_track_ids_matching(self, where_clause: str, params: List) -> List[UUID]:
+        """Get the IDs of all tracks matching a WHERE clause."""
+        with get_db() as (_, cursor):
+            cursor.execute(f"SELECT id FROM tracks WHERE {where_clause}", params)
+            return [UUID(row[0]) for row in cursor.fetchall()]
+
+    def find_compatible_tracks(
+        self,
+        track: Track,
+        bpm_tolerance: float,
+        half_double: bool = True,
+        limit: int = 50,
+        columns: Optional[List[str]] = None,
+    ) -> List[CompatibleMatch]:
+        """
+        Find tracks that mix harmonically with `track`, best match first.
+
+        Candidates are in a compatible Camelot key (same, one step either way
+        or the relative major/minor) and within `bpm_tolerance` percent of
+        the tempo, or of half/double the tempo. Each key and tempo window is
+        a range scan of the (camelot, bpm) index, and SQLite ranks the
+        candidates so only the returned tracks reach Python.
+
+        Raises:
+            ValueError: If the track has no recognised key or no BPM
+        """
+        code = parse_camelot(track.camelot or track.key)
+        if code is None:
+            raise ValueError(f"Track {track.id} has no recognised key")
+        if not track.bpm:
+            raise ValueError(f"Track {track.id} has no BPM")
+
+        codes = [camelot for camelot, _ in compatible_codes(code)]
+        windows = _tempo_windows(track.bpm, bpm_tolerance, half_double)
+        placeholders = ",".join("?" * len(codes))
+        selects = []
+        # Score weights come first in the query text, then each window
+        params = [
+            COMPATIBLE_KEY_STEP_SCORE,
+            COMPATIBLE_BPM_PERCENT_SCORE,
+            COMPATIBLE_HALF_DOUBLE_SCORE,
+        ]
+        for factor, target, low, high in windows:
+            selects.append(f"""SELECT id, camelot != ? AS key_distance,
+                        abs(bpm / ? - 1) * 100 AS difference, ? AS half_double
+                    FROM tracks
+                    WHERE camelot IN ({placeholders}) AND bpm BETWEEN ? AND ?""")
+            params.extend([codes[0], target, factor != 1.0, *codes, low, high])
+        query = f"""
+            SELECT id, key_distance, difference, half_double,
+                key_distance * ? + difference * ? + half_double * ? AS score
+            FROM ({" UNION ALL ".join(selects)})
+            WHERE id != ?
+            ORDER BY score, id
+            LIMIT ?
+        """
+        params.extend([str(track.id), limit])
+
+        with get_db() as (_, cursor):
+            cursor.execute(query, params)
+            ranked = cursor.fetchall()
+            if not ranked:
+                return []
+            ids = [row[0] for row in ranked]
+            placeholders = ",".join("?" * len(ids))
+            cursor.execute(
+                f"SELECT {track_columns_sql(columns)} FROM tracks WHERE id IN ({placeholders})",
+                ids,
+            )
+            tracks_by_id = {
+                str(found.id): found for found in self.rows_to_tracks(cursor.fetchall())
+            }
+
+        return [
+            (
+                tracks_by_id[track_id],
+                key_distance,
+                round(difference, 2),
+                bool(half_double_time),
+                round(score, 3),
+            )
+            for track_id, key_distance, difference, half_double_time, score in ranked
+            if track_id in tracks_by_id
+        ]
+
+    def bulk_update_tracks(self, patches: List[Tuple[UUID, dict]]) -> int:
+        """
+        Apply per-track patches in a single transaction.
+
+        Patches that set the same columns are grouped and written with one
+        executemany per group. None values are ignored, like update_track.
+
+        Returns:
+            Number of tracks updated
+        """
+        groups = {}
+        now = datetime.now().isoformat()
+        for track_id, track_update in patches:
+            values = _with_camelot(
+                {k: v for k, v in track_update.items() if v is not None}
+            )
+            if not values:
+                continue
+            columns = tuple(sorted(values))
+            groups.setdefault(columns, []).append(
+                [values[column] for column in columns] + [now, str(track_id)]
+            )
+
+        if not groups:
+            return 0
+
+        updated_count = 0
+        with get_db() as (conn, cursor):
+            for columns, rows in groups.items():
+                set_clause = ", ".join(f"{column} = ?" for column in columns)
+                cursor.executemany(
+                    f"UPDATE tracks SET {set_clause}, updated_at = ? WHERE id = ?",
+                    rows,
+                )
+                updated_count += cursor.rowcount
+                self._notify_changed(cursor, [row[-1] for row in rows], set(columns))
+            conn.commit()
+        return updated_count
+
+    def update_tracks_matching(
+        self, track_update: dict, where_clause: str, params: List
+    ) -> int:
+        """
+        Apply one patch to every track matching a WHERE clause.
+
+        Returns:
+            Number of tracks updated
+        """
+        values = _with_camelot({k: v for k, v in track_update.items() if v is not None})
+        if not values:
+            return 0
+
+        set_clause = ", ".join(f"{column} = ?" for column in values)
+        with get_db() as (conn, cursor):
+            if self._change_listeners:
+                # The patch may change which tracks match, so collect IDs first
+                cursor.execute(f"SELECT id FROM tracks WHERE {where_clause}", params)
+                track_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                f"UPDATE tracks SET {set_clause}, updated_at = ? WHERE {where_clause}",
+                list(values.values()) + [datetime.now().isoformat()] + list(params),
+            )
+            updated_count = cursor.rowcount
+            if self._change_listeners:
+                self._notify_changed(cursor, track_ids, set(values))
+            conn.commit()
+            return updated_count
+
     def update_track(self, track_id: UUID, track_update: dict) -> Optional[Track]:
         """Update a track's metadata."""
         with get_db() as (conn, cursor):
@@ -129,13 +659,11 @@ class TrackStorage:
                 return None
 
             # Build UPDATE query dynamically based on provided fields
-            update_fields = []
-            update_values = []
-
-            for key, value in track_update.items():
-                if value is not None:
-                    update_fields.append(f"{key} = ?")
-                    update_values.append(value)
+            values = _with_camelot(
+                {key: value for key, value in track_update.items() if value is not None}
+            )
+            update_fields = [f"{key} = ?" for key in values]
+            update_values = list(values.values())
 
             if not update_fields:
                 # No fields to update, return existing track
@@ -151,6 +679,7 @@ class TrackStorage:
             # Execute UPDATE
             update_query = f"UPDATE tracks SET {', '.join(update_fields)} WHERE id = ?"
             cursor.execute(update_query, update_values)
+            self._notify_changed(cursor, [str(track_id)], set(values))
             conn.commit()
 
             # Fetch updated track
@@ -160,6 +689,50 @@ class TrackStorage:
                 return self.row_to_track(result)
             return None
 
+    def get_track_paths(self) -> List[Tuple[str, str, bool]]:
+        """Get (track ID, file path, missing flag) for every track with a path."""
+        with get_db() as (_, cursor):
+            cursor.execute(
+                "SELECT id, file_path, missing FROM tracks WHERE file_path IS NOT NULL"
+            )
+            return [(row[0], row[1], bool(row[2])) for row in cursor.fetchall()]
+
+    def set_tracks_missing(self, track_ids: List[str], missing: bool) -> int:
+        """
+        Flag tracks as missing, or clear the flag, in a single transaction.
+
+        Tracks already in the requested state are left untouched, so
+        missing_since keeps the time the file was first found missing.
+
+        Returns:
+            Number of tracks whose state changed
+        """
+        if not track_ids:
+            return 0
+        now = datetime.now().isoformat()
+        changed = []
+        with get_db() as (conn, cursor):
+            for batch in chunked(track_ids, SQLITE_MAX_VARIABLES - 2):
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(
+                    f"""SELECT id FROM tracks
+                        WHERE id IN ({placeholders}) AND COALESCE(missing, 0) != ?""",
+                    [*batch, int(missing)],
+                )
+                ids = [row[0] for row in cursor.fetchall()]
+                if not ids:
+                    continue
+                placeholders = ",".join("?" * len(ids))
+                cursor.execute(
+                    f"""UPDATE tracks SET missing = ?, missing_since = ?
+                        WHERE id IN ({placeholders})""",
+                    [int(missing), now if missing else None, *ids],
+                )
+                changed.extend(ids)
+            self._notify_changed(cursor, changed, {"missing", "missing_since"})
+            conn.commit()
+        return len(changed)
+
     def delete_track(self, track_id: UUID) -> bool:
         """Delete a track."""
         with get_db() as (conn, cursor):
@@ -174,6 +747,24 @@ class TrackStorage:
             conn.commit()
             return True
 
+    def delete_tracks(self, track_ids: List[UUID]) -> int:
+        """
+        Delete many tracks in a single transaction.
+
+        Returns:
+            Number of tracks deleted (unknown IDs are ignored)
+        """
+        deleted_count = 0
+        with get_db() as (conn, cursor):
+            for batch in chunked([str(tid) for tid in track_ids]):
+                placeholders = ",".join("?" * len(batch))
+                cursor.execute(
+                    f"DELETE FROM tracks WHERE id IN ({placeholders})", batch
+                )
+                deleted_count += cursor.rowcount
+            conn.commit()
+        return deleted_count
+
 
 # Global storage instance
 storage = TrackStorage()
@@ -0,0 +1,60 @@
+"""
+Shared fixtures: every test that touches storage gets an empty temporary
+database (the same one the benchmarks use) and seeds only the rows it needs.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.common import temporary_database
+from core.database import get_db
+from main import app
+from utils.camelot import to_camelot
+
+
+@pytest.fixture
+def database():
+    """Path of an empty, initialized database the application points at."""
+    with temporary_database() as path:
+        yield path
+
+
+@pytest.fixture
+def client(database):
+    """API client against the temporary database."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def add_track(database):
+    """
+    Insert one track row and return its ID as a string.
+
+    Unset columns keep their table defaults, apart from a unique file path
+    and the camelot code, which is derived from `key` as storage does.
+    """
+
+    def add(**columns) -> str:
+        now = datetime.now().isoformat()
+        row = {
+            "id": str(uuid4()),
+            "file_path": f"/music/{uuid4()}.mp3",
+            "created_at": now,
+            "updated_at": now,
+            **columns,
+        }
+        if row.get("key") and "camelot" not in row:
+            row["camelot"] = to_camelot(row["key"])
+        with get_db() as (_, cursor):
+            cursor.execute(
+                f"INSERT INTO tracks ({', '.join(row)}) "
+                f"VALUES ({', '.join('?' for _ in row)})",
+                list(row.values()),
+            )
+        return row["id"]
+
+    return add
@@ -0,0 +1,72 @@
+"""Tests for artwork storage and the artwork endpoint."""
+
+from io import BytesIO
+
+import pytest
+
+from storage.artwork_storage import ARTWORK_SIZES, ArtworkStorage, image_extension
+
+# Thumbnails need the optional Pillow dependency
+Image = pytest.importorskip("PIL.Image")
+
+
+def png(width=800, height=600, color=(200, 30, 30)) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def artwork(tmp_path, monkeypatch):
+    """Artwork storage under tmp_path, also used by the API."""
+    store = ArtworkStorage(str(tmp_path / "artwork"))
+    monkeypatch.setattr("routers.tracks.artwork_storage", store)
+    return store
+
+
+def test_image_types_are_recognised():
+    assert image_extension(png()) == "png"
+    assert image_extension(b"\xff\xd8\xff\xe0rest") == "jpg"
+    assert image_extension(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert image_extension(b"not an image") is None
+
+
+def test_images_are_stored_once_with_thumbnails(artwork):
+    image = png()
+
+    artwork_hash = artwork.save(image)
+
+    assert artwork.save(image) == artwork_hash
+    assert artwork.get_path(artwork_hash).read_bytes() == image
+    for size in ARTWORK_SIZES:
+        with Image.open(artwork.get_path(artwork_hash, size)) as thumbnail:
+            assert (thumbnail.format, max(thumbnail.size)) == ("JPEG", size)
+    with pytest.raises(ValueError):
+        artwork.get_path(artwork_hash, 100)
+
+
+def test_unreadable_images_are_not_stored(artwork):
+    assert artwork.save(None) is None
+    assert artwork.save(b"\x89PNG\r\n\x1a\nbroken") is None
+    assert not any(artwork.root.rglob("*.png"))
+
+
+def test_artwork_endpoint(client, add_track, artwork):
+    artwork_hash = artwork.save(png())
+    track_id = add_track(artwork_hash=artwork_hash)
+
+    original = client.get(f"/tracks/{track_id}/artwork")
+    thumbnail = client.get(f"/tracks/{track_id}/artwork?size=64")
+
+    assert original.status_code == 200
+    assert original.headers["content-type"] == "image/png"
+    assert original.headers["cache-control"] == "public, max-age=604800"
+    assert thumbnail.headers["content-type"] == "image/jpeg"
+    assert thumbnail.headers["etag"] != original.headers["etag"]
+    revalidated = client.get(
+        f"/tracks/{track_id}/artwork?size=64",
+        headers={"If-None-Match": thumbnail.headers["etag"]},
+    )
+    assert (revalidated.status_code, revalidated.content) == (304, b"")
+    assert client.get(f"/tracks/{track_id}/artwork?size=100").status_code == 400
+    assert client.get(f"/tracks/{add_track()}/artwork").status_code == 404
@@ -0,0 +1,91 @@
+"""Tests for audio streaming and conditional GET handling."""
+
+from email.utils import formatdate
+
+import pytest
+
+from utils.http_cache import etag_matches, is_not_modified
+
+MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"x", "abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+    ],
+)
+def test_etag_matching(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_if_modified_since_is_only_used_without_if_none_match():
+    later = "Thu, 02 Jan 2025 00:00:00 GMT"
+
+    assert is_not_modified(None, later, '"a"', MODIFIED)
+    assert is_not_modified(None, MODIFIED, '"a"', MODIFIED)
+    assert not is_not_modified(None, "Tue, 31 Dec 2024 00:00:00 GMT", '"a"', MODIFIED)
+    assert not is_not_modified('"b"', later, '"a"', MODIFIED)
+    assert not is_not_modified(None, "yesterday", '"a"', MODIFIED)
+    assert not is_not_modified(None, None, '"a"', MODIFIED)
+
+
+@pytest.fixture
+def audio_track(add_track, tmp_path):
+    """A track whose file holds 10,000 known bytes."""
+    path = tmp_path / "track.mp3"
+    path.write_bytes(bytes(range(256)) * 39 + bytes(16))
+    return add_track(file_path=str(path)), path.read_bytes()
+
+
+def test_audio_is_streamed_whole_or_by_range(client, audio_track):
+    track_id, content = audio_track
+
+    response = client.get(f"/tracks/{track_id}/audio")
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"].startswith("inline")
+
+    partial = client.get(
+        f"/tracks/{track_id}/audio", headers={"Range": "bytes=1000-1999"}
+    )
+    assert partial.status_code == 206
+    assert partial.content == content[1000:2000]
+    assert partial.headers["content-range"] == "bytes 1000-1999/10000"
+
+
+def test_audio_revalidation(client, audio_track):
+    track_id, _ = audio_track
+    headers = client.get(f"/tracks/{track_id}/audio").headers
+
+    by_etag = client.get(
+        f"/tracks/{track_id}/audio", headers={"If-None-Match": headers["etag"]}
+    )
+    by_date = client.get(
+        f"/tracks/{track_id}/audio",
+        headers={"If-Modified-Since": headers["last-modified"]},
+    )
+    stale = client.get(
+        f"/tracks/{track_id}/audio",
+        headers={"If-Modified-Since": formatdate(0, usegmt=True)},
+    )
+
+    assert (by_etag.status_code, by_etag.content) == (304, b"")
+    assert by_etag.headers["etag"] == headers["etag"]
+    assert by_date.status_code == 304
+    assert stale.status_code == 200
+
+
+def test_missing_audio(client, add_track, tmp_path):
+    assert (
+        client.get(f"/tracks/{add_track(file_path=str(tmp_path))}/audio").status_code
+        == 404
+    )
+    gone = add_track(file_path=str(tmp_path / "gone.mp3"))
+    assert client.get(f"/tracks/{gone}/audio").status_code == 404
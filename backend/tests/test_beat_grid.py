@@ -0,0 +1,71 @@
+"""Tests for beat grid encoding and the beat-grid endpoint."""
+
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from services.beat_grid import (
+    BPM_SCALE,
+    HEADER_SIZE,
+    beat_grid_bpm,
+    build_beat_grid,
+    decode_beat_grid,
+    encode_beat_grid,
+    estimate_bpm,
+    estimate_downbeat_phase,
+)
+from storage.feature_storage import beat_grid_storage
+
+
+def beats(bpm=124.5, count=64, offset=0.35, jitter=0.0, seed=0):
+    times = offset + np.arange(count) * 60 / bpm
+    return times + np.random.default_rng(seed).uniform(-jitter, jitter, count)
+
+
+def test_fractional_tempo_survives_jitter():
+    assert estimate_bpm(beats(jitter=0.01)) == pytest.approx(124.5, abs=0.05)
+
+
+def test_downbeat_is_the_strongest_bar_position():
+    strengths = np.tile([1.0, 0.2, 3.0, 0.5], 8)[:-1]
+
+    assert estimate_downbeat_phase(strengths) == 2
+
+
+def test_grid_round_trips():
+    grid = build_beat_grid(beats(), np.tile([0.5, 2.0, 0.5, 0.5], 16))
+
+    decoded = decode_beat_grid(grid)
+
+    assert grid.dtype == np.int32
+    assert grid.size == HEADER_SIZE + 64 + 16
+    assert decoded["bpm"] == beat_grid_bpm(grid) == pytest.approx(124.5, abs=1e-3)
+    assert decoded["first_beat_ms"] == 350
+    assert decoded["beat_times_ms"] == np.round(beats() * 1000).astype(int).tolist()
+    assert decoded["downbeat_times_ms"] == decoded["beat_times_ms"][1::4]
+
+
+def test_too_few_beats_give_no_grid():
+    assert build_beat_grid(beats(count=7), np.ones(7)) is None
+
+
+def test_truncated_grids_are_rejected():
+    grid = encode_beat_grid(120.0, np.array([500, 1000]), np.array([0]))
+
+    assert grid[0] == 120 * BPM_SCALE
+    for truncated in (grid[:2], grid[:-1]):
+        with pytest.raises(ValueError):
+            decode_beat_grid(truncated)
+
+
+def test_beat_grid_endpoint(client, add_track):
+    track_id = add_track()
+    beat_grid_storage.save([(UUID(track_id), build_beat_grid(beats(), np.ones(64)))])
+
+    body = client.get(f"/tracks/{track_id}/beat-grid").json()
+
+    assert body["track_id"] == track_id
+    assert body["bpm"] == pytest.approx(124.5, abs=1e-3)
+    assert len(body["beat_times_ms"]) == 64
+    assert client.get(f"/tracks/{add_track()}/beat-grid").status_code == 400
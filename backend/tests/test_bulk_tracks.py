@@ -0,0 +1,160 @@
+"""Tests for the bulk track endpoints."""
+
+import pytest
+
+from benchmarks.common import seed_tracks
+from core.database import SQLITE_MAX_VARIABLES
+
+from storage.track_storage import storage
+
+UNKNOWN_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def get_track(track_id):
+    return storage.get_track_by_id(track_id)
+
+
+def test_per_track_updates_apply_only_set_fields(client, add_track):
+    first = add_track(genre="House", bpm=120)
+    second = add_track(genre="Techno", bpm=130)
+
+    response = client.post(
+        "/tracks/bulk/update",
+        json={
+            "updates": [
+                {"track_id": first, "mood": "dark"},
+                {"track_id": second, "bpm": 135},
+                {"track_id": UNKNOWN_ID, "bpm": 1},
+            ],
+            "return_tracks": True,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["updated_count"] == 2
+    assert {track["id"] for track in response.json()["tracks"]} == {first, second}
+    assert (get_track(first).mood, get_track(first).bpm) == ("dark", 120)
+    assert (get_track(second).genre, get_track(second).bpm) == ("Techno", 135)
+
+
+def test_patch_applies_to_listed_ids(client, add_track):
+    listed = add_track(genre="House")
+    other = add_track(genre="House")
+
+    response = client.post(
+        "/tracks/bulk/update",
+        json={"track_ids": [listed], "patch": {"genre": "Garage", "bpm": 130}},
+    )
+
+    assert response.json() == {"updated_count": 1, "tracks": None}
+    assert (get_track(listed).genre, get_track(listed).bpm) == ("Garage", 130)
+    assert get_track(other).genre == "House"
+
+
+@pytest.mark.parametrize("return_tracks", [False, True])
+def test_patch_applies_to_filter_matches(client, add_track, return_tracks):
+    fast = add_track(genre="Techno", bpm=150)
+    add_track(genre="Techno", bpm=120)
+    add_track(genre="House", bpm=150)
+
+    response = client.post(
+        "/tracks/bulk/update",
+        json={
+            "filter": {"genre": "Techno", "bpm_min": 140},
+            "patch": {"mood": "fast"},
+            "return_tracks": return_tracks,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["updated_count"] == 1
+    if return_tracks:
+        assert [track["id"] for track in response.json()["tracks"]] == [fast]
+    assert [t.id for t in storage.get_all_tracks() if t.mood == "fast"] == [
+        get_track(fast).id
+    ]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"patch": {"mood": "x"}},
+        {"filter": {"genre": "Techno"}, "track_ids": [], "patch": {"mood": "x"}},
+        {"updates": [], "track_ids": [], "patch": {"mood": "x"}},
+    ],
+)
+def test_exactly_one_target_is_required(client, body):
+    response = client.post("/tracks/bulk/update", json=body)
+
+    assert response.status_code == 400
+    assert "exactly one" in response.json()["detail"]
+
+
+def test_patch_is_required_with_ids_or_filter(client, add_track):
+    response = client.post("/tracks/bulk/update", json={"track_ids": [add_track()]})
+
+    assert response.status_code == 400
+
+
+def test_patch_cannot_be_combined_with_updates(client, add_track):
+    track_id = add_track(genre="House")
+
+    response = client.post(
+        "/tracks/bulk/update",
+        json={
+            "updates": [{"track_id": track_id, "genre": "Techno"}],
+            "patch": {"genre": "Disco"},
+        },
+    )
+
+    assert response.status_code == 400
+    assert get_track(track_id).genre == "House"
+
+
+def test_bulk_create_skips_existing_paths(client, add_track):
+    existing = add_track(file_path="/music/existing.mp3")
+
+    response = client.post(
+        "/tracks/bulk/create",
+        json={
+            "tracks": [
+                {"file_path": "/music/a.mp3", "title": "A", "key": "Am"},
+                {"file_path": "/music/existing.mp3", "title": "Ignored"},
+                {"file_path": "/music/a.mp3", "title": "Duplicate"},
+            ]
+        },
+    )
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["created_count"], body["skipped_count"]) == (1, 2)
+    assert body["track_ids"][1] == existing
+    assert body["track_ids"][0] == body["track_ids"][2]
+    created = get_track(body["track_ids"][0])
+    assert (created.title, created.camelot) == ("A", "8A")
+    assert get_track(existing).title is None
+
+
+def test_bulk_create_accepts_an_empty_list(client):
+    response = client.post("/tracks/bulk/create", json={"tracks": []})
+
+    assert response.json() == {"track_ids": [], "created_count": 0, "skipped_count": 0}
+
+
+def test_bulk_delete_counts_only_existing_tracks(client, add_track):
+    deleted = [add_track() for _ in range(3)]
+    kept = add_track()
+
+    response = client.post(
+        "/tracks/bulk/delete", json={"track_ids": deleted + [UNKNOWN_ID]}
+    )
+
+    assert response.json() == {"deleted_count": 3}
+    assert [str(track.id) for track in storage.get_all_tracks()] == [kept]
+
+
+def test_bulk_delete_spans_several_statements(database):
+    track_ids = seed_tracks(SQLITE_MAX_VARIABLES + 1)
+
+    assert storage.delete_tracks(track_ids) == len(track_ids)
+    assert storage.get_all_tracks() == []
@@ -0,0 +1,79 @@
+"""Tests for the compatible-track lookup."""
+
+from uuid import UUID
+
+import pytest
+
+from storage.track_storage import storage
+
+
+def lookup(track_id, **kwargs):
+    track = storage.get_track_by_id(UUID(track_id))
+    return storage.find_compatible_tracks(
+        track, kwargs.pop("bpm_tolerance", 3.0), **kwargs
+    )
+
+
+def test_matches_compatible_keys_within_the_tempo_window(add_track):
+    seed = add_track(key="Am", bpm=124)
+    same = add_track(key="Am", bpm=124)
+    step = add_track(key="Em", bpm=125)
+    relative = add_track(key="C", bpm=122)
+    add_track(key="F#m", bpm=124)  # three steps away
+    add_track(key="Am", bpm=140)  # too fast
+    add_track(bpm=124)  # no key
+
+    matches = lookup(seed)
+
+    assert [str(track.id) for track, *_ in matches] == [same, step, relative]
+    assert [(distance, half) for _, distance, _, half, _ in matches] == [
+        (0, False),
+        (1, False),
+        (1, False),
+    ]
+    assert matches[0][4] == 0
+
+
+def test_half_and_double_time_matches(add_track):
+    seed = add_track(key="8A", bpm=140)
+    half = add_track(key="8A", bpm=70)
+    double = add_track(key="8A", bpm=280)
+
+    matches = lookup(seed)
+    assert {str(track.id) for track, *_ in matches} == {half, double}
+    assert all(half_double for _, _, _, half_double, _ in matches)
+
+    assert lookup(seed, half_double=False) == []
+
+
+def test_results_are_ranked_and_limited(add_track):
+    seed = add_track(key="8A", bpm=128)
+    close = add_track(key="8A", bpm=128)
+    further = add_track(key="8A", bpm=130)
+    add_track(key="9A", bpm=128)
+
+    matches = lookup(seed, limit=2)
+
+    assert [str(track.id) for track, *_ in matches] == [close, further]
+    assert matches[1][2] == pytest.approx(1.56, abs=0.01)
+
+
+def test_tracks_without_key_or_bpm_are_rejected(add_track):
+    with pytest.raises(ValueError):
+        lookup(add_track(bpm=120))
+    with pytest.raises(ValueError):
+        lookup(add_track(key="Am"))
+
+
+def test_compatible_endpoint(client, add_track):
+    seed = add_track(key="Am", bpm=124)
+    match = add_track(key="Am", bpm=123, title="Match")
+
+    response = client.get(f"/tracks/{seed}/compatible?fields=title")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["camelot"], body["bpm"]) == ("8A", 124)
+    assert body["data"][0]["track"] == {"id": match, "title": "Match"}
+    assert client.get(f"/tracks/{add_track()}/compatible").status_code == 400
+    assert client.get(f"/tracks/{seed}/compatible?fields=nope").status_code == 400
@@ -0,0 +1,97 @@
+"""Tests for fingerprint-based duplicate detection."""
+
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+from models import DuplicateScanStatus
+from routers.library import process_duplicate_scan
+from services.fingerprint import (
+    FINGERPRINT_FRAMES,
+    bit_error_rate,
+    compute_fingerprint,
+    find_duplicate_pairs,
+    group_duplicates,
+)
+from storage.feature_storage import fingerprint_storage
+from utils.duplicate_progress import duplicate_tracker
+
+SAMPLE_RATE = 8000
+
+
+def recording(seed, seconds=25):
+    """Noise with a changing envelope, a stand-in for music."""
+    rng = np.random.default_rng(seed)
+    envelope = np.repeat(rng.random(seconds * 20), SAMPLE_RATE // 20)
+    return rng.normal(size=SAMPLE_RATE * seconds).astype(np.float32) * envelope
+
+
+@pytest.fixture(scope="module")
+def fingerprints():
+    """Fingerprints of a recording, two copies of it and an unrelated one."""
+    original = recording(1)
+    quieter_and_late = np.r_[
+        np.zeros(1000),
+        0.5 * original + 0.01 * np.random.default_rng(9).normal(size=original.size),
+    ]
+    shorter = 2 * original[: SAMPLE_RATE * 23]
+    return np.vstack(
+        [
+            compute_fingerprint(audio, SAMPLE_RATE)
+            for audio in (original, quieter_and_late, recording(2), shorter)
+        ]
+    )
+
+
+def test_copies_share_most_bits(fingerprints):
+    assert fingerprints.shape == (4, FINGERPRINT_FRAMES)
+    assert bit_error_rate(fingerprints[0], fingerprints[1]) < 0.1
+    assert bit_error_rate(fingerprints[0], fingerprints[2]) > 0.4
+
+
+def test_silent_or_short_audio_has_no_fingerprint():
+    assert compute_fingerprint(np.zeros(SAMPLE_RATE * 30), SAMPLE_RATE) is None
+    assert compute_fingerprint(recording(1, seconds=5), SAMPLE_RATE) is None
+
+
+def test_duplicates_are_grouped(fingerprints):
+    pairs = find_duplicate_pairs(fingerprints)
+
+    assert {(a, b) for a, b, _ in pairs} == {(0, 1), (0, 3), (1, 3)}
+    [(rows, worst)] = group_duplicates(pairs)
+    assert rows == [0, 1, 3]
+    assert worst == max(error_rate for *_, error_rate in pairs)
+
+
+def test_groups_merge_transitively_and_sort_closest_first():
+    groups = group_duplicates([(4, 5, 0.2), (0, 1, 0.1), (1, 2, 0.05)])
+
+    assert groups == [([0, 1, 2], 0.1), ([4, 5], 0.2)]
+    assert find_duplicate_pairs(np.zeros((1, FINGERPRINT_FRAMES), np.uint32)) == []
+
+
+def test_scan_job_reports_stored_duplicates(client, add_track, fingerprints):
+    track_ids = [add_track() for _ in fingerprints]
+    fingerprint_storage.save(zip(map(UUID, track_ids), fingerprints))
+    job_id = uuid4()
+    duplicate_tracker.create_job(job_id)
+
+    process_duplicate_scan(job_id)
+
+    status = duplicate_tracker.get_job_status(job_id)
+    assert (status.status, status.tracks_fingerprinted) == (
+        DuplicateScanStatus.COMPLETED,
+        4,
+    )
+    client.delete(f"/tracks/{track_ids[3]}")
+    report = client.get(f"/library/duplicates/scan/{job_id}/report").json()
+    [group] = report["data"]
+    assert {track["id"] for track in group["tracks"]} == set(track_ids[:2])
+
+
+def test_report_needs_a_completed_scan(client):
+    job_id = uuid4()
+    assert client.get(f"/library/duplicates/scan/{job_id}/report").status_code == 404
+    duplicate_tracker.create_job(job_id)
+    assert client.get(f"/library/duplicates/scan/{job_id}/report").status_code == 400
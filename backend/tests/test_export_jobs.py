@@ -0,0 +1,139 @@
+"""Tests for queued playlist export jobs."""
+
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+
+from models import CopyMode, ExportStatus, Format
+from routers import playlists as playlists_router
+from routers.playlists import process_export
+from storage.playlist_storage import playlist_storage
+from utils.export_progress import ExportProgressTracker, export_tracker
+
+
+@pytest.fixture
+def export_playlist(add_track, tmp_path, monkeypatch):
+    """A playlist of two audio files, exported under tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    track_ids = []
+    for name in ("one", "two"):
+        path = tmp_path / f"{name}.mp3"
+        path.write_bytes(b"audio " + name.encode())
+        track_ids.append(add_track(title=name, file_path=str(path)))
+    playlist = playlist_storage.create_playlist(name="Warm up")
+    playlist_storage.add_tracks_to_playlist(playlist.id, track_ids)
+    return playlist.id
+
+
+def run_export(playlist_id, cancel=False):
+    job_id = uuid4()
+    export_tracker.create_job(job_id, playlist_id, Format.M3U.value)
+    if cancel:
+        export_tracker.cancel_job(job_id)
+    process_export(job_id, playlist_id, Format.M3U, CopyMode.COPY)
+    return export_tracker.get_job_status(job_id)
+
+
+def wait_for(client, playlist_id, job_id):
+    for _ in range(200):
+        status = client.get(f"/playlists/{playlist_id}/export/{job_id}/status").json()
+        if status["status"] not in ("queued", "running"):
+            return status
+        time.sleep(0.01)
+    raise AssertionError("export did not finish")
+
+
+def test_export_copies_files_and_writes_the_playlist(export_playlist, tmp_path):
+    job = run_export(export_playlist)
+
+    assert job.status == ExportStatus.COMPLETED
+    assert (job.files_copied, job.files_skipped, job.progress) == (2, 0, 100.0)
+    folder = tmp_path / "exports" / "Warm_up"
+    assert job.file_path == str(folder)
+    assert sorted(p.name for p in (folder / "music").iterdir()) == [
+        "one.mp3",
+        "two.mp3",
+    ]
+    assert "music/one.mp3" in (folder / "Warm_up.m3u").read_text()
+
+    assert run_export(export_playlist).files_skipped == 2
+
+
+def test_job_cancelled_while_queued_does_nothing(export_playlist, tmp_path):
+    job = run_export(export_playlist, cancel=True)
+
+    assert job.status == ExportStatus.CANCELLED
+    assert not (tmp_path / "exports").exists()
+
+
+def test_unexpected_errors_fail_the_job(export_playlist, monkeypatch):
+    def locked(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(
+        playlists_router.playlist_storage, "get_playlist_detail", locked
+    )
+
+    job = run_export(export_playlist)
+
+    assert job.status == ExportStatus.FAILED
+    assert job.errors == ["database is locked"]
+
+
+def test_finished_jobs_cannot_be_cancelled(export_playlist):
+    job = run_export(export_playlist)
+
+    assert export_tracker.cancel_job(job.job_id) is False
+
+
+def test_export_endpoints(client, export_playlist):
+    response = client.post(f"/playlists/{export_playlist}/export", json={})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+
+    status = wait_for(client, export_playlist, job_id)
+    assert (status["status"], status["format"]) == ("completed", "m3u")
+
+    cancel = client.post(f"/playlists/{export_playlist}/export/{job_id}/cancel")
+    assert cancel.status_code == 400
+    other_playlist = playlist_storage.create_playlist(name="Other").id
+    assert (
+        client.get(f"/playlists/{other_playlist}/export/{job_id}/status").status_code
+        == 404
+    )
+    assert (
+        client.post(f"/playlists/{other_playlist}/export", json={}).status_code == 400
+    )
+    assert client.post(f"/playlists/{uuid4()}/export", json={}).status_code == 404
+
+
+def test_jobs_run_one_at_a_time_under_concurrent_submits():
+    tracker = ExportProgressTracker()
+    lock = threading.Lock()
+    running = []
+    overlaps = []
+    all_done = threading.Event()
+
+    def job(job_id):
+        with lock:
+            running.append(job_id)
+            overlaps.append(len(running))
+        time.sleep(0.005)
+        with lock:
+            running.remove(job_id)
+            if len(overlaps) == 8:
+                all_done.set()
+
+    submitters = [
+        threading.Thread(target=tracker.submit, args=(uuid4(), job)) for _ in range(8)
+    ]
+    for submitter in submitters:
+        submitter.start()
+    for submitter in submitters:
+        submitter.join()
+
+    assert all_done.wait(timeout=5)
+
+    assert max(overlaps) == 1
@@ -0,0 +1,154 @@
+"""Tests for incremental export file syncing."""
+
+import errno
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from models import CopyMode
+from utils import file_ops
+from utils.file_ops import plan_destinations, sync_files, transfer_file
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Three source files, two of which share a name."""
+    paths = []
+    for folder, name in [("a", "song.mp3"), ("b", "Song.mp3"), ("a", "other.mp3")]:
+        path = tmp_path / "library" / folder / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(os.urandom(4096))
+        paths.append(str(path))
+    return paths
+
+
+def test_destinations_are_stable_and_unique(sources, tmp_path):
+    out = tmp_path / "out"
+
+    destinations = plan_destinations(sources + [sources[0]], out)
+
+    assert [destinations[source].name for source in sources] == [
+        "song.mp3",
+        "Song_1.mp3",
+        "other.mp3",
+    ]
+    assert plan_destinations(sources, out) == destinations
+
+
+@pytest.mark.parametrize("mode", list(CopyMode))
+def test_sync_copies_then_skips_up_to_date_files(sources, tmp_path, mode):
+    out = tmp_path / "out"
+    out.mkdir()
+
+    mapping, errors, stats = sync_files(sources, out, mode)
+    assert errors == []
+    assert (stats["files_copied"], stats["files_skipped"]) == (3, 0)
+    assert stats["bytes_copied"] == 3 * 4096
+    for source, destination in mapping.items():
+        assert destination.read_bytes() == Path(source).read_bytes()
+
+    _, _, stats = sync_files(sources, out, mode)
+    assert (stats["files_copied"], stats["files_skipped"]) == (0, 3)
+
+
+def test_changed_sources_are_copied_again(sources, tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    mapping, _, _ = sync_files(sources, out)
+
+    with open(sources[0], "ab") as source:
+        source.write(b"more")
+    _, _, stats = sync_files(sources, out)
+
+    assert stats["files_copied"] == 1
+    assert mapping[sources[0]].read_bytes().endswith(b"more")
+
+
+def test_missing_sources_are_reported(sources, tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    missing = str(tmp_path / "missing.mp3")
+
+    mapping, errors, _ = sync_files(sources + [missing], out)
+
+    assert missing not in mapping
+    assert errors == [f"File not found: {missing}"]
+
+
+def test_cancelled_sync_skips_remaining_files(sources, tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    cancel = threading.Event()
+    cancel.set()
+
+    mapping, errors, stats = sync_files(sources, out, cancel_event=cancel)
+
+    assert (mapping, errors, stats["cancelled"]) == ({}, [], True)
+    assert list(out.iterdir()) == []
+
+
+def test_hardlink_shares_the_inode(sources, tmp_path):
+    destination = tmp_path / "linked.mp3"
+
+    transfer_file(sources[0], destination, CopyMode.HARDLINK, 4096)
+
+    assert os.path.samefile(sources[0], destination)
+
+
+def test_hardlink_falls_back_to_a_copy(sources, tmp_path, monkeypatch):
+    def cross_device_link(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(file_ops.os, "link", cross_device_link)
+    destination = tmp_path / "copied.mp3"
+
+    transfer_file(sources[0], destination, CopyMode.HARDLINK, 4096)
+
+    assert not os.path.samefile(sources[0], destination)
+    assert destination.read_bytes() == Path(sources[0]).read_bytes()
+
+
+def _no_clone(monkeypatch):
+    def unsupported_ioctl(*args):
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    if file_ops.FCNTL_AVAILABLE:
+        monkeypatch.setattr(file_ops.fcntl, "ioctl", unsupported_ioctl)
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "copy_file_range"), reason="needs os.copy_file_range"
+)
+@pytest.mark.parametrize("error", sorted(file_ops.COPY_RANGE_UNSUPPORTED_ERRNOS))
+def test_reflink_restarts_with_a_plain_copy(sources, tmp_path, monkeypatch, error):
+    def partial_copy_range(src, dst, count):
+        # Leave some bytes behind, as a copy that fails midway would
+        os.write(dst, b"garbage")
+        raise OSError(error, os.strerror(error))
+
+    _no_clone(monkeypatch)
+    monkeypatch.setattr(file_ops.os, "copy_file_range", partial_copy_range)
+    destination = tmp_path / "copied.mp3"
+
+    transfer_file(sources[0], destination, CopyMode.REFLINK, 4096)
+
+    assert destination.read_bytes() == Path(sources[0]).read_bytes()
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "copy_file_range"), reason="needs os.copy_file_range"
+)
+def test_reflink_io_errors_fail_without_partial_files(sources, tmp_path, monkeypatch):
+    def failing_copy_range(src, dst, count):
+        raise OSError(errno.EIO, "Input/output error")
+
+    _no_clone(monkeypatch)
+    monkeypatch.setattr(file_ops.os, "copy_file_range", failing_copy_range)
+    destination = tmp_path / "copied.mp3"
+
+    with pytest.raises(OSError):
+        transfer_file(sources[0], destination, CopyMode.REFLINK, 4096)
+
+    assert list(tmp_path.glob("copied.mp3*")) == []
@@ -0,0 +1,129 @@
+"""Tests for loudness and energy analysis."""
+
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from routers import metadata as metadata_router
+from services.loudness import (
+    REPLAY_GAIN_REFERENCE_LUFS,
+    analyze_loudness,
+    integrated_loudness,
+    sample_peak_dbfs,
+)
+from storage.feature_storage import (
+    beat_grid_storage,
+    feature_storage,
+    fingerprint_storage,
+    waveform_storage,
+)
+
+
+def sine(sr, seconds=5.0, frequency=1000.0, amplitude=1.0):
+    t = np.arange(int(seconds * sr)) / sr
+    return amplitude * np.sin(2 * np.pi * frequency * t)
+
+
+def clicks(sr, bpm=120, seconds=20.0):
+    y = np.zeros(int(seconds * sr))
+    y[:: int(sr * 60 / bpm)] = 1.0
+    return np.convolve(y, np.hanning(200))[: y.size]
+
+
+@pytest.mark.parametrize("sr", [22050, 44100, 48000])
+def test_full_scale_sine_reads_minus_three_lufs(sr):
+    # BS.1770 calibration: a 0 dBFS 1 kHz sine in one channel is -3.01 LUFS
+    assert integrated_loudness(sine(sr)[None], sr) == pytest.approx(-3.01, abs=0.05)
+
+
+def test_channels_add_up():
+    mono = integrated_loudness(sine(48000)[None], 48000)
+    stereo = integrated_loudness(np.stack([sine(48000)] * 2), 48000)
+
+    assert stereo - mono == pytest.approx(10 * np.log10(2), abs=0.01)
+
+
+def test_gates_ignore_silence_and_quiet_passages():
+    sr = 48000
+    tone = sine(sr, amplitude=0.5)
+    with_silence = np.r_[tone, np.zeros(20 * sr)]
+    with_quiet = np.r_[tone, sine(sr, amplitude=0.005)]
+
+    # Only the blocks overlapping the end of the tone count besides it;
+    # ungated, the silence would lower the result by 7 dB
+    expected = integrated_loudness(tone[None], sr)
+    assert integrated_loudness(with_silence[None], sr) == pytest.approx(
+        expected, abs=0.2
+    )
+    assert integrated_loudness(with_quiet[None], sr) == pytest.approx(expected, abs=0.2)
+
+
+def test_short_or_silent_audio_has_no_loudness():
+    assert integrated_loudness(sine(48000, seconds=0.3)[None], 48000) is None
+    assert integrated_loudness(np.zeros((2, 48000)), 48000) is None
+    assert sample_peak_dbfs(np.zeros((2, 10))) is None
+
+
+def test_peak_is_the_loudest_channel():
+    channels = np.stack([sine(48000, amplitude=0.25), sine(48000, amplitude=0.5)])
+
+    assert sample_peak_dbfs(channels) == pytest.approx(-6.02, abs=0.01)
+
+
+def test_analysis_of_a_track():
+    channels = np.stack([clicks(44100)] * 2)
+    y = clicks(22050)
+
+    result = analyze_loudness(channels, 44100, y, 22050)
+
+    assert result["replay_gain_db"] == pytest.approx(
+        REPLAY_GAIN_REFERENCE_LUFS - result["loudness_lufs"], abs=1e-3
+    )
+    assert result["peak_dbfs"] == pytest.approx(0.0, abs=0.01)
+    assert 0 <= result["energy"] <= 1
+    assert result["danceability"] > 0.8
+    noise = np.random.default_rng(0).normal(scale=0.1, size=y.size)
+    assert analyze_loudness(noise[None], 22050, noise, 22050)["danceability"] < 0.2
+
+
+def test_silent_track_gets_no_values():
+    silence = np.zeros(5 * 22050)
+
+    result = analyze_loudness(silence[None], 22050, silence, 22050)
+
+    assert set(result.values()) == {None}
+
+
+@pytest.fixture
+def analysis_calls(monkeypatch):
+    """extract_features of each analyze_metadata call batch analysis makes."""
+    calls = []
+
+    def analyze_metadata(file_path, use_audio_analysis, extract_features):
+        calls.append(extract_features)
+        return {"bpm": None, "key": None, "source": "tags"}
+
+    monkeypatch.setattr(metadata_router, "analyze_metadata", analyze_metadata)
+    return calls
+
+
+def test_batch_analysis_skips_the_full_decode_when_stored(
+    database, add_track, analysis_calls
+):
+    analyzed = add_track(loudness_lufs=-9.0)
+    for array_storage in (
+        feature_storage,
+        fingerprint_storage,
+        waveform_storage,
+        beat_grid_storage,
+    ):
+        array_storage.save([(UUID(analyzed), np.ones(4))])
+    without_loudness = add_track()
+    feature_storage.save([(UUID(without_loudness), np.ones(4))])
+
+    for track_id in (analyzed, without_loudness):
+        metadata_router._process_single_track(UUID(track_id), None)
+    metadata_router._process_single_track(UUID(analyzed), None, reanalyze=True)
+
+    assert analysis_calls == [False, True, True]
@@ -0,0 +1,92 @@
+"""Tests for recognising moved and renamed files during library scans."""
+
+import os
+import shutil
+import wave
+from uuid import UUID, uuid4
+
+from routers.library import process_scan
+from storage.track_storage import storage
+from utils.scan_progress import scan_tracker
+from utils.scan_utils import CONTENT_HASH_BLOCK_BYTES, partial_content_hash
+
+
+def scan(folder, skip_duplicates=False):
+    scan_id = uuid4()
+    process_scan(scan_id, [str(folder)], True, skip_duplicates)
+    return scan_tracker.get_scan_status(scan_id)
+
+
+def write_audio(path, size=1000):
+    """A short WAV of noise, so every file has different content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(8000)
+        audio.writeframes(os.urandom(size // 2 * 2))
+    return path
+
+
+def test_hash_covers_size_and_both_ends(tmp_path):
+    size = 3 * CONTENT_HASH_BLOCK_BYTES
+    original = write_audio(tmp_path / "a.wav", size)
+    content = bytearray(original.read_bytes())
+    copy = tmp_path / "b.wav"
+    shutil.copy(original, copy)
+    assert partial_content_hash(str(original)) == partial_content_hash(str(copy))
+
+    # The middle of a large file is not read
+    content[size // 2] ^= 0xFF
+    copy.write_bytes(content)
+    assert partial_content_hash(str(original)) == partial_content_hash(str(copy))
+
+    for changed in (content[:-1], content[:-1] + b"x", b"x" + content[1:]):
+        copy.write_bytes(changed)
+        assert partial_content_hash(str(original)) != partial_content_hash(str(copy))
+
+    assert partial_content_hash(str(tmp_path / "missing.wav")) is None
+
+
+def test_moved_file_keeps_its_track(database, tmp_path):
+    original = write_audio(tmp_path / "incoming" / "track.wav")
+    scan(tmp_path)
+    [track] = storage.get_tracks_by_content_hash(partial_content_hash(str(original)))
+    storage.update_track(track.id, {"play_count": 7})
+
+    moved = tmp_path / "sorted" / "renamed.wav"
+    moved.parent.mkdir()
+    original.rename(moved)
+    status = scan(tmp_path)
+
+    assert (status.files_moved, status.files_added) == (1, 0)
+    track = storage.get_track_by_id(track.id)
+    assert (track.file_path, track.play_count) == (str(moved), 7)
+    assert storage.get_track_by_path(str(original)) is None
+
+
+def test_copy_of_an_existing_file_is_a_new_track(database, tmp_path):
+    original = write_audio(tmp_path / "track.wav")
+    scan(tmp_path)
+    shutil.copy(original, tmp_path / "copy.wav")
+
+    status = scan(tmp_path, skip_duplicates=True)
+
+    assert (status.files_moved, status.files_added, status.files_skipped) == (0, 1, 1)
+    assert (
+        len(storage.get_tracks_by_content_hash(partial_content_hash(str(original))))
+        == 2
+    )
+
+
+def test_skipping_scans_backfill_missing_hashes(database, add_track, tmp_path):
+    original = write_audio(tmp_path / "old" / "track.wav")
+    track_id = add_track(file_path=str(original))
+
+    scan(tmp_path, skip_duplicates=True)
+    moved = tmp_path / "new.wav"
+    original.rename(moved)
+    status = scan(tmp_path, skip_duplicates=True)
+
+    assert status.files_moved == 1
+    assert storage.get_track_by_id(UUID(track_id)).file_path == str(moved)
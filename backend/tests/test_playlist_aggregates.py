@@ -0,0 +1,86 @@
+"""Tests for the triggers that keep playlist track counts and durations."""
+
+from uuid import UUID
+
+from core.database import get_db
+from models import SmartPlaylistRules
+from storage.playlist_storage import playlist_storage
+from storage.track_storage import storage
+
+
+def aggregates(playlist_id):
+    playlist = playlist_storage.get_playlist_by_id(playlist_id)
+    return playlist.track_count, playlist.total_duration_seconds
+
+
+def recomputed(playlist_id):
+    with get_db() as (_, cursor):
+        cursor.execute(
+            """SELECT COUNT(*), COALESCE(SUM(t.duration_seconds), 0)
+               FROM playlist_tracks pt INNER JOIN tracks t ON t.id = pt.track_id
+               WHERE pt.playlist_id = ?""",
+            (str(playlist_id),),
+        )
+        return tuple(cursor.fetchone())
+
+
+def test_new_playlist_is_empty(database):
+    playlist = playlist_storage.create_playlist(name="Empty")
+
+    assert aggregates(playlist.id) == (0, 0)
+
+
+def test_adding_and_removing_tracks(add_track):
+    long, short, unknown = add_track(duration_seconds=300), add_track(), add_track()
+    playlist_id = playlist_storage.create_playlist(name="Set").id
+
+    playlist_storage.add_tracks_to_playlist(playlist_id, [long, short, unknown])
+    assert aggregates(playlist_id) == (3, 300)
+
+    playlist_storage.remove_tracks_from_playlist(playlist_id, [UUID(long)])
+    assert aggregates(playlist_id) == (2, 0) == recomputed(playlist_id)
+
+
+def test_duration_changes_update_every_containing_playlist(add_track):
+    track_id = add_track(duration_seconds=200)
+    other = add_track(duration_seconds=100)
+    first = playlist_storage.create_playlist(name="First").id
+    second = playlist_storage.create_playlist(name="Second").id
+    playlist_storage.add_tracks_to_playlist(first, [track_id, other])
+    playlist_storage.add_tracks_to_playlist(second, [track_id])
+
+    storage.update_track(UUID(track_id), {"duration_seconds": 250})
+    assert (aggregates(first), aggregates(second)) == ((2, 350), (1, 250))
+
+    with get_db() as (_, cursor):
+        cursor.execute(
+            "UPDATE tracks SET duration_seconds = NULL WHERE id = ?", (track_id,)
+        )
+    assert (aggregates(first), aggregates(second)) == ((2, 100), (1, 0))
+
+
+def test_deleting_tracks_removes_them_from_playlists(add_track):
+    kept, deleted, bulk_deleted = (
+        add_track(duration_seconds=seconds) for seconds in (60, 120, 180)
+    )
+    playlist_id = playlist_storage.create_playlist(name="Set").id
+    playlist_storage.add_tracks_to_playlist(playlist_id, [kept, deleted, bulk_deleted])
+
+    storage.delete_track(UUID(deleted))
+    storage.delete_tracks([UUID(bulk_deleted)])
+
+    assert aggregates(playlist_id) == (1, 60) == recomputed(playlist_id)
+    assert playlist_storage.get_playlist_track_ids(playlist_id) == [UUID(kept)]
+
+
+def test_smart_playlist_membership_changes_are_counted(add_track):
+    add_track(genre="Techno", duration_seconds=100)
+    changed = add_track(genre="House", duration_seconds=200)
+    playlist_id = playlist_storage.create_playlist(
+        name="Techno", smart_rules=SmartPlaylistRules(genre="Techno")
+    ).id
+    assert aggregates(playlist_id) == (1, 100)
+
+    storage.update_track(UUID(changed), {"genre": "Techno"})
+
+    assert aggregates(playlist_id) == (2, 300) == recomputed(playlist_id)
@@ -0,0 +1,151 @@
+"""Tests for adding, removing and ordering playlist tracks."""
+
+from uuid import UUID
+
+import pytest
+
+from core.database import get_db
+from storage.playlist_storage import POSITION_GAP, playlist_storage
+
+UNKNOWN_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def make_playlist(track_ids=()):
+    playlist = playlist_storage.create_playlist(name="Set")
+    if track_ids:
+        playlist_storage.add_tracks_to_playlist(playlist.id, track_ids)
+    return playlist.id
+
+
+def order(playlist_id):
+    return [str(tid) for tid in playlist_storage.get_playlist_track_ids(playlist_id)]
+
+
+def positions(playlist_id):
+    with get_db() as (_, cursor):
+        cursor.execute(
+            "SELECT position FROM playlist_tracks WHERE playlist_id = ? "
+            "ORDER BY position",
+            (str(playlist_id),),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def test_add_skips_unknown_duplicate_and_present_tracks(add_track):
+    first, second, third = add_track(), add_track(), add_track()
+    playlist_id = make_playlist([first])
+
+    result = playlist_storage.add_tracks_to_playlist(
+        playlist_id, [third, first, UNKNOWN_ID, second, third]
+    )
+
+    assert result == (2, 3)
+    assert order(playlist_id) == [first, third, second]
+
+
+def test_add_appends_after_the_last_position(add_track):
+    track_ids = [add_track() for _ in range(3)]
+    playlist_id = make_playlist(track_ids[:2])
+
+    playlist_storage.add_tracks_to_playlist(playlist_id, track_ids[2:])
+
+    assert positions(playlist_id) == [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP]
+
+
+def test_add_to_unknown_playlist_returns_none(add_track):
+    assert (
+        playlist_storage.add_tracks_to_playlist(UUID(UNKNOWN_ID), [add_track()]) is None
+    )
+
+
+def test_add_endpoint_reports_counts(client, add_track):
+    playlist_id = make_playlist()
+
+    response = client.post(
+        f"/playlists/{playlist_id}/tracks",
+        json={"track_ids": [add_track(), UNKNOWN_ID]},
+    )
+
+    assert response.status_code == 200
+    assert (response.json()["added_count"], response.json()["skipped_count"]) == (1, 1)
+
+
+def test_move_rewrites_only_the_moved_row(add_track):
+    a, b, c = add_track(), add_track(), add_track()
+    playlist_id = make_playlist([a, b, c])
+
+    assert playlist_storage.move_track(playlist_id, UUID(c), UUID(a)) is False
+
+    assert order(playlist_id) == [a, c, b]
+    assert positions(playlist_id) == [
+        POSITION_GAP,
+        POSITION_GAP + POSITION_GAP // 2,
+        2 * POSITION_GAP,
+    ]
+
+
+def test_move_to_top_and_to_end(add_track):
+    a, b, c = add_track(), add_track(), add_track()
+    playlist_id = make_playlist([a, b, c])
+
+    playlist_storage.move_track(playlist_id, UUID(c), None)
+    assert order(playlist_id) == [c, a, b]
+
+    playlist_storage.move_track(playlist_id, UUID(c), UUID(b))
+    assert order(playlist_id) == [a, b, c]
+
+
+def test_move_reports_when_the_gap_gets_small(add_track):
+    a, b, c = add_track(), add_track(), add_track()
+    playlist_id = make_playlist([a, b, c])
+
+    # Alternating b and c into the shrinking gap after a halves it each time
+    results = [
+        playlist_storage.move_track(playlist_id, UUID(moved), UUID(a))
+        for moved in [c, b] * 4
+    ]
+
+    assert results[-1] is True
+    assert results.index(True) > 0
+    playlist_storage.renumber_playlist(playlist_id)
+    assert positions(playlist_id) == [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP]
+
+
+def test_move_renumbers_inline_when_no_position_is_left(add_track):
+    a, b, c = add_track(), add_track(), add_track()
+    playlist_id = make_playlist([a, b, c])
+    with get_db() as (_, cursor):
+        cursor.execute(
+            "UPDATE playlist_tracks SET position = position / ? WHERE playlist_id = ?",
+            (POSITION_GAP, str(playlist_id)),
+        )
+
+    playlist_storage.move_track(playlist_id, UUID(c), UUID(a))
+
+    assert order(playlist_id) == [a, c, b]
+
+
+def test_move_rejects_invalid_targets(add_track):
+    a, b = add_track(), add_track()
+    playlist_id = make_playlist([a])
+
+    assert playlist_storage.move_track(playlist_id, UUID(b), None) is None
+    with pytest.raises(ValueError):
+        playlist_storage.move_track(playlist_id, UUID(a), UUID(a))
+    with pytest.raises(ValueError):
+        playlist_storage.move_track(playlist_id, UUID(a), UUID(b))
+
+
+def test_move_endpoint_renumbers_in_the_background(client, add_track):
+    a, b, c = add_track(), add_track(), add_track()
+    playlist_id = make_playlist([a, b, c])
+
+    for moved in [c, b] * 4:
+        response = client.patch(
+            f"/playlists/{playlist_id}/tracks",
+            json={"track_id": moved, "after_track_id": a},
+        )
+        assert response.status_code == 200
+
+    assert order(playlist_id) == [a, b, c]
+    assert positions(playlist_id) == [POSITION_GAP, 2 * POSITION_GAP, 3 * POSITION_GAP]
@@ -0,0 +1,140 @@
+"""
+Golden-file tests for the streaming playlist writers.
+
+Each format's output for a fixed playlist is compared with a file under
+tests/golden. After an intended format change, regenerate them with
+UPDATE_GOLDEN=1 python -m pytest tests/test_playlist_writers.py and review
+the diff.
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from models import Format, PlaylistDetail, Track
+from utils.playlist_writers import PlaylistWriter, get_writer
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+
+PLAYLIST = PlaylistDetail(
+    name='Rock & <Roll> "Mix"',
+    description="Warm-up & peak time",
+    track_count=4,
+    total_duration_seconds=425,
+)
+
+ENTRIES = [
+    (
+        Track(
+            id=UUID("00000000-0000-0000-0000-000000000001"),
+            title="Café & Friends",
+            artist="AC/DC <live>",
+            album='Best "Of"',
+            genre="Rock",
+            year=1999,
+            bpm=128,
+            key="Am",
+            duration_seconds=245,
+            file_size_bytes=5242880,
+            file_path="/music/library/Café & Friends.mp3",
+        ),
+        "music/Café & Friends.mp3",
+    ),
+    (
+        Track(
+            id=UUID("00000000-0000-0000-0000-000000000002"),
+            title="Line one\nLine two",
+            album="Singles",
+            duration_seconds=180,
+            file_path="/music/library/two.flac",
+        ),
+        "music/two.flac",
+    ),
+    (
+        Track(
+            id=UUID("00000000-0000-0000-0000-000000000003"),
+            title="Not exported",
+            artist="Nobody",
+            file_path="/music/library/gone.mp3",
+        ),
+        None,
+    ),
+    (
+        Track(
+            id=UUID("00000000-0000-0000-0000-000000000004"),
+            artist="Unnamed",
+            file_path="/music/library/sub dir/four.mp3",
+        ),
+        "music/sub dir/four.mp3",
+    ),
+]
+
+
+def render(export_format: Format, batch_size: int = 500) -> str:
+    writer = get_writer(export_format)
+    return "".join(writer.iter_chunks(PLAYLIST, ENTRIES, batch_size=batch_size))
+
+
+@pytest.mark.parametrize("export_format", list(Format), ids=lambda f: f.value)
+def test_output_matches_golden_file(export_format):
+    golden = GOLDEN_DIR / f"playlist.{get_writer(export_format).extension}"
+    output = render(export_format)
+    if os.environ.get("UPDATE_GOLDEN"):
+        golden.write_bytes(output.encode("utf-8"))
+    assert output == golden.read_bytes().decode("utf-8")
+
+
+@pytest.mark.parametrize("export_format", list(Format), ids=lambda f: f.value)
+def test_output_does_not_depend_on_batch_size(export_format):
+    assert render(export_format, batch_size=1) == render(export_format)
+
+
+@pytest.mark.parametrize("export_format", [Format.XSPF, Format.REKORDBOX])
+def test_xml_formats_escape_text(export_format):
+    root = ET.fromstring(render(export_format))
+    texts = {element.text for element in root.iter()} | {
+        value for element in root.iter() for value in element.attrib.values()
+    }
+    assert "Café & Friends" in texts
+    assert "AC/DC <live>" in texts
+
+
+def test_pls_counts_only_written_entries():
+    lines = render(Format.PLS).splitlines()
+    assert "NumberOfEntries=3" in lines
+    files = [line.split("=", 1)[0] for line in lines if line.startswith("File")]
+    assert files == ["File1", "File2", "File3"]
+
+
+@pytest.mark.parametrize("export_format", [Format.M3U, Format.M3U8, Format.PLS])
+def test_line_based_formats_flatten_newlines_in_titles(export_format):
+    output = render(export_format)
+    assert "Line one Line two" in output
+    assert not any(line.startswith("Line two") for line in output.splitlines())
+
+
+def test_json_lists_missing_tracks_with_null_path():
+    document = json.loads(render(Format.JSON))
+    assert [track["file_path"] for track in document["tracks"]] == [
+        "music/Café & Friends.mp3",
+        "music/two.flac",
+        None,
+        "music/sub dir/four.mp3",
+    ]
+
+
+def test_rekordbox_playlist_references_every_collection_track():
+    root = ET.fromstring(render(Format.REKORDBOX))
+    track_ids = [t.get("TrackID") for t in root.find("COLLECTION")]
+    playlist = root.find("PLAYLISTS/NODE/NODE")
+    assert [t.get("Key") for t in playlist] == track_ids
+    assert playlist.get("Entries") == str(len(track_ids))
+
+
+def test_writers_must_render_entries():
+    with pytest.raises(TypeError):
+        PlaylistWriter()
@@ -0,0 +1,85 @@
+"""Tests for missing-file reconciliation."""
+
+import threading
+from uuid import UUID, uuid4
+
+from models import ReconcileStatus
+from routers import library
+from routers.library import process_reconcile
+from storage.track_storage import storage
+from utils.reconcile_progress import ReconcileProgressTracker, reconcile_tracker
+
+
+def reconcile():
+    job_id = uuid4()
+    reconcile_tracker.create_job(job_id)
+    process_reconcile(job_id)
+    return reconcile_tracker.get_job_status(job_id)
+
+
+def test_missing_files_are_flagged_and_cleared(database, add_track, tmp_path):
+    present = tmp_path / "present.mp3"
+    present.write_bytes(b"audio")
+    returning = tmp_path / "returning.mp3"
+    kept = add_track(file_path=str(present))
+    gone = add_track(file_path=str(tmp_path / "gone.mp3"))
+    back = add_track(file_path=str(returning))
+
+    job = reconcile()
+
+    assert job.status == ReconcileStatus.COMPLETED
+    assert (job.tracks_checked, job.tracks_missing, job.newly_missing) == (3, 2, 2)
+    first_seen = storage.get_track_by_id(UUID(gone)).missing_since
+    assert first_seen is not None
+    assert storage.get_track_by_id(UUID(kept)).missing is False
+
+    returning.write_bytes(b"audio")
+    job = reconcile()
+
+    assert (job.tracks_missing, job.newly_missing, job.found_again) == (1, 0, 1)
+    assert storage.get_track_by_id(UUID(back)).missing_since is None
+    assert storage.get_track_by_id(UUID(gone)).missing_since == first_seen
+
+
+def test_unreachable_paths_keep_their_flag(database, add_track, monkeypatch):
+    track_id = add_track(file_path="/share/track.mp3", missing=1)
+    monkeypatch.setattr(
+        library, "check_file_exists", lambda path: (None, "Permission denied")
+    )
+
+    job = reconcile()
+
+    assert (job.tracks_missing, job.found_again, job.tracks_unchecked) == (1, 0, 1)
+    assert job.errors == ["/share/track.mp3: Permission denied"]
+    assert storage.get_track_by_id(UUID(track_id)).missing is True
+
+
+def test_missing_tracks_can_be_listed(client, add_track, tmp_path):
+    present = tmp_path / "present.mp3"
+    present.write_bytes(b"audio")
+    add_track(file_path=str(present))
+    gone = add_track(file_path=str(tmp_path / "gone.mp3"))
+    reconcile()
+
+    listed = client.get("/tracks?missing=true").json()["data"]
+
+    assert [track["id"] for track in listed] == [gone]
+    assert client.get("/analysis/overview").json()["tracks_missing_files"] == 1
+
+
+def test_only_one_reconciliation_runs_at_a_time():
+    tracker = ReconcileProgressTracker()
+    release = threading.Event()
+    finished = threading.Event()
+
+    def job(job_id):
+        release.wait(timeout=5)
+        tracker.complete_job(job_id, 0)
+        finished.set()
+
+    first = tracker.start_job(job)
+    assert tracker.start_job(job) is first
+
+    release.set()
+    assert finished.wait(timeout=5)
+    assert tracker.start_job(job) is not first
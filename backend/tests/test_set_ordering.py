@@ -0,0 +1,117 @@
+"""Tests for Camelot key mapping and harmonic set ordering."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from services.set_ordering import build_cost_matrix, order_set, path_cost
+from storage.playlist_storage import playlist_storage
+from utils.camelot import (
+    UNKNOWN_KEY_DISTANCE,
+    camelot_distance,
+    compatible_codes,
+    to_camelot,
+)
+
+
+@pytest.mark.parametrize(
+    "key, code",
+    [
+        ("C", "8B"),
+        ("Am", "8A"),
+        ("F#m", "11A"),
+        ("Gb minor", "11A"),
+        ("Bb", "6B"),
+        ("EBM", "2A"),
+        ("B", "1B"),
+        ("E", "12B"),
+        ("8a", "8A"),
+        ("08B", "8B"),
+        ("12A", "12A"),
+    ],
+)
+def test_keys_map_to_camelot_codes(key, code):
+    assert to_camelot(key) == code
+
+
+@pytest.mark.parametrize("key", [None, "", "H", "13A", "0B", "C##"])
+def test_unrecognised_keys_have_no_code(key):
+    assert to_camelot(key) is None
+
+
+def test_camelot_distance_wraps_round_the_wheel():
+    assert camelot_distance((12, "A"), (1, "A")) == 1
+    assert camelot_distance((8, "A"), (8, "B")) == 1
+    assert camelot_distance((3, "A"), (9, "B")) == 7
+    assert camelot_distance(None, (1, "A")) == UNKNOWN_KEY_DISTANCE
+
+
+def test_compatible_codes():
+    assert compatible_codes((12, "A")) == [
+        ("12A", 0),
+        ("1A", 1),
+        ("11A", 1),
+        ("12B", 1),
+    ]
+
+
+def test_cost_matrix_combines_key_tempo_and_energy():
+    cost = build_cost_matrix(
+        ["Am", "Em", None], [120, 240, None], [0.2, 0.7, None], bpm_weight=1.0
+    )
+
+    assert np.allclose(cost, cost.T)
+    assert np.all(np.diag(cost) == 0)
+    # One wheel step, half/double time, energy 0.5
+    assert cost[0, 1] == pytest.approx(1 + 0 + 0.5)
+    # Unknown key and tempo, unknown energy adds nothing
+    assert cost[0, 2] == pytest.approx(UNKNOWN_KEY_DISTANCE + 10.0)
+
+
+def test_order_finds_the_optimal_path_of_a_small_set():
+    rng = np.random.default_rng(7)
+    points = rng.random((7, 2))
+    cost = np.linalg.norm(points[:, None] - points[None, :], axis=2)
+
+    order, converged = order_set(cost, time_budget=5)
+
+    best = min(path_cost(cost, path) for path in itertools.permutations(range(7)))
+    assert converged
+    assert sorted(order) == list(range(7))
+    assert path_cost(cost, order) == pytest.approx(best)
+
+
+def test_order_respects_the_start_track():
+    keys = ["8A", "1A", "9A", "12A", "10A", "11A"]
+    cost = build_cost_matrix(keys, [None] * len(keys))
+
+    order, _ = order_set(cost, start=1, time_budget=5)
+
+    assert [keys[index] for index in order] == ["1A", "12A", "11A", "10A", "9A", "8A"]
+
+
+@pytest.mark.parametrize("size", [0, 1, 2])
+def test_tiny_sets(size):
+    order, converged = order_set(np.zeros((size, size)))
+
+    assert (order, converged) == (list(range(size)), True)
+
+
+def test_order_endpoint_applies_the_order(client, add_track):
+    keys = ["10A", "8A", "9A"]
+    track_ids = [add_track(key=key, bpm=124) for key in keys]
+    playlist_id = playlist_storage.create_playlist(name="Set").id
+    playlist_storage.add_tracks_to_playlist(playlist_id, track_ids)
+
+    response = client.post(
+        f"/playlists/{playlist_id}/order",
+        json={"start_track_id": track_ids[1], "apply": True},
+    )
+
+    body = response.json()
+    assert body["track_ids"] == [track_ids[1], track_ids[2], track_ids[0]]
+    assert (body["cost_before"], body["cost_after"], body["applied"]) == (3, 2, True)
+    assert [
+        str(tid) for tid in playlist_storage.get_playlist_track_ids(playlist_id)
+    ] == body["track_ids"]
@@ -0,0 +1,129 @@
+"""Tests for the similar-tracks index."""
+
+from uuid import UUID, uuid4
+
+import numpy as np
+import pytest
+
+from services import similarity
+from services.metadata_service import FEATURE_DIM
+from services.similarity import SimilarityIndex, normalize_features
+from storage.feature_storage import feature_storage
+from storage.track_storage import storage
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    """The index is module state, so start every test without one."""
+    monkeypatch.setattr(similarity, "_index", None)
+    monkeypatch.setattr(similarity, "_index_generation", None)
+
+
+def library(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [str(uuid4()) for _ in range(size)], rng.normal(size=(size, FEATURE_DIM))
+
+
+def save_features(track_ids, features):
+    feature_storage.save(zip(map(UUID, track_ids), features))
+
+
+def test_normalized_vectors_are_unit_length_and_fill_gaps():
+    features = np.arange(3 * FEATURE_DIM, dtype=np.float32).reshape(3, -1) ** 1.5
+    features[1, 5] = np.nan
+
+    vectors = normalize_features(features)
+
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1)
+    assert not np.isnan(vectors).any()
+    # A constant column carries no information
+    assert np.allclose(normalize_features(np.ones((3, FEATURE_DIM))), 0)
+
+
+def test_exact_search_ranks_by_cosine_similarity():
+    track_ids, features = library(50)
+    index = SimilarityIndex(track_ids, features)
+
+    matches = index.search(track_ids[0], 5)
+
+    scores = index.vectors @ index.vectors[0]
+    scores[0] = -np.inf
+    expected = np.argsort(-scores)[:5]
+    assert [match_id for match_id, _ in matches] == [track_ids[i] for i in expected]
+    assert [score for _, score in matches] == pytest.approx(scores[expected].tolist())
+    assert index.kind == "exact"
+    assert index.search(str(uuid4()), 5) is None
+
+
+def test_search_never_returns_the_query_or_more_than_exists():
+    track_ids, features = library(3)
+    index = SimilarityIndex(track_ids, features)
+
+    matches = index.search(track_ids[1], 10)
+
+    assert sorted(match_id for match_id, _ in matches) == sorted(
+        [track_ids[0], track_ids[2]]
+    )
+
+
+def test_ivf_search_finds_near_duplicates():
+    track_ids, features = library(2000)
+    # Each of the first 20 tracks has a slightly perturbed twin
+    twins = features[:20] + 0.01
+    index = SimilarityIndex(
+        track_ids + [f"twin-{i}" for i in range(20)],
+        np.vstack([features, twins]),
+        ivf_lists=16,
+    )
+
+    assert index.kind == "ivf"
+    assert sum(len(rows) for rows in index.lists) == len(index.track_ids)
+    for i in range(20):
+        assert index.search(track_ids[i], 1)[0][0] == f"twin-{i}"
+
+
+def test_index_rebuilds_are_debounced(database, monkeypatch):
+    track_ids, features = library(4)
+    save_features(track_ids[:2], features[:2])
+    first = similarity.get_similarity_index()
+    save_features(track_ids[2:], features[2:])
+
+    assert similarity.get_similarity_index() is first
+
+    monkeypatch.setattr(similarity, "INDEX_REBUILD_SECONDS", 0)
+    rebuilt = similarity.get_similarity_index()
+    assert rebuilt is not first
+    assert sorted(rebuilt.track_ids) == sorted(track_ids)
+    assert similarity.get_similarity_index() is rebuilt
+
+
+def test_similar_endpoint(client, add_track):
+    track_ids = [add_track(title=f"Track {i}") for i in range(15)]
+    _, features = library(15)
+    save_features(track_ids, features)
+    unanalyzed = add_track()
+
+    response = client.get(f"/tracks/{track_ids[0]}/similar?limit=3&fields=title")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["index"] == "exact"
+    assert len(body["data"]) == 3
+    assert set(body["data"][0]["track"]) == {"id", "title"}
+    assert client.get(f"/tracks/{unanalyzed}/similar").status_code == 400
+    assert client.get(f"/tracks/{uuid4()}/similar").status_code == 404
+
+
+def test_deleted_tracks_drop_out_of_a_stale_index(client, add_track):
+    track_ids = [add_track() for _ in range(15)]
+    _, features = library(15)
+    save_features(track_ids, features)
+    before = client.get(f"/tracks/{track_ids[0]}/similar?limit=5").json()["data"]
+    deleted = [match["track"]["id"] for match in before[:2]]
+
+    storage.delete_tracks([UUID(track_id) for track_id in deleted])
+    after = client.get(f"/tracks/{track_ids[0]}/similar?limit=5").json()["data"]
+
+    assert len(after) == 5
+    assert not {match["track"]["id"] for match in after} & set(deleted)
+    assert client.get(f"/tracks/{deleted[0]}/similar").status_code == 404
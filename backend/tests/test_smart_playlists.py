@@ -0,0 +1,126 @@
+"""Tests for smart playlist membership and expiry."""
+
+from uuid import UUID
+
+from core.database import get_db
+from models import SmartPlaylistRules, TrackCreate
+from storage.playlist_storage import playlist_storage
+from storage.track_storage import storage
+
+DEEP_HOUSE = {"genre": "House", "bpm_min": 120, "bpm_max": 124}
+
+
+def members(playlist_id):
+    return {str(tid) for tid in playlist_storage.get_playlist_track_ids(playlist_id)}
+
+
+def make_smart(**rules):
+    return playlist_storage.create_playlist(
+        name="Smart", smart_rules=SmartPlaylistRules(**rules)
+    ).id
+
+
+def test_creation_fills_matching_tracks(add_track):
+    match = add_track(genre="House", bpm=122)
+    add_track(genre="House", bpm=130)
+    add_track(genre="Techno", bpm=122)
+
+    playlist_id = make_smart(**DEEP_HOUSE)
+
+    assert members(playlist_id) == {match}
+    assert playlist_storage.get_playlist_by_id(playlist_id).track_count == 1
+
+
+def test_track_writes_update_membership(add_track):
+    leaving = add_track(genre="House", bpm=122)
+    joining = add_track(genre="Techno", bpm=122)
+    playlist_id = make_smart(**DEEP_HOUSE)
+
+    storage.update_track(UUID(leaving), {"bpm": 140})
+    storage.bulk_update_tracks([(UUID(joining), {"genre": "House"})])
+    created = storage.create_track(
+        TrackCreate(file_path="/music/new.mp3", genre="House", bpm=121)
+    )
+
+    assert members(playlist_id) == {joining, str(created.id)}
+
+
+def test_updates_outside_rule_columns_leave_members_alone(add_track, monkeypatch):
+    track_id = add_track(genre="House", bpm=122)
+    playlist_id = make_smart(**DEEP_HOUSE)
+
+    def fail(cursor):
+        raise AssertionError("rules should not be evaluated")
+
+    monkeypatch.setattr(playlist_storage, "_load_smart_playlists", fail)
+
+    storage.update_track(UUID(track_id), {"play_count": 3})
+
+    assert members(playlist_id) == {track_id}
+
+
+def test_manual_edits_are_rejected(client, add_track):
+    playlist_id = make_smart(**DEEP_HOUSE)
+    body = {"track_ids": [add_track()]}
+
+    assert client.post(f"/playlists/{playlist_id}/tracks", json=body).status_code == 400
+    assert (
+        client.request(
+            "DELETE", f"/playlists/{playlist_id}/tracks", json=body
+        ).status_code
+        == 400
+    )
+
+
+def test_new_rules_rebuild_the_tracks(client, add_track):
+    add_track(genre="House", bpm=122)
+    minor = add_track(key="Am")
+    playlist_id = make_smart(**DEEP_HOUSE)
+
+    response = client.put(
+        f"/playlists/{playlist_id}", json={"smart_rules": {"key": "Am"}}
+    )
+
+    assert response.json()["smart_rules"]["key"] == "Am"
+    assert members(playlist_id) == {minor}
+
+
+def test_clearing_rules_keeps_the_tracks(client, add_track):
+    member = add_track(genre="House", bpm=122)
+    playlist_id = make_smart(**DEEP_HOUSE)
+
+    response = client.put(f"/playlists/{playlist_id}", json={"smart_rules": None})
+
+    assert response.status_code == 200
+    assert response.json()["smart_rules"] is None
+    assert members(playlist_id) == {member}
+    added = add_track(genre="House", bpm=122)
+    assert members(playlist_id) == {member}
+    client.post(f"/playlists/{playlist_id}/tracks", json={"track_ids": [added]})
+    assert members(playlist_id) == {member, added}
+
+
+def test_omitting_rules_leaves_a_smart_playlist_smart(client):
+    playlist_id = make_smart(**DEEP_HOUSE)
+
+    response = client.put(f"/playlists/{playlist_id}", json={"name": "Renamed"})
+
+    assert response.json()["smart_rules"]["genre"] == "House"
+
+
+def test_expired_members_are_pruned_by_the_sweep(add_track):
+    recent = add_track(genre="Techno")
+    aged = add_track(genre="Techno")
+    playlist_id = make_smart(genre="Techno", added_within_days=30)
+    with get_db() as (_, cursor):
+        cursor.execute(
+            "UPDATE tracks SET created_at = '2000-01-01T00:00:00' WHERE id = ?",
+            (aged,),
+        )
+
+    # Reads never write, so the aged track stays until the sweep
+    assert members(playlist_id) == {recent, aged}
+
+    assert playlist_storage.prune_expired_smart_members() == 1
+    assert members(playlist_id) == {recent}
+    assert playlist_storage.get_playlist_by_id(playlist_id).track_count == 1
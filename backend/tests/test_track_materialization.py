@@ -0,0 +1,79 @@
+"""Tests for the trusted-row fast path that builds Track objects from rows."""
+
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from core.database import get_db
+from storage.track_storage import TrackStorage
+
+
+def fetch_rows(query: str = "SELECT * FROM tracks ORDER BY title"):
+    with get_db() as (_, cursor):
+        cursor.execute(query)
+        return cursor.fetchall()
+
+
+def test_trusted_rows_match_validated_rows(add_track):
+    add_track(
+        title="Full",
+        artist="Artist",
+        bpm=128,
+        key="Am",
+        duration_seconds=300,
+        last_played="2024-05-01T12:00:00",
+        metadata_complete=1,
+        missing=0,
+        energy=0.75,
+        danceability=0.5,
+        loudness_lufs=-8.5,
+    )
+    add_track(title="Sparse")
+    rows = fetch_rows()
+
+    trusted = TrackStorage.rows_to_tracks(rows)
+
+    assert trusted == [TrackStorage.row_to_track(row) for row in rows]
+    assert [track.model_dump_json() for track in trusted] == [
+        TrackStorage.row_to_track(row).model_dump_json() for row in rows
+    ]
+
+
+def test_trusted_rows_convert_column_types(add_track):
+    track_id = add_track(title="Typed", metadata_complete=1, missing=0)
+
+    (track,) = TrackStorage.rows_to_tracks(fetch_rows())
+
+    assert str(track.id) == track_id
+    assert track.metadata_complete is True
+    assert track.missing is False
+    assert isinstance(track.created_at, datetime)
+
+
+def test_projected_rows_keep_only_selected_fields(add_track):
+    add_track(title="Projected", bpm=120)
+
+    (track,) = TrackStorage.rows_to_tracks(fetch_rows("SELECT id, bpm FROM tracks"))
+
+    assert track.bpm == 120
+    assert track.title is None
+    assert track.model_dump(exclude_unset=True).keys() == {"id", "bpm"}
+
+
+def test_joined_columns_take_the_validating_path(add_track):
+    add_track(title="Joined")
+
+    (track,) = TrackStorage.rows_to_tracks(
+        fetch_rows("SELECT *, 1 AS position FROM tracks")
+    )
+
+    assert track.title == "Joined"
+
+
+@pytest.mark.parametrize("column", ["energy", "danceability"])
+def test_out_of_range_scores_are_validated(add_track, column):
+    add_track(title="Corrupt", **{column: 1.5})
+
+    with pytest.raises(ValidationError):
+        TrackStorage.rows_to_tracks(fetch_rows())
@@ -0,0 +1,70 @@
+"""Tests for waveform overviews."""
+
+from uuid import UUID
+
+import numpy as np
+import pytest
+
+from services.waveform import (
+    WAVEFORM_BYTES,
+    WAVEFORM_RESOLUTIONS,
+    compute_waveform,
+    waveform_level,
+)
+from storage.feature_storage import waveform_storage
+
+
+def test_levels_agree_with_each_other():
+    rng = np.random.default_rng(3)
+    waveform = compute_waveform(rng.uniform(-0.8, 0.8, 100_000))
+
+    assert (waveform.dtype, waveform.size) == (np.int8, WAVEFORM_BYTES)
+    highest = waveform_level(waveform, WAVEFORM_RESOLUTIONS[-1]).reshape(-1, 2)
+    for resolution in WAVEFORM_RESOLUTIONS[:-1]:
+        level = waveform_level(waveform, resolution).reshape(-1, 2)
+        grouped = highest.reshape(resolution, -1, 2)
+        assert np.array_equal(level[:, 0], grouped[:, :, 0].min(axis=1))
+        assert np.array_equal(level[:, 1], grouped[:, :, 1].max(axis=1))
+        assert np.all(level[:, 0] <= level[:, 1])
+
+
+def test_peaks_follow_the_signal():
+    quiet_then_clipped = np.r_[np.full(50_000, 0.1), np.full(50_000, 2.0)]
+
+    level = waveform_level(compute_waveform(quiet_then_clipped), 256).reshape(-1, 2)
+
+    assert np.all(level[:128] == 13)
+    assert np.all(level[128:] == 127)
+
+
+def test_short_and_empty_audio():
+    waveform = compute_waveform(np.array([0.5, -0.5]))
+
+    assert waveform.size == WAVEFORM_BYTES
+    assert compute_waveform(np.array([])) is None
+    with pytest.raises(ValueError):
+        waveform_level(waveform, 300)
+
+
+def test_waveform_endpoint(client, add_track):
+    track_id = add_track()
+    waveform = compute_waveform(np.sin(np.linspace(0, 100, 50_000)))
+    waveform_storage.save([(UUID(track_id), waveform)])
+
+    response = client.get(f"/tracks/{track_id}/waveform?resolution=256")
+
+    assert response.status_code == 200
+    assert response.headers["x-waveform-resolution"] == "256"
+    assert response.content == waveform_level(waveform, 256).tobytes()
+    etag = response.headers["etag"]
+    assert (
+        client.get(
+            f"/tracks/{track_id}/waveform?resolution=256",
+            headers={"If-None-Match": f"W/{etag}"},
+        ).status_code
+        == 304
+    )
+    other = client.get(f"/tracks/{track_id}/waveform", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert client.get(f"/tracks/{track_id}/waveform?resolution=5").status_code == 400
+    assert client.get(f"/tracks/{add_track()}/waveform").status_code == 400
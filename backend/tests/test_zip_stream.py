@@ -0,0 +1,74 @@
+"""Tests for the streaming ZIP builder."""
+
+import io
+import os
+import zipfile
+
+from utils import zip_stream
+from utils.zip_stream import stream_zip
+
+
+def read_archive(chunks) -> zipfile.ZipFile:
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    return archive
+
+
+def test_archive_contains_every_kind_of_entry(tmp_path):
+    audio = tmp_path / "track.mp3"
+    audio.write_bytes(os.urandom(5000))
+
+    archive = read_archive(
+        stream_zip(
+            [
+                ("music/track.mp3", str(audio)),
+                ("playlist.m3u", b"#EXTM3U\n"),
+                ("generated.txt", (part for part in [b"one ", b"two"])),
+            ],
+            chunk_size=1024,
+        )
+    )
+
+    assert archive.namelist() == ["music/track.mp3", "playlist.m3u", "generated.txt"]
+    assert archive.read("music/track.mp3") == audio.read_bytes()
+    assert archive.read("playlist.m3u") == b"#EXTM3U\n"
+    assert archive.read("generated.txt") == b"one two"
+    assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+
+
+def test_files_are_streamed_in_chunks(tmp_path):
+    audio = tmp_path / "track.mp3"
+    audio.write_bytes(os.urandom(10_000))
+
+    chunks = list(stream_zip([("track.mp3", str(audio))], chunk_size=1000))
+
+    assert len(chunks) >= 10
+    assert max(len(chunk) for chunk in chunks) < 2000
+    assert read_archive(chunks).read("track.mp3") == audio.read_bytes()
+
+
+def test_unreadable_files_are_left_out(tmp_path):
+    archive = read_archive(
+        stream_zip([("missing.mp3", str(tmp_path / "missing.mp3")), ("note.txt", b"x")])
+    )
+
+    assert archive.namelist() == ["note.txt"]
+
+
+def test_closing_mid_entry_closes_the_source(tmp_path, monkeypatch):
+    audio = tmp_path / "track.mp3"
+    audio.write_bytes(os.urandom(10_000))
+    opened = []
+
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(zip_stream, "open", tracking_open, raising=False)
+    chunks = stream_zip([("track.mp3", str(audio))], chunk_size=1000)
+    next(chunks)
+    next(chunks)
+
+    chunks.close()
+
+    assert [source.closed for source in opened] == [True]
@@ -0,0 +1,91 @@
+"""
+Camelot wheel helpers for harmonic mixing.
+
+Keys are stored as free text (e.g. "Am", "F#m", "Bb", "EBM" from upper-cased
+tags, or Camelot codes like "8A"). They are normalised to Camelot codes:
+a number 1-12 around the circle of fifths plus A (minor) or B (major).
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+PITCH_CLASSES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
+# Distance used when either key is unknown, roughly "unrelated keys"
+UNKNOWN_KEY_DISTANCE = 3
+
+_CAMELOT_PATTERN = re.compile(r"^0?([1-9]|1[0-2])\s*([AB])$", re.IGNORECASE)
+_KEY_PATTERN = re.compile(
+    r"^([A-G])\s*([#♯b♭]?)\s*(m|min|minor|maj|major)?$", re.IGNORECASE
+)
+
+
+def parse_camelot(key: Optional[str]) -> Optional[Tuple[int, str]]:
+    """
+    Convert a key name or Camelot code to (number, letter).
+
+    Returns None for empty or unrecognised keys.
+    """
+    if not key:
+        return None
+    text = key.strip()
+
+    match = _CAMELOT_PATTERN.match(text)
+    if match:
+        return int(match.group(1)), match.group(2).upper()
+
+    match = _KEY_PATTERN.match(text)
+    if not match:
+        return None
+    note, accidental, quality = match.groups()
+    pitch = PITCH_CLASSES[note.upper()]
+    if accidental in ("#", "♯"):
+        pitch += 1
+    elif accidental:
+        pitch -= 1
+    minor = bool(quality) and quality.lower() in ("m", "min", "minor")
+
+    # Each step round the wheel is a fifth (7 semitones); C major is 8B, A minor 8A
+    offset = 5 if minor else 8
+    number = (pitch % 12 * 7 + offset) % 12 or 12
+    return number, "A" if minor else "B"
+
+
+def to_camelot(key: Optional[str]) -> Optional[str]:
+    """Convert a key to its Camelot code (e.g. "Am" -> "8A")."""
+    code = parse_camelot(key)
+    if code is None:
+        return None
+    return f"{code[0]}{code[1]}"
+
+
+def camelot_distance(a: Optional[Tuple[int, str]], b: Optional[Tuple[int, str]]) -> int:
+    """
+    Number of harmonic steps between two Camelot codes.
+
+    Same key is 0; a step round the wheel or a switch to the relative
+    major/minor is 1 each.
+    """
+    if a is None or b is None:
+        return UNKNOWN_KEY_DISTANCE
+    steps = abs(a[0] - b[0]) % 12
+    return min(steps, 12 - steps) + (a[1] != b[1])
+
+
+def compatible_codes(code: Tuple[int, str]) -> List[Tuple[str, int]]:
+    """
+    Camelot codes that mix harmonically with `code`, with their distance.
+
+    Compatible keys are the same key, one step either way round the wheel
+    and the relative major/minor.
+    """
+    number, letter = code
+    relative = "B" if letter == "A" else "A"
+    up = number % 12 + 1
+    down = (number - 2) % 12 + 1
+    return [
+        (f"{number}{letter}", 0),
+        (f"{up}{letter}", 1),
+        (f"{down}{letter}", 1),
+        (f"{number}{relative}", 1),
+    ]
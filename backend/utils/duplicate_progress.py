@@ -0,0 +1,82 @@
+"""
+Progress tracking and execution for duplicate detection jobs.
+
+Scans run on a dedicated single-thread pool: comparing fingerprints loads
+the whole library into memory, so only one scan runs at a time.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from models import DuplicateScanStatus, DuplicateScanStatusResponse
+
+# Duplicate groups as (track IDs, largest bit error rate in the group)
+DuplicateReport = List[Tuple[List[UUID], float]]
+
+
+class DuplicateScanTracker:
+    """Tracks progress and reports of duplicate detection jobs."""
+
+    def __init__(self):
+        self._jobs: Dict[UUID, DuplicateScanStatusResponse] = {}
+        self._reports: Dict[UUID, DuplicateReport] = {}
+        # Created up front so concurrent requests share the single worker
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="duplicate-scan"
+        )
+
+    def create_job(self, job_id: UUID) -> DuplicateScanStatusResponse:
+        """Initialize a new duplicate scan in the queued state."""
+        job = DuplicateScanStatusResponse(
+            job_id=job_id,
+            status=DuplicateScanStatus.QUEUED,
+            message="Waiting for other duplicate scans to finish...",
+            errors=[],
+        )
+        self._jobs[job_id] = job
+        return job
+
+    def submit(self, job_id: UUID, func: Callable, *args):
+        """Queue a job function on the duplicate scan thread pool."""
+        self._executor.submit(func, job_id, *args)
+
+    def update_job(self, job_id: UUID, **kwargs):
+        """Update job progress."""
+        if job_id not in self._jobs:
+            return
+        job = self._jobs[job_id]
+        for field, value in kwargs.items():
+            setattr(job, field, value)
+
+    def complete_job(
+        self, job_id: UUID, report: DuplicateReport, duration_seconds: float
+    ):
+        """Mark job as completed and keep its report."""
+        if job_id in self._jobs:
+            job = self._jobs[job_id]
+            job.status = DuplicateScanStatus.COMPLETED
+            job.duplicate_groups = len(report)
+            job.duplicate_tracks = sum(len(track_ids) for track_ids, _ in report)
+            job.duration_seconds = round(duration_seconds, 3)
+            job.message = f"Found {len(report)} group(s) of duplicate tracks"
+            self._reports[job_id] = report
+
+    def fail_job(self, job_id: UUID, error: str):
+        """Mark job as failed."""
+        if job_id in self._jobs:
+            self._jobs[job_id].status = DuplicateScanStatus.FAILED
+            self._jobs[job_id].message = f"Duplicate scan failed: {error}"
+            self._jobs[job_id].errors.append(error)
+
+    def get_job_status(self, job_id: UUID) -> Optional[DuplicateScanStatusResponse]:
+        """Get current job status."""
+        return self._jobs.get(job_id)
+
+    def get_report(self, job_id: UUID) -> Optional[DuplicateReport]:
+        """Get the duplicate groups of a completed job."""
+        return self._reports.get(job_id)
+
+
+# Global progress tracker
+duplicate_tracker = DuplicateScanTracker()
@@ -0,0 +1,140 @@
+"""
+Progress tracking and execution for playlist export jobs.
+
+Exports run on a small dedicated thread pool rather than as FastAPI
+background tasks, so long copies queue behind each other instead of
+occupying the threads that serve API requests.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from uuid import UUID
+
+from models import ExportJobStatusResponse, ExportStatus
+
+# Number of exports that run at the same time; further jobs wait in the queue
+EXPORT_JOB_WORKERS = 1
+
+FINISHED_STATUSES = {
+    ExportStatus.COMPLETED,
+    ExportStatus.FAILED,
+    ExportStatus.CANCELLED,
+}
+
+
+class ExportProgressTracker:
+    """Tracks progress of playlist export jobs."""
+
+    def __init__(self):
+        self._jobs: Dict[UUID, ExportJobStatusResponse] = {}
+        self._cancel_events: Dict[UUID, threading.Event] = {}
+        # Created here rather than on first submit, so concurrent requests
+        # cannot each start a pool; its threads only start with the first job
+        self._executor = ThreadPoolExecutor(
+            max_workers=EXPORT_JOB_WORKERS, thread_name_prefix="playlist-export"
+        )
+
+    def create_job(
+        self, job_id: UUID, playlist_id: UUID, export_format: str
+    ) -> ExportJobStatusResponse:
+        """Initialize a new export job in the queued state."""
+        job = ExportJobStatusResponse(
+            job_id=job_id,
+            playlist_id=playlist_id,
+            status=ExportStatus.QUEUED,
+            message="Waiting for other exports to finish...",
+            progress=0.0,
+            format=export_format,
+            files_copied=0,
+            files_skipped=0,
+            bytes_copied=0,
+            errors=[],
+        )
+        self._jobs[job_id] = job
+        self._cancel_events[job_id] = threading.Event()
+        return job
+
+    def submit(self, job_id: UUID, func: Callable, *args):
+        """Queue a job function on the export thread pool."""
+        self._executor.submit(func, job_id, *args)
+
+    def update_job(self, job_id: UUID, **kwargs):
+        """Update job progress."""
+        if job_id not in self._jobs:
+            return
+
+        job = self._jobs[job_id]
+        error = kwargs.pop("error", None)
+        if error:
+            job.errors.append(error)
+        for field, value in kwargs.items():
+            setattr(job, field, value)
+
+    def record_copy_stats(self, job_id: UUID, stats: dict):
+        """Copy file transfer stats onto the job."""
+        if job_id not in self._jobs:
+            return
+
+        job = self._jobs[job_id]
+        job.files_copied = stats["files_copied"]
+        job.files_skipped = stats["files_skipped"]
+        job.bytes_copied = stats["bytes_copied"]
+        elapsed = stats.get("elapsed_seconds", 0)
+        job.duration_seconds = round(elapsed, 3)
+        job.throughput_bytes_per_second = (
+            round(stats["bytes_copied"] / elapsed, 1) if elapsed > 0 else None
+        )
+        if job.files_total:
+            done = job.files_copied + job.files_skipped + len(job.errors)
+            job.progress = round(done / job.files_total * 100, 1)
+
+    def get_cancel_event(self, job_id: UUID) -> Optional[threading.Event]:
+        """Get the event that signals a cancellation request for a job."""
+        return self._cancel_events.get(job_id)
+
+    def cancel_job(self, job_id: UUID) -> bool:
+        """Request cancellation. Returns False if the job already finished."""
+        job = self._jobs.get(job_id)
+        event = self._cancel_events.get(job_id)
+        if job is None or event is None or job.status in FINISHED_STATUSES:
+            return False
+        event.set()
+        if job.status == ExportStatus.QUEUED:
+            job.message = "Cancelling..."
+        else:
+            job.message = "Cancelling after files in progress finish..."
+        return True
+
+    def complete_job(self, job_id: UUID, file_path: str):
+        """Mark job as completed."""
+        if job_id in self._jobs:
+            job = self._jobs[job_id]
+            job.status = ExportStatus.COMPLETED
+            job.progress = 100.0
+            job.file_path = file_path
+            job.message = "Export completed"
+            self._cancel_events.pop(job_id, None)
+
+    def mark_cancelled(self, job_id: UUID):
+        """Mark job as cancelled once its worker has stopped."""
+        if job_id in self._jobs:
+            self._jobs[job_id].status = ExportStatus.CANCELLED
+            self._jobs[job_id].message = "Export cancelled"
+            self._cancel_events.pop(job_id, None)
+
+    def fail_job(self, job_id: UUID, error: str):
+        """Mark job as failed."""
+        if job_id in self._jobs:
+            self._jobs[job_id].status = ExportStatus.FAILED
+            self._jobs[job_id].message = f"Export failed: {error}"
+            self._jobs[job_id].errors.append(error)
+            self._cancel_events.pop(job_id, None)
+
+    def get_job_status(self, job_id: UUID) -> Optional[ExportJobStatusResponse]:
+        """Get current job status."""
+        return self._jobs.get(job_id)
+
+
+# Global progress tracker
+export_tracker = ExportProgressTracker()
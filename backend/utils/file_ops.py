@@ -0,0 +1,229 @@
+"""
+File operations for exporting audio files.
+
+Files are synced rather than blindly copied: a destination that already
+matches its source (same size and modification time) is skipped, and the
+remaining files are transferred by a bounded thread pool. Transfers can use
+hardlinks or copy-on-write clones when source and destination share a
+filesystem, falling back to a regular copy otherwise.
+"""
+
+import errno
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models import CopyMode
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Linux ioctl that clones a file's extents (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+# Thread pool size for file transfers; bounded so exports cannot saturate the disk
+EXPORT_COPY_WORKERS = 4
+
+# copy_file_range errors meaning "not possible here" rather than a failed
+# read or write: different filesystems, or no support in the kernel or filesystem
+COPY_RANGE_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+}
+
+# FAT/exFAT (typical for USB sticks) store mtimes with 2 second resolution
+MTIME_TOLERANCE_SECONDS = 2
+
+
+def plan_destinations(
+    source_paths: List[str], destination_folder: Path
+) -> Dict[str, Path]:
+    """
+    Map each source file to a stable destination path.
+
+    Names only depend on the order of `source_paths`, not on what is already
+    on disk, so re-exporting the same playlist targets the same files.
+    Duplicate file names get a numeric suffix.
+    """
+    destinations = {}
+    used_names = set()
+    for source in source_paths:
+        if source in destinations:
+            continue
+        source_path = Path(source)
+        name = source_path.name
+        counter = 1
+        while name.lower() in used_names:
+            name = f"{source_path.stem}_{counter}{source_path.suffix}"
+            counter += 1
+        used_names.add(name.lower())
+        destinations[source] = destination_folder / name
+    return destinations
+
+
+def is_up_to_date(source_stat: os.stat_result, destination: Path) -> bool:
+    """Check whether a destination already holds the source's contents."""
+    try:
+        dest_stat = destination.stat()
+    except OSError:
+        return False
+    if (dest_stat.st_dev, dest_stat.st_ino) == (source_stat.st_dev, source_stat.st_ino):
+        return True
+    return (
+        dest_stat.st_size == source_stat.st_size
+        and abs(dest_stat.st_mtime - source_stat.st_mtime) <= MTIME_TOLERANCE_SECONDS
+    )
+
+
+def _clone_or_copy_range(source: Path, destination: Path, size: int):
+    """
+    Clone a file's extents, falling back to in-kernel copy_file_range and
+    then to a plain copy.
+    """
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        if FCNTL_AVAILABLE:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+        if hasattr(os, "copy_file_range"):
+            remaining = size
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+                return
+            except OSError as e:
+                if e.errno not in COPY_RANGE_UNSUPPORTED_ERRNOS:
+                    raise
+                # Start the plain copy over from the beginning
+                src.seek(0)
+                dst.seek(0)
+                dst.truncate()
+        shutil.copyfileobj(src, dst)
+
+
+def transfer_file(source: Path, destination: Path, mode: CopyMode, size: int):
+    """
+    Transfer one file to `destination` using the requested mode.
+
+    Copies are written to a temporary name and renamed into place, so an
+    interrupted export never leaves a partial file that looks complete.
+    """
+    if mode == CopyMode.HARDLINK:
+        try:
+            if destination.exists():
+                destination.unlink()
+            os.link(source, destination)
+            return
+        except OSError:
+            # Different filesystem or no hardlink support: copy instead
+            pass
+
+    partial = destination.with_name(destination.name + ".partial")
+    try:
+        if mode == CopyMode.REFLINK:
+            _clone_or_copy_range(source, partial, size)
+        else:
+            shutil.copyfile(source, partial)
+        shutil.copystat(source, partial)
+        os.replace(partial, destination)
+    finally:
+        if partial.exists():
+            partial.unlink()
+
+
+class SyncCancelled(Exception):
+    """Raised for files skipped because the sync was cancelled."""
+
+
+def _sync_one(
+    source: str,
+    destination: Path,
+    mode: CopyMode,
+    cancel_event: Optional[threading.Event],
+) -> Tuple[bool, int]:
+    """Sync a single file. Returns (transferred, size in bytes)."""
+    if cancel_event is not None and cancel_event.is_set():
+        raise SyncCancelled()
+    source_stat = os.stat(source)
+    if is_up_to_date(source_stat, destination):
+        return False, source_stat.st_size
+    transfer_file(Path(source), destination, mode, source_stat.st_size)
+    return True, source_stat.st_size
+
+
+def sync_files(
+    source_paths: List[str],
+    destination_folder: Path,
+    mode: CopyMode = CopyMode.COPY,
+    max_workers: int = EXPORT_COPY_WORKERS,
+    on_progress: Optional[Callable[[dict, Optional[str]], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+) -> Tuple[Dict[str, Path], List[str], dict]:
+    """
+    Sync source files into a destination folder in parallel.
+
+    Args:
+        on_progress: Called from the calling thread after each file with the
+            running stats and an error message if that file failed
+        cancel_event: When set, files not yet started are skipped and the
+            stats are marked as cancelled
+
+    Returns:
+        Tuple of (mapping from source path to destination Path for every
+        file now present, list of error messages, stats dict with
+        files_copied, files_skipped, bytes_copied, elapsed_seconds and
+        cancelled)
+    """
+    destinations = plan_destinations(source_paths, destination_folder)
+    file_mapping = {}
+    errors = []
+    stats = {"files_copied": 0, "files_skipped": 0, "bytes_copied": 0}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_sync_one, source, destination, mode, cancel_event): source
+            for source, destination in destinations.items()
+        }
+        for future in as_completed(futures):
+            source = futures[future]
+            error = None
+            try:
+                transferred, size = future.result()
+            except SyncCancelled:
+                continue
+            except FileNotFoundError:
+                error = f"File not found: {source}"
+            except OSError as e:
+                error = f"Error copying {source}: {str(e)}"
+            else:
+                file_mapping[source] = destinations[source]
+                if transferred:
+                    stats["files_copied"] += 1
+                    stats["bytes_copied"] += size
+                else:
+                    stats["files_skipped"] += 1
+            if error:
+                errors.append(error)
+            if on_progress is not None:
+                stats["elapsed_seconds"] = time.perf_counter() - start
+                on_progress(stats, error)
+
+    stats["elapsed_seconds"] = time.perf_counter() - start
+    stats["cancelled"] = cancel_event is not None and cancel_event.is_set()
+    return file_mapping, errors, stats
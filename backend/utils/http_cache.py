@@ -0,0 +1,45 @@
+"""
+Helpers for HTTP conditional requests on binary track resources.
+"""
+
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against a resource's ETag.
+
+    Weak and strong forms of the same tag match, as RFC 9110 requires for
+    If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[str],
+) -> bool:
+    """
+    Decide whether a GET can be answered with 304 Not Modified.
+
+    If-Modified-Since is only consulted when If-None-Match is absent, and
+    unparseable dates never match.
+    """
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if not if_modified_since or not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(
+            if_modified_since
+        )
+    except (TypeError, ValueError):
+        return False
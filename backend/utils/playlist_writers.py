@@ -0,0 +1,341 @@
+"""
+Streaming playlist writers.
+
+Each format is a `PlaylistWriter` subclass that turns a playlist and its
+entries into text chunks, so a playlist can be written to a file or sent as
+a response without building the whole document in memory. Writers register
+themselves for a `Format`; supporting another format (e.g. Traktor NML)
+means adding a `Format` value and a registered subclass.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+from urllib.parse import quote
+from xml.sax.saxutils import escape, quoteattr
+
+from models import Format, PlaylistDetail, Track
+
+# Number of entries rendered before a chunk is handed to the output
+WRITER_BATCH_SIZE = 500
+
+# A track and its location relative to the playlist file (None if not exported)
+PlaylistEntry = Tuple[Track, Optional[str]]
+
+PLAYLIST_WRITERS: Dict[Format, "PlaylistWriter"] = {}
+
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def register_writer(
+    export_format: Format,
+) -> Callable[[Type["PlaylistWriter"]], Type["PlaylistWriter"]]:
+    """Class decorator that registers a writer for an export format."""
+
+    def decorator(cls: Type["PlaylistWriter"]) -> Type["PlaylistWriter"]:
+        PLAYLIST_WRITERS[export_format] = cls()
+        return cls
+
+    return decorator
+
+
+def get_writer(export_format: Format) -> "PlaylistWriter":
+    """Return the writer for a format. Raises ValueError if unsupported."""
+    writer = PLAYLIST_WRITERS.get(export_format)
+    if writer is None:
+        raise ValueError(f"Unsupported format: {export_format}")
+    return writer
+
+
+def _single_line(value) -> str:
+    """Flatten a value for line-based formats where a newline starts a new entry."""
+    return " ".join(str(value).splitlines())
+
+
+class PlaylistWriter(ABC):
+    """Base class for streaming playlist writers."""
+
+    extension: str = ""
+    media_type: str = "text/plain"
+    # Whether entries for tracks that were not exported are still listed
+    include_missing: bool = False
+
+    def header(self, playlist: PlaylistDetail) -> str:
+        """Text written before the first entry."""
+        return ""
+
+    @abstractmethod
+    def entry(self, index: int, track: Track, location: Optional[str]) -> str:
+        """Text for one entry. `index` counts written entries from 1."""
+
+    def footer(self, playlist: PlaylistDetail, entry_count: int) -> str:
+        """Text written after the last entry."""
+        return ""
+
+    def iter_chunks(
+        self,
+        playlist: PlaylistDetail,
+        entries: Iterable[PlaylistEntry],
+        batch_size: int = WRITER_BATCH_SIZE,
+    ) -> Iterator[str]:
+        """Render the playlist as a sequence of text chunks."""
+        yield self.header(playlist)
+        batch: List[str] = []
+        count = 0
+        for track, location in entries:
+            if location is None and not self.include_missing:
+                continue
+            count += 1
+            batch.append(self.entry(count, track, location))
+            if len(batch) >= batch_size:
+                yield "".join(batch)
+                batch.clear()
+        if batch:
+            yield "".join(batch)
+        yield self.footer(playlist, count)
+
+
+@register_writer(Format.M3U)
+class M3UWriter(PlaylistWriter):
+    """Extended M3U."""
+
+    extension = "m3u"
+    media_type = "audio/x-mpegurl"
+
+    def header(self, playlist: PlaylistDetail) -> str:
+        return "#EXTM3U\n"
+
+    def entry(self, index: int, track: Track, location: Optional[str]) -> str:
+        artist = _single_line(track.artist or "Unknown")
+        title = _single_line(track.title or "Unknown")
+        duration = track.duration_seconds or -1
+        return f"#EXTINF:{duration},{artist} - {title}\n{_single_line(location)}\n"
+
+
+@register_writer(Format.M3U8)
+class M3U8Writer(M3UWriter):
+    """Extended M3U with the extension that marks it as UTF-8."""
+
+    extension = "m3u8"
+    media_type = "application/vnd.apple.mpegurl"
+
+
+@register_writer(Format.PLS)
+class PLSWriter(PlaylistWriter):
+    """PLS version 2. The entry count is written last, once it is known."""
+
+    extension = "pls"
+    media_type = "audio/x-scpls"
+
+    def header(self, playlist: PlaylistDetail) -> str:
+        return "[playlist]\n"
+
+    def entry(self, index: int, track: Track, location: Optional[str]) -> str:
+        artist = _single_line(track.artist or "Unknown")
+        title = _single_line(track.title or "Unknown")
+        lines = (
+            f"File{index}={_single_line(location)}\nTitle{index}={artist} - {title}\n"
+        )
+        if track.duration_seconds:
+            lines += f"Length{index}={track.duration_seconds}\n"
+        return lines + "\n"
+
+    def footer(self, playlist: PlaylistDetail, entry_count: int) -> str:
+        return f"NumberOfEntries={entry_count}\nVersion=2\n"
+
+
+@register_writer(Format.XSPF)
+class XSPFWriter(PlaylistWriter):
+    """XSPF (XML Shareable Playlist Format) version 1."""
+
+    extension = "xspf"
+    media_type = "application/xspf+xml"
+
+    def header(self, playlist: PlaylistDetail) -> str:
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            '<playlist version="1" xmlns="http://xspf.org/ns/0/">\n',
+            f"  <title>{escape(playlist.name or '')}</title>\n",
+        ]
+        if playlist.description:
+            lines.append(f"  <annotation>{escape(playlist.description)}</annotation>\n")
+        lines.append("  <trackList>\n")
+        return "".join(lines)
+
+    def entry(self, index: int, track: Track, location: Optional[str]) -> str:
+        lines = ["    <track>\n"]
+        if track.title:
+            lines.append(f"      <title>{escape(track.title)}</title>\n")
+        if track.artist:
+            lines.append(f"      <creator>{escape(track.artist)}</creator>\n")
+        if track.album:
+            lines.append(f"      <album>{escape(track.album)}</album>\n")
+        if track.duration_seconds:
+            lines.append(
+                f"      <duration>{track.duration_seconds * 1000}</duration>\n"
+            )
+        # Locations are URIs, so relative paths are percent-encoded
+        lines.append(f"      <location>{escape(quote(location))}</location>\n")
+        lines.append("    </track>\n")
+        return "".join(lines)
+
+    def footer(self, playlist: PlaylistDetail, entry_count: int) -> str:
+        return "  </trackList>\n</playlist>\n"
+
+
+@register_writer(Format.REKORDBOX)
+class RekordboxXMLWriter(PlaylistWriter):
+    """
+    Rekordbox XML library with one playlist.
+
+    Rekordbox needs absolute file URIs, so tracks point at their library
+    files rather than the exported copies. Track IDs are the entry numbers,
+    which lets the playlist node list its keys without keeping the entries.
+    """
+
+    extension = "xml"
+    media_type = "application/xml"
+    include_missing = True
+
+    def header(self, playlist: PlaylistDetail) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<DJ_PLAYLISTS Version="1.0.0">\n'
+            '  <PRODUCT Name="Beat Portal" Version="1.0.0" Company=""/>\n'
+            f'  <COLLECTION Entries="{playlist.track_count or 0}">\n'
+        )
+
+    def entry(self, index: int, track: Track, location: Optional[str]) -> str:
+        attributes = [
+            f'TrackID="{index}"',
+            f"Name={quoteattr(track.title or '')}",
+            f"Artist={quoteattr(track.artist or '')}",
+            f"Album={quoteattr(track.album or '')}",
+            f"Genre={quoteattr(track.genre or '')}",
+        ]
+        if track.year:
+            attributes.append(f'Year="{track.year}"')
+        if track.duration_seconds:
+            attributes.append(f'TotalTime="{track.duration_seconds}"')
+        if track.bpm:
+            attributes.append(f'AverageBpm="{track.bpm:.2f}"')
+        if track.key:
+            attributes.append(f"Tonality={quoteattr(track.key)}")
+        if track.file_size_bytes:
+            attributes.append(f'Size="{track.file_size_bytes}"')
+        if track.file_path:
+            path = Path(track.file_path).as_posix()
+            if not path.startswith("/"):
+                path = f"/{path}"
+            uri = "file://localhost" + quote(path, safe="/:")
+            attributes.append(f"Location={quoteattr(uri)}")
+        return f"    <TRACK {' '.join(attributes)}/>\n"
+
+    def footer(self, playlist: PlaylistDetail, entry_count: int) -> str:
+        keys = "".join(
+            f'        <TRACK Key="{i}"/>\n' for i in range(1, entry_count + 1)
+        )
+        return (
+            "  </COLLECTION>\n"
+            "  <PLAYLISTS>\n"
+            '    <NODE Type="0" Name="ROOT" Count="1">\n'
+            f'      <NODE Name={quoteattr(playlist.name or "Playlist")} Type="1" '
+            f'KeyType="0" Entries="{entry_count}">\n'
+            f"{keys}"
+            "      </NODE>\n"
+            "    </NODE>\n"
+            "  </PLAYLISTS>\n"
+            "</DJ_PLAYLISTS>\n"
+        )
+
+
+@register_writer(Format.JSON)
+class JSONWriter(PlaylistWriter):
+    """JSON document listing every track, with a null path if not exported."""
+
+    extension = "json"
+    media_type = "application/json"
+    include_missing = True
+
+    def header(self, playlist: PlaylistDetail) -> str:
+        fields = {
+            "name": playlist.name,
+            "description": playlist.description,
+            "track_count": playlist.track_count,
+            "total_duration_seconds": playlist.total_duration_seconds,
+        }
+        lines = [
+            f"  {_json_encoder.encode(key)}: {_json_encoder.encode(value)},\n"
+            for key, value in fields.items()
+        ]
+        return "{\n" + "".join(lines) + '  "tracks": ['
+
+    def entry(self, index: int, track: Track, location: Optional[str]) -> str:
+        data = {
+            "id": str(track.id),
+            "title": track.title,
+            "artist": track.artist,
+            "album": track.album,
+            "file_path": location,
+            "duration_seconds": track.duration_seconds,
+        }
+        # Equivalent to json.dumps(data, indent=2) nested under "tracks", but
+        # encodes values individually with the C encoder
+        fields = ",\n".join(
+            f"      {_json_encoder.encode(key)}: {_json_encoder.encode(value)}"
+            for key, value in data.items()
+        )
+        separator = "\n" if index == 1 else ",\n"
+        return f"{separator}    {{\n{fields}\n    }}"
+
+    def footer(self, playlist: PlaylistDetail, entry_count: int) -> str:
+        return "\n  ]\n}\n" if entry_count else "]\n}\n"
+
+
+def playlist_entries(
+    tracks_list: Iterable[Track], file_mapping: Dict[str, Path], base_dir: Path
+) -> Iterator[PlaylistEntry]:
+    """Pair tracks with their exported location relative to `base_dir`."""
+    # Exported files share a handful of folders, so resolve each folder once
+    folder_prefixes: Dict[str, str] = {}
+    for track in tracks_list:
+        copied_file = file_mapping.get(track.file_path) if track.file_path else None
+        if copied_file is None:
+            yield track, None
+            continue
+        folder, name = os.path.split(copied_file)
+        prefix = folder_prefixes.get(folder)
+        if prefix is None:
+            relative_folder = Path(folder).relative_to(base_dir).as_posix()
+            prefix = "" if relative_folder == "." else f"{relative_folder}/"
+            folder_prefixes[folder] = prefix
+        yield track, prefix + name
+
+
+def write_playlist_file(
+    export_format: Format,
+    file_path: Path,
+    playlist: PlaylistDetail,
+    tracks_list: Iterable[Track],
+    file_mapping: Dict[str, Path],
+):
+    """Write a playlist file with paths relative to its own folder."""
+    writer = get_writer(export_format)
+    entries = playlist_entries(tracks_list, file_mapping, file_path.parent)
+    with open(file_path, "w", encoding="utf-8") as f:
+        for chunk in writer.iter_chunks(playlist, entries):
+            f.write(chunk)
+
+
+def encode_playlist(
+    export_format: Format,
+    playlist: PlaylistDetail,
+    entries: Iterable[PlaylistEntry],
+) -> Iterator[bytes]:
+    """Render a playlist as UTF-8 chunks for a response or archive entry."""
+    writer = get_writer(export_format)
+    for chunk in writer.iter_chunks(playlist, entries):
+        if chunk:
+            yield chunk.encode("utf-8")
@@ -0,0 +1,114 @@
+"""
+Progress tracking for missing-file reconciliation jobs.
+
+Only one reconciliation runs at a time; starting another while one is
+queued or running returns the active job, so the endpoint can be called on
+a schedule without piling up sweeps.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+from uuid import UUID, uuid4
+
+from models import ReconcileStatus, ReconcileStatusResponse
+
+# Concurrent stat calls; network shares are bound by round trips, not
+# bandwidth, so many requests in flight hide the latency
+RECONCILE_STAT_WORKERS = 32
+
+# Paths checked (and flags written) per batch
+RECONCILE_BATCH_SIZE = 2000
+
+# Errors kept on the job; further unchecked paths are only counted
+MAX_REPORTED_ERRORS = 100
+
+ACTIVE_STATUSES = {ReconcileStatus.QUEUED, ReconcileStatus.RUNNING}
+
+
+class ReconcileProgressTracker:
+    """Tracks progress of missing-file reconciliation jobs."""
+
+    def __init__(self):
+        self._jobs: Dict[UUID, ReconcileStatusResponse] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="missing-file-reconcile"
+        )
+        self._lock = threading.Lock()
+
+    def create_job(self, job_id: UUID) -> ReconcileStatusResponse:
+        """Initialize a new reconciliation job in the queued state."""
+        job = ReconcileStatusResponse(
+            job_id=job_id,
+            status=ReconcileStatus.QUEUED,
+            message="Reconciliation queued",
+            progress=0.0,
+            tracks_checked=0,
+            newly_missing=0,
+            found_again=0,
+            tracks_unchecked=0,
+            errors=[],
+        )
+        self._jobs[job_id] = job
+        return job
+
+    def start_job(self, func: Callable) -> ReconcileStatusResponse:
+        """
+        Queue a reconciliation unless one is already queued or running.
+
+        Returns:
+            The new job, or the active one
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status in ACTIVE_STATUSES:
+                    return job
+            job = self.create_job(uuid4())
+        self._executor.submit(func, job.job_id)
+        return job
+
+    def update_job(self, job_id: UUID, **kwargs):
+        """Update job progress."""
+        if job_id not in self._jobs:
+            return
+
+        job = self._jobs[job_id]
+        error = kwargs.pop("error", None)
+        if error:
+            job.tracks_unchecked += 1
+            if len(job.errors) < MAX_REPORTED_ERRORS:
+                job.errors.append(error)
+        for field, value in kwargs.items():
+            setattr(job, field, value)
+
+    def complete_job(self, job_id: UUID, duration_seconds: float):
+        """Mark job as completed."""
+        if job_id in self._jobs:
+            job = self._jobs[job_id]
+            job.status = ReconcileStatus.COMPLETED
+            job.progress = 100.0
+            job.duration_seconds = round(duration_seconds, 3)
+            job.message = (
+                f"Checked {job.tracks_checked} file(s): {job.tracks_missing} missing, "
+                f"{job.newly_missing} newly"
+            )
+
+    def fail_job(self, job_id: UUID, error: str):
+        """Mark job as failed."""
+        if job_id in self._jobs:
+            self._jobs[job_id].status = ReconcileStatus.FAILED
+            self._jobs[job_id].message = f"Reconciliation failed: {error}"
+            self._jobs[job_id].errors.append(error)
+
+    def is_active(self, job_id: UUID) -> bool:
+        """Whether a job is still queued or running."""
+        job = self._jobs.get(job_id)
+        return job is not None and job.status in ACTIVE_STATUSES
+
+    def get_job_status(self, job_id: UUID) -> Optional[ReconcileStatusResponse]:
+        """Get current job status."""
+        return self._jobs.get(job_id)
+
+
+# Global progress tracker
+reconcile_tracker = ReconcileProgressTracker()
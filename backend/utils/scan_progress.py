@@ -24,6 +24,7 @@ class ScanProgressTracker:
             files_scanned=0,
             files_added=0,
             files_skipped=0,
+            files_moved=0,
             errors=[],
             paths=paths or [],
         )
@@ -43,6 +44,8 @@ class ScanProgressTracker:
             scan.files_added = kwargs["files_added"]
         if "files_skipped" in kwargs:
             scan.files_skipped = kwargs["files_skipped"]
+        if "files_moved" in kwargs:
+            scan.files_moved = kwargs["files_moved"]
         if "error" in kwargs:
             if scan.errors is None:
                 scan.errors = []
@@ -2,11 +2,15 @@
 Utility functions for scanning and processing audio files.
 """
 
+import base64
+import binascii
+import hashlib
 import os
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from typing import List, Tuple, Optional
-from mutagen import File as MutagenFile
+from mutagen import File as MutagenFile, MutagenError
+from mutagen.flac import Picture
 from mutagen.id3 import ID3NoHeaderError
 
 from models import TrackCreate
@@ -15,6 +19,14 @@ from models import TrackCreate
 METADATA_EXTRACTION_TIMEOUT = 10
 
 
+# Bytes read from each end of a file for its partial content hash
+CONTENT_HASH_BLOCK_BYTES = 64 * 1024
+
+
+# Picture type of the front cover in ID3 APIC frames and FLAC picture blocks
+FRONT_COVER_PICTURE_TYPE = 3
+
+
 # DJ-relevant audio formats (excluding formats commonly used in system files)
 AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".ogg", ".aiff", ".aif"}
 
@@ -61,6 +73,47 @@ def _get_file_props(file_path: str) -> dict:
     }
 
 
+def partial_content_hash(file_path: str) -> Optional[str]:
+    """
+    Hash a file's size and its first and last blocks.
+
+    Reads at most 2 * CONTENT_HASH_BLOCK_BYTES however large the file is, so
+    it is cheap to compute during scans. It identifies a file across moves
+    and renames; it is not a check that two files are byte-for-byte equal.
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            digest = hashlib.blake2b(size.to_bytes(8, "little"), digest_size=16)
+            digest.update(f.read(CONTENT_HASH_BLOCK_BYTES))
+            if size > CONTENT_HASH_BLOCK_BYTES:
+                f.seek(max(CONTENT_HASH_BLOCK_BYTES, size - CONTENT_HASH_BLOCK_BYTES))
+                digest.update(f.read(CONTENT_HASH_BLOCK_BYTES))
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def check_file_exists(file_path: str) -> Tuple[Optional[bool], Optional[str]]:
+    """
+    Check whether a file exists with a single stat call.
+
+    Returns:
+        Tuple of (True/False, None), or (None, error message) when the path
+        could not be checked (e.g. permission denied or an unreachable share)
+    """
+    try:
+        os.stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return False, None
+    except OSError as e:
+        return None, str(e)
+    return True, None
+
+
 def _extract_tag(tags, keys):
     """Extract tag value using multiple possible keys."""
     for key in keys:
@@ -132,6 +185,35 @@ def _extract_audio_properties(audio_file, file_props):
         file_props["sample_rate_hz"] = int(info.sample_rate)
 
 
+def _extract_artwork(audio_file) -> Optional[bytes]:
+    """
+    Get the embedded cover image: ID3 APIC frames (MP3, AIFF, WAV), FLAC
+    picture blocks, Vorbis comment pictures or MP4 covr atoms. The front
+    cover is preferred when several pictures are embedded.
+    """
+    pictures = [(p.type, p.data) for p in getattr(audio_file, "pictures", None) or []]
+    tags = getattr(audio_file, "tags", None)
+    if tags:
+        if hasattr(tags, "getall"):
+            pictures.extend((frame.type, frame.data) for frame in tags.getall("APIC"))
+        else:
+            for value in tags.get("metadata_block_picture", []):
+                try:
+                    picture = Picture(base64.b64decode(value))
+                except (binascii.Error, MutagenError):
+                    continue
+                pictures.append((picture.type, picture.data))
+            for cover in tags.get("covr", []):
+                pictures.append((FRONT_COVER_PICTURE_TYPE, bytes(cover)))
+
+    if not pictures:
+        return None
+    for picture_type, data in pictures:
+        if picture_type == FRONT_COVER_PICTURE_TYPE:
+            return data
+    return pictures[0][1]
+
+
 def _create_error_response(
     file_path: str, error_msg: str
 ) -> Tuple[TrackCreate, str, dict]:
@@ -242,6 +324,7 @@ def _extract_metadata_sync(file_path: str) -> Tuple[TrackCreate, Optional[str],
     file_props = _get_file_props(file_path)
     title, artist, album, year, genre, bpm, key = _extract_tags(audio_file)
     _extract_audio_properties(audio_file, file_props)
+    file_props["artwork"] = _extract_artwork(audio_file)
 
     if not title:
         title = Path(file_path).stem
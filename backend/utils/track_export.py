@@ -0,0 +1,90 @@
+"""
+Streaming encoders for exporting tracks as NDJSON or CSV.
+
+Rows are read from a server-side cursor in batches and each batch is encoded
+into a single chunk, so memory use stays constant regardless of library size.
+"""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator, List, Optional
+
+from core.database import get_db
+from models import Track
+from storage.track_storage import TRACK_COLUMN_CONVERTERS
+
+# Number of rows fetched from the cursor and encoded per chunk
+EXPORT_BATCH_SIZE = 1000
+
+# Flag columns are stored as 0/1 and exported as booleans, like the API
+# returns them. The other converted columns (IDs, timestamps) are already
+# stored in the text form they are exported in.
+FLAG_CONVERTERS = {
+    name: convert
+    for name, convert in TRACK_COLUMN_CONVERTERS.items()
+    if Track.model_fields[name].annotation == Optional[bool]
+}
+
+
+def iter_track_row_batches(
+    query: str, params: List, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[List]:
+    """
+    Execute a track query and yield its rows in batches.
+
+    The connection stays open only while the generator is being consumed and
+    is closed when it is exhausted or closed early (e.g. client disconnect).
+    """
+    with get_db() as (_, cursor):
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+
+
+def _row_converters(columns: List[str]) -> list:
+    """(index, converter) pairs for the flag columns among `columns`."""
+    return [
+        (index, FLAG_CONVERTERS[name])
+        for index, name in enumerate(columns)
+        if name in FLAG_CONVERTERS
+    ]
+
+
+def _row_values(row, converters: list) -> list:
+    """Return a row's values with integer flags converted to booleans."""
+    values = list(row)
+    for index, convert in converters:
+        values[index] = convert(values[index])
+    return values
+
+
+def encode_ndjson(batches: Iterable[List], columns: List[str]) -> Iterator[bytes]:
+    """Encode row batches as newline-delimited JSON, one track per line."""
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    converters = _row_converters(columns)
+    for rows in batches:
+        lines = [
+            encoder.encode(dict(zip(columns, _row_values(row, converters))))
+            for row in rows
+        ]
+        lines.append("")
+        yield "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(batches: Iterable[List], columns: List[str]) -> Iterator[bytes]:
+    """Encode row batches as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    converters = _row_converters(columns)
+    for rows in batches:
+        writer.writerows(_row_values(row, converters) for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,98 @@
+"""
+Streaming ZIP archive builder.
+
+Archives are generated on the fly while the response is being sent: source
+files are read in chunks and written as STORED (uncompressed) entries, so
+nothing is staged on disk and memory use does not depend on archive size.
+Audio is already compressed, so deflating it would only cost CPU.
+"""
+
+import os
+import time
+import zipfile
+from contextlib import ExitStack
+from typing import Iterable, Iterator, List, Tuple, Union
+
+# Size of chunks read from source files and yielded to the client
+ZIP_CHUNK_SIZE = 1024 * 1024
+
+# An entry is (name inside the archive, source file path, in-memory bytes or
+# an iterable of generated byte chunks)
+ZipEntry = Tuple[str, Union[str, bytes, Iterable[bytes]]]
+
+
+class _ChunkBuffer:
+    """Write-only file object that collects bytes until they are drained.
+
+    It has no seek/tell, so zipfile switches to streaming mode and writes
+    sizes and CRCs in data descriptors after each entry.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(
+    entries: Iterable[ZipEntry], chunk_size: int = ZIP_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive containing the given entries.
+
+    Source files that cannot be opened are left out of the archive.
+    """
+    return (chunk for chunk in _iter_zip_chunks(entries, chunk_size) if chunk)
+
+
+def _iter_zip_chunks(entries: Iterable[ZipEntry], chunk_size: int) -> Iterator[bytes]:
+    """Write entries to a streaming archive, yielding output as it is produced."""
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, source in entries:
+            if isinstance(source, bytes):
+                archive.writestr(arcname, source)
+                yield buffer.drain()
+                continue
+
+            if not isinstance(source, str):
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                with archive.open(info, mode="w", force_zip64=True) as entry:
+                    for data in source:
+                        entry.write(data)
+                        yield buffer.drain()
+                yield buffer.drain()
+                continue
+
+            # Closes the source even if the client disconnects mid-entry
+            with ExitStack() as stack:
+                try:
+                    src = stack.enter_context(open(source, "rb"))
+                except OSError:
+                    continue
+                info = zipfile.ZipInfo.from_file(
+                    source, arcname, strict_timestamps=False
+                )
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = os.fstat(src.fileno()).st_size
+                with archive.open(info, mode="w") as entry:
+                    while True:
+                        data = src.read(chunk_size)
+                        if not data:
+                            break
+                        entry.write(data)
+                        yield buffer.drain()
+            yield buffer.drain()
+    # Central directory is written when the archive is closed
+    yield buffer.drain()
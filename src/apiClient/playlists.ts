@@ -1,6 +1,7 @@
 import type {
 	DeleteTracksFromPlaylistRequest,
 	DeleteTracksFromPlaylistResponse,
+	GetExportStatusResponse,
 	GetPlaylistResponse,
 	GetPlaylistsResponse,
 	PostAddTracksToPlaylistRequest,
@@ -86,6 +87,16 @@ export const exportPlaylist = async (
 	return response.data;
 };
 
+export const getExportStatus = async (
+	playlistId: string,
+	jobId: string,
+): Promise<GetExportStatusResponse> => {
+	const response = await apiClient.get<GetExportStatusResponse>(
+		`/playlists/${playlistId}/export/${jobId}/status`,
+	);
+	return response.data;
+};
+
 const playlistsApi = {
 	getPlaylists,
 	createPlaylist,
@@ -95,6 +106,7 @@ const playlistsApi = {
 	addTracksToPlaylist,
 	removeTracksFromPlaylist,
 	exportPlaylist,
+	getExportStatus,
 };
 
 export default playlistsApi;
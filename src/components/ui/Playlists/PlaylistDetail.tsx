@@ -1,8 +1,9 @@
 import { Download, Music, Plus } from "lucide-react";
-import { useMemo, useState } from "react";
+import { useEffect, useMemo, useState } from "react";
 import {
 	useAddTracksToPlaylist,
 	useExportPlaylist,
+	useExportStatus,
 	usePlaylist,
 	useRemoveTracksFromPlaylist,
 } from "../../../hooks/usePlaylists";
@@ -38,10 +39,36 @@ export default function PlaylistDetail({
 
 	const [addTracksModalOpen, setAddTracksModalOpen] = useState(false);
 	const [selectedTrackIds, setSelectedTrackIds] = useState<string[]>([]);
-	const [exportFormat, setExportFormat] = useState<
-		"m3u" | "pls" | "xspf" | "json"
-	>("m3u");
+	const [exportFormat, setExportFormat] =
+		useState<PostExportPlaylistRequest["body"]["format"]>("m3u");
 	const [exportModalOpen, setExportModalOpen] = useState(false);
+	const [exportJobId, setExportJobId] = useState<string | null>(null);
+	const { data: exportStatus, isError: exportStatusFailed } = useExportStatus(
+		playlistId,
+		exportJobId,
+	);
+	const isExporting = exportMutation.isPending || exportJobId !== null;
+
+	// Report the export once its job has finished
+	useEffect(() => {
+		if (exportStatusFailed) {
+			alert("Failed to get export status");
+			setExportJobId(null);
+			return;
+		}
+		if (!exportStatus) return;
+		if (exportStatus.status === "completed") {
+			alert(
+				`Playlist exported to: ${exportStatus.file_path || "Unknown location"}`,
+			);
+			setExportModalOpen(false);
+		} else if (exportStatus.status === "failed") {
+			alert(exportStatus.message || "Failed to export playlist");
+		} else if (exportStatus.status !== "cancelled") {
+			return;
+		}
+		setExportJobId(null);
+	}, [exportStatus, exportStatusFailed]);
 
 	// Flatten all pages into a single array of tracks
 	const allTracks = useMemo(() => {
@@ -98,6 +125,7 @@ export default function PlaylistDetail({
 	const handleExport = async () => {
 		const request: PostExportPlaylistRequest["body"] = {
 			format: exportFormat,
+			copy_mode: "copy",
 		};
 
 		try {
@@ -105,22 +133,8 @@ export default function PlaylistDetail({
 				playlistId,
 				request,
 			});
-			// Response structure: { content: { "application/json": { file_path, format } } }
-			const filePath =
-				"content" in response &&
-				typeof response.content === "object" &&
-				response.content !== null &&
-				"application/json" in response.content &&
-				typeof response.content["application/json"] === "object" &&
-				response.content["application/json"] !== null &&
-				"file_path" in response.content["application/json"]
-					? (response.content["application/json"] as { file_path?: string })
-							.file_path
-					: "file_path" in response && typeof response.file_path === "string"
-						? response.file_path
-						: "Unknown location";
-			alert(`Playlist exported to: ${filePath}`);
-			setExportModalOpen(false);
+			// The export runs as a background job; its status is polled above
+			setExportJobId(response.job_id || null);
 		} catch (error) {
 			console.error("Error exporting playlist:", error);
 			alert("Failed to export playlist");
@@ -319,9 +333,11 @@ export default function PlaylistDetail({
 						label="Export Format"
 						options={[
 							{ label: "M3U", value: "m3u" },
+							{ label: "M3U8", value: "m3u8" },
 							{ label: "PLS", value: "pls" },
 							{ label: "XSPF", value: "xspf" },
 							{ label: "JSON", value: "json" },
+							{ label: "Rekordbox XML", value: "rekordbox" },
 						]}
 						value={[exportFormat]}
 						onChange={(values) =>
@@ -345,9 +361,11 @@ export default function PlaylistDetail({
 							size="md"
 							iconBefore={<Download size={16} />}
 							onClick={handleExport}
-							disabled={exportMutation.isPending || playlistTracks.length === 0}
+							disabled={isExporting || playlistTracks.length === 0}
 						>
-							{exportMutation.isPending ? "Exporting..." : "Export"}
+							{isExporting
+								? `Exporting... ${Math.round(exportStatus?.progress ?? 0)}%`
+								: "Export"}
 						</Button>
 					</div>
 				</div>
@@ -4,6 +4,7 @@ import { playlists } from "../apiClient";
 import type {
 	DeleteTracksFromPlaylistRequest,
 	DeleteTracksFromPlaylistResponse,
+	GetExportStatusResponse,
 	GetPlaylistResponse,
 	GetPlaylistsResponse,
 	PostAddTracksToPlaylistRequest,
@@ -122,3 +123,22 @@ export function useExportPlaylist() {
 	});
 }
 
+
+export function useExportStatus(playlistId: string, jobId: string | null) {
+	return useQuery<GetExportStatusResponse>({
+		queryKey: ["exportStatus", playlistId, jobId],
+		queryFn: () => {
+			if (!jobId) throw new Error("Export job ID is required");
+			return playlists.getExportStatus(playlistId, jobId);
+		},
+		enabled: !!jobId,
+		refetchInterval: (query) => {
+			const status = query.state.data?.status;
+			// Poll while the export waits in the queue or copies files
+			if (status === "queued" || status === "running") {
+				return 500;
+			}
+			return false;
+		},
+	});
+}
@@ -6,5 +6,10 @@ export type PostExportPlaylistRequest = {
 };
 
 export type PostExportPlaylistResponse =
-	paths["/playlists/{playlist_id}/export"]["post"]["responses"]["200"];
+	paths["/playlists/{playlist_id}/export"]["post"]["responses"]["202"]["content"]["application/json"];
 
+export type GetExportStatusRequest =
+	paths["/playlists/{playlist_id}/export/{job_id}/status"]["get"]["parameters"]["path"];
+
+export type GetExportStatusResponse =
+	paths["/playlists/{playlist_id}/export/{job_id}/status"]["get"]["responses"]["200"]["content"]["application/json"];
@@ -891,7 +891,9 @@ export interface paths {
         put?: never;
         /**
          * Export Playlist
-         * @description Export playlist in various formats
+         * @description Queue an export of the playlist in various formats. Exports run one
+         *     at a time on a dedicated worker; poll the status endpoint for
+         *     progress and the final folder path.
          */
         post: {
             parameters: {
@@ -908,17 +910,80 @@ export interface paths {
                 };
             };
             responses: {
-                /** @description Playlist exported successfully */
+                /** @description Export job queued */
+                202: {
+                    headers: {
+                        [name: string]: unknown;
+                    };
+                    content: {
+                        "application/json": components["schemas"]["ExportJobResponse"];
+                    };
+                };
+                /** @description Playlist is empty */
+                400: {
+                    headers: {
+                        [name: string]: unknown;
+                    };
+                    content?: never;
+                };
+                /** @description Playlist not found */
+                404: {
+                    headers: {
+                        [name: string]: unknown;
+                    };
+                    content?: never;
+                };
+            };
+        };
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/playlists/{playlist_id}/export/{job_id}/status": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Get Export Status
+         * @description Get the progress of a playlist export job
+         */
+        get: {
+            parameters: {
+                query?: never;
+                header?: never;
+                path: {
+                    playlist_id: string;
+                    job_id: string;
+                };
+                cookie?: never;
+            };
+            requestBody?: never;
+            responses: {
+                /** @description Export job status */
                 200: {
                     headers: {
                         [name: string]: unknown;
                     };
                     content: {
-                        "application/json": components["schemas"]["ExportPlaylistResponse"];
+                        "application/json": components["schemas"]["ExportJobStatusResponse"];
                     };
                 };
+                /** @description Export job not found */
+                404: {
+                    headers: {
+                        [name: string]: unknown;
+                    };
+                    content?: never;
+                };
             };
         };
+        put?: never;
+        post?: never;
         delete?: never;
         options?: never;
         head?: never;
@@ -1591,12 +1656,49 @@ export interface components {
              * @default m3u
              * @enum {string}
              */
-            format: "m3u" | "pls" | "xspf" | "json";
+            format: "m3u" | "m3u8" | "pls" | "xspf" | "json" | "rekordbox";
             output_path?: string;
+            /**
+             * @description How audio files are placed in the export folder. `hardlink` and
+             *     `reflink` only apply when source and export share a filesystem
+             *     and fall back to a regular copy otherwise. Files already present
+             *     with matching size and modification time are skipped.
+             * @default copy
+             * @enum {string}
+             */
+            copy_mode: "copy" | "hardlink" | "reflink";
         };
         ExportPlaylistResponse: {
             file_path?: string;
             format?: string;
+            files_copied?: number;
+            /** @description Files already up to date in the export folder */
+            files_skipped?: number;
+            bytes_copied?: number;
+            duration_seconds?: number;
+            throughput_bytes_per_second?: number | null;
+        };
+        ExportJobResponse: {
+            /** Format: uuid */
+            job_id?: string;
+            /** @enum {string} */
+            status?: "queued" | "running" | "completed" | "failed" | "cancelled";
+            /** @example Playlist export queued */
+            message?: string;
+        };
+        ExportJobStatusResponse: components["schemas"]["ExportPlaylistResponse"] & {
+            /** Format: uuid */
+            job_id?: string;
+            /** Format: uuid */
+            playlist_id?: string;
+            /** @enum {string} */
+            status?: "queued" | "running" | "completed" | "failed" | "cancelled";
+            message?: string;
+            /** @description Progress percentage (0-100) */
+            progress?: number;
+            files_total?: number;
+            /** @description Files that could not be copied, and job failures */
+            errors?: string[];
         };
         BPMDistributionResponse: {
             distribution?: {